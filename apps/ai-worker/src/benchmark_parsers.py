@@ -0,0 +1,83 @@
+"""
+Benchmark of the local layout parser (Docling) against LlamaParse:
+
+  uv run python -m src.benchmark_parsers docs/report.pdf docs/deck.pptx
+
+For each file it prints the latency of both parsers and the table fidelity of
+the local output: the F1 score of its markdown table cells, using the cloud
+tables as the reference ("-" when neither output has a table).
+"""
+
+import argparse
+import re
+import time
+from collections import Counter
+from typing import Callable, List, Optional, Tuple
+
+from llama_index.core.schema import Document
+
+from src.core.logging_config import setup_logging
+
+_TABLE_ROW = re.compile(r"^\s*\|(.*)\|\s*$")
+_TABLE_SEPARATOR = re.compile(r"^[\s|:\-]+$")
+
+
+def table_cells(markdown: str) -> Counter:
+    """Multiset of the normalized cells of every markdown table row."""
+    cells: Counter = Counter()
+    for line in markdown.splitlines():
+        row = _TABLE_ROW.match(line)
+        if row is None or _TABLE_SEPARATOR.match(line):
+            continue
+        for cell in row.group(1).split("|"):
+            cell = " ".join(cell.split()).lower()
+            if cell:
+                cells[cell] += 1
+    return cells
+
+
+def cell_f1(candidate: Counter, reference: Counter) -> Optional[float]:
+    if not candidate and not reference:
+        return None
+    overlap = sum((candidate & reference).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate.values())
+    recall = overlap / sum(reference.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def _timed(parse: Callable[[str], List[Document]], file_path: str) -> Tuple[float, str]:
+    start = time.perf_counter()
+    docs = parse(file_path)
+    return time.perf_counter() - start, "\n\n".join(doc.text for doc in docs)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    # Imported late: both parsers load heavy dependencies.
+    from src.services.file_parsing_service import FileParsingService
+    from src.services.layout_parser import LayoutParser
+
+    cloud = FileParsingService()
+    local = LayoutParser()
+    # Load the layout models up front so the first file is not penalized.
+    _ = local.reader
+
+    print(f"{'file':40} {'local s':>8} {'cloud s':>8} {'tables F1':>9}")
+    for file_path in args.files:
+        local_seconds, local_text = _timed(local.parse, file_path)
+        cloud_seconds, cloud_text = _timed(cloud._parse_cloud, file_path)
+        f1 = cell_f1(table_cells(local_text), table_cells(cloud_text))
+        print(
+            f"{file_path[-40:]:40} {local_seconds:8.1f} {cloud_seconds:8.1f} "
+            f"{'-' if f1 is None else f'{f1:.2f}':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
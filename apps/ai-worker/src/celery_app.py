@@ -5,8 +5,15 @@ the project venv to avoid "bad interpreter" from a system celery:
   uv run celery -A src.celery_app:app worker -Q ingestion --loglevel=info
 
   or:  python -m celery -A src.celery_app:app worker -Q ingestion --loglevel=info
+
+Each queue in TASK_QUEUES also declares the worker pool and concurrency it is
+meant to run with; start one worker per queue with those options via:
+
+  uv run python -m src.worker parse_cloud
 """
 
+from typing import List, NamedTuple, Optional
+
 from celery import Celery
 from celery.signals import worker_process_init
 
@@ -22,15 +29,74 @@ app = Celery(
     backend=settings.redis_url,
     include=["src.tasks"],
 )
+
+
+class TaskQueue(NamedTuple):
+    task: str
+    queue: str
+    # Worker pool and concurrency of the workers consuming this queue.
+    pool: str = "prefork"
+    concurrency: Optional[int] = None
+
+
 # Map task name -> queue. Add a line when you add a new task (and its queue in config).
 TASK_QUEUES = [
-    ("src.tasks.parse_file.run_parse_file", settings.CELERY_QUEUE_PARSE_FILE),
-    (
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_file",
+        settings.CELERY_QUEUE_PARSE_FILE,
+        settings.CELERY_PARSE_FILE_POOL,
+        settings.CELERY_PARSE_FILE_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_cloud",
+        settings.CELERY_QUEUE_PARSE_CLOUD,
+        settings.CELERY_PARSE_CLOUD_POOL,
+        settings.CELERY_PARSE_CLOUD_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_cloud_batch",
+        settings.CELERY_QUEUE_PARSE_CLOUD,
+        settings.CELERY_PARSE_CLOUD_POOL,
+        settings.CELERY_PARSE_CLOUD_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_local",
+        settings.CELERY_QUEUE_PARSE_LOCAL,
+        settings.CELERY_PARSE_LOCAL_POOL,
+        settings.CELERY_PARSE_LOCAL_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_part",
+        settings.CELERY_QUEUE_PARSE_LOCAL,
+        settings.CELERY_PARSE_LOCAL_POOL,
+        settings.CELERY_PARSE_LOCAL_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_merge_parts",
+        settings.CELERY_QUEUE_PARSE_FILE,
+        settings.CELERY_PARSE_FILE_POOL,
+        settings.CELERY_PARSE_FILE_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_fan_out_failed",
+        settings.CELERY_QUEUE_PARSE_FILE,
+        settings.CELERY_PARSE_FILE_POOL,
+        settings.CELERY_PARSE_FILE_CONCURRENCY,
+    ),
+    TaskQueue(
+        "src.tasks.parse_file.run_parse_text",
+        settings.CELERY_QUEUE_PARSE_TEXT,
+        settings.CELERY_PARSE_TEXT_POOL,
+        settings.CELERY_PARSE_TEXT_CONCURRENCY,
+    ),
+    TaskQueue(
         "src.tasks.vectorize_file.run_vectorize_file",
         settings.CELERY_QUEUE_VECTORIZE_FILE,
+        settings.CELERY_VECTORIZE_FILE_POOL,
+        settings.CELERY_VECTORIZE_FILE_CONCURRENCY,
     ),
     # Example for a future task:
-    # ("src.tasks.reindex.run_reindex", settings.CELERY_QUEUE_REINDEX),
+    # TaskQueue("src.tasks.reindex.run_reindex", settings.CELERY_QUEUE_REINDEX),
 ]
 app.conf.update(
     task_serializer="json",
@@ -41,12 +107,23 @@ app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     worker_prefetch_multiplier=1,
-    task_routes={name: {"queue": q} for name, q in TASK_QUEUES},
+    task_routes={entry.task: {"queue": entry.queue} for entry in TASK_QUEUES},
     task_default_queue="default",
     broker_connection_retry_on_startup=True,
 )
 
 
+def worker_argv(queue: str) -> List[str]:
+    """`celery worker` arguments for a worker consuming a single queue."""
+    for entry in TASK_QUEUES:
+        if entry.queue == queue:
+            argv = ["worker", "-Q", queue, "--pool", entry.pool]
+            if entry.concurrency:
+                argv += ["--concurrency", str(entry.concurrency)]
+            return argv
+    raise ValueError(f"Unknown queue: {queue}")
+
+
 @worker_process_init.connect
 def _configure_worker_logging(**kwargs) -> None:
     """Apply app logging config in each Celery worker process."""
@@ -0,0 +1,288 @@
+"""
+Shared, concurrency-safe caches for the worker.
+
+CacheBackend is a small bytes-level key/value store with per-namespace keys,
+TTL expiry and LRU eviction. Two implementations are provided:
+
+  - SQLiteCacheBackend: one SQLite file in WAL mode, shared by every process on
+    the host (prefork children included). Writes are incremental row upserts.
+  - RedisCacheBackend: shared by the whole cluster. Entries get a TTL and LRU
+    eviction is delegated to Redis (maxmemory-policy allkeys-lru/volatile-lru).
+
+SharedKVStore adapts a backend to llama_index's BaseKVStore, so it can back an
+IngestionCache; each llama_index collection maps to its own namespace.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import redis
+from llama_index.core.storage.kvstore.types import DEFAULT_COLLECTION, BaseKVStore
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the values found for keys; missing or expired keys are omitted."""
+
+    @abstractmethod
+    def put_many(self, namespace: str, items: Dict[str, bytes]) -> None:
+        """Insert or replace items."""
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> bool:
+        """Delete key, returning whether it existed."""
+
+    @abstractmethod
+    def keys(self, namespace: str) -> List[str]:
+        """List the live keys of a namespace."""
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        return self.get_many(namespace, [key]).get(key)
+
+    def put(self, namespace: str, key: str, value: bytes) -> None:
+        self.put_many(namespace, {key: value})
+
+
+class SQLiteCacheBackend(CacheBackend):
+    # SQLite caps the number of host parameters per statement.
+    _MAX_PARAMS = 500
+    # Run expiry/LRU eviction once every N writes rather than on every write.
+    _EVICT_EVERY = 100
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self._path = path
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread and per process: connections must not be
+        # shared across a fork (Celery prefork children).
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        for start in range(0, len(keys), self._MAX_PARAMS):
+            chunk = keys[start : start + self._MAX_PARAMS]
+            marks = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, value FROM cache WHERE namespace = ? "
+                f"AND key IN ({marks}) AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, *chunk, now),
+            ).fetchall()
+            if rows:
+                hit_marks = ",".join("?" * len(rows))
+                self._conn.execute(
+                    f"UPDATE cache SET accessed_at = ? WHERE namespace = ? "
+                    f"AND key IN ({hit_marks})",
+                    (now, namespace, *(key for key, _ in rows)),
+                )
+            found.update({key: bytes(value) for key, value in rows})
+        return found
+
+    def put_many(self, namespace: str, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + self._ttl_seconds if self._ttl_seconds else None
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache "
+                "(namespace, key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (namespace, key, value, expires_at, now)
+                    for key, value in items.items()
+                ],
+            )
+        self._writes += len(items)
+        if self._writes >= self._EVICT_EVERY:
+            self._writes = 0
+            self.evict(namespace)
+
+    def evict(self, namespace: str) -> None:
+        """Drop expired entries, then least recently used ones above max_entries."""
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),),
+            )
+            if self._max_entries:
+                conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                    "SELECT key FROM cache WHERE namespace = ? "
+                    "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (namespace, namespace, self._max_entries),
+                )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        cursor = self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        )
+        return cursor.rowcount > 0
+
+    def keys(self, namespace: str) -> List[str]:
+        rows = self._conn.execute(
+            "SELECT key FROM cache WHERE namespace = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time()),
+        ).fetchall()
+        return [key for (key,) in rows]
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(
+        self,
+        client: redis.Redis,
+        prefix: str = "ai_worker:cache",
+        ttl_seconds: Optional[int] = None,
+    ):
+        self._redis = client
+        self._prefix = prefix
+        self._ttl_seconds = ttl_seconds
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self._prefix}:{namespace}:{key}"
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._redis.mget([self._key(namespace, key) for key in keys])
+        return {
+            key: value
+            for key, value in zip(keys, values, strict=True)
+            if value is not None
+        }
+
+    def put_many(self, namespace: str, items: Dict[str, bytes]) -> None:
+        if not items:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._key(namespace, key), value, ex=self._ttl_seconds)
+        pipe.execute()
+
+    def delete(self, namespace: str, key: str) -> bool:
+        return bool(self._redis.delete(self._key(namespace, key)))
+
+    def keys(self, namespace: str) -> List[str]:
+        prefix = self._key(namespace, "")
+        return [
+            (key.decode() if isinstance(key, bytes) else key)[len(prefix) :]
+            for key in self._redis.scan_iter(match=f"{prefix}*", count=1000)
+        ]
+
+
+class SharedKVStore(BaseKVStore):
+    """llama_index KV store over a CacheBackend: one namespace per collection."""
+
+    def __init__(self, backend: CacheBackend, prefix: str = "kv"):
+        self._backend = backend
+        self._prefix = prefix
+
+    def _namespace(self, collection: str) -> str:
+        return f"{self._prefix}:{collection}"
+
+    def put(self, key: str, val: dict, collection: str = DEFAULT_COLLECTION) -> None:
+        self._backend.put(self._namespace(collection), key, json.dumps(val).encode())
+
+    async def aput(
+        self, key: str, val: dict, collection: str = DEFAULT_COLLECTION
+    ) -> None:
+        self.put(key, val, collection)
+
+    def get(self, key: str, collection: str = DEFAULT_COLLECTION) -> Optional[dict]:
+        value = self._backend.get(self._namespace(collection), key)
+        return json.loads(value) if value is not None else None
+
+    async def aget(
+        self, key: str, collection: str = DEFAULT_COLLECTION
+    ) -> Optional[dict]:
+        return self.get(key, collection)
+
+    def get_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
+        namespace = self._namespace(collection)
+        values = self._backend.get_many(namespace, self._backend.keys(namespace))
+        return {key: json.loads(value) for key, value in values.items()}
+
+    async def aget_all(self, collection: str = DEFAULT_COLLECTION) -> Dict[str, dict]:
+        return self.get_all(collection)
+
+    def delete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        return self._backend.delete(self._namespace(collection), key)
+
+    async def adelete(self, key: str, collection: str = DEFAULT_COLLECTION) -> bool:
+        return self.delete(key, collection)
+
+
+_backend: CacheBackend | None = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Process-wide cache backend selected by settings.CACHE_BACKEND."""
+    global _backend
+    if _backend is None:
+        if settings.CACHE_BACKEND == "redis":
+            _backend = RedisCacheBackend(
+                redis.Redis.from_url(settings.redis_url),
+                ttl_seconds=settings.CACHE_TTL_SECONDS,
+            )
+        else:
+            _backend = SQLiteCacheBackend(
+                settings.CACHE_SQLITE_PATH
+                or os.path.join(settings.TEMP_DIR, "cache.sqlite3"),
+                ttl_seconds=settings.CACHE_TTL_SECONDS,
+                max_entries=settings.CACHE_MAX_ENTRIES,
+            )
+        logger.info("Using %s cache backend", type(_backend).__name__)
+    return _backend
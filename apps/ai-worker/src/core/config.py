@@ -17,6 +17,14 @@ class Settings(BaseSettings):
     AWS_SECRET_KEY: SecretStr | None = None
     AWS_REGION: str = "eu-central-1"
     S3_BUCKET_NAME: str = "omni-rag-documents"
+    # HTTP connections per client; should cover S3_MAX_CONCURRENCY per transfer
+    # times the number of threads transferring at once.
+    S3_MAX_POOL_CONNECTIONS: int = 64
+    # Multipart transfers: objects above the threshold are split into parts of
+    # S3_MULTIPART_CHUNKSIZE, moved by up to S3_MAX_CONCURRENCY threads.
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNKSIZE: int = 16 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 16
 
     # --- LLAMA CLOUD ---
 
@@ -35,6 +43,16 @@ class Settings(BaseSettings):
     # Vector DB
     QDRANT_HOST: str = "localhost"
     QDRANT_PORT: int = 6333
+    QDRANT_GRPC_PORT: int = 6334
+    QDRANT_PREFER_GRPC: bool = True
+    # Upserts: points per request, parallel upload threads, and whether each
+    # request waits for the points to be applied (False = ack on WAL write; a
+    # barrier at the end of the task still waits for everything).
+    QDRANT_UPSERT_BATCH_SIZE: int = 256
+    QDRANT_UPSERT_WORKERS: int = 4
+    QDRANT_UPSERT_WAIT: bool = False
+    # Seconds between health checks of the process-wide Qdrant client.
+    QDRANT_HEALTH_CHECK_INTERVAL: float = 30.0
 
     # Redis (Celery broker / backend). REDIS_DB must be an integer (e.g. 0).
     REDIS_HOST: str = "localhost"
@@ -43,6 +61,170 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: SecretStr | None = None
     CELERY_QUEUE_PARSE_FILE: str = "parse_file"
     CELERY_QUEUE_VECTORIZE_FILE: str = "vectorize_file"
+    # Parser lanes: run_parse_file only dedups and pre-routes, then hands the
+    # upload to the lane matching its route, so minutes-long LlamaParse jobs
+    # never queue in front of quick text/CSV parses. Uploads pre-routing cannot
+    # classify (PDFs) start on the local lane and move to the cloud lane when
+    # the analysis sends the whole file to the cloud. With lanes disabled the
+    # router parses inline (single worker setups).
+    PARSE_LANES_ENABLED: bool = True
+    CELERY_QUEUE_PARSE_CLOUD: str = "parse_cloud"
+    CELERY_QUEUE_PARSE_LOCAL: str = "parse_local"
+    CELERY_QUEUE_PARSE_TEXT: str = "parse_text"
+    # Worker pool and concurrency per queue (None = Celery default: CPU count).
+    # The router and cloud lanes are I/O bound and run on threads: the parser
+    # service is shared, but every LlamaParse call uses its own HTTP client.
+    CELERY_PARSE_FILE_POOL: str = "threads"
+    CELERY_PARSE_FILE_CONCURRENCY: int | None = 8
+    CELERY_PARSE_CLOUD_POOL: str = "threads"
+    CELERY_PARSE_CLOUD_CONCURRENCY: int | None = 16
+    CELERY_PARSE_LOCAL_POOL: str = "prefork"
+    CELERY_PARSE_LOCAL_CONCURRENCY: int | None = None
+    CELERY_PARSE_TEXT_POOL: str = "prefork"
+    CELERY_PARSE_TEXT_CONCURRENCY: int | None = 2
+    CELERY_VECTORIZE_FILE_POOL: str = "prefork"
+    CELERY_VECTORIZE_FILE_CONCURRENCY: int | None = None
+
+    # --- PARSING ---
+    # Bump PARSER_VERSION whenever parsing output changes, so content that was
+    # already parsed by an older parser is parsed again instead of deduplicated.
+    PARSER_VERSION: str = "1"
+    PARSE_DEDUP_ENABLED: bool = True
+    # Pre-routing classifies uploads from ranged S3 reads (header for MIME
+    # sniffing, tail for the zip directory of Office files) before download.
+    PRE_ROUTING_ENABLED: bool = True
+    PRE_ROUTING_HEADER_BYTES: int = 8 * 1024
+    PRE_ROUTING_TAIL_BYTES: int = 64 * 1024
+    # PDFs larger than this plus the tail are sampled from their first
+    # PRE_ROUTING_PDF_SAMPLE_BYTES and the tail; when every page found there is
+    # a scan, the upload goes to the cloud parser without being downloaded.
+    PRE_ROUTING_PDF_SAMPLE_BYTES: int = 1024 * 1024
+    # PDF complexity analysis scores PDF_ANALYSIS_SAMPLE_PAGES pages spread
+    # across the document; pages whose content stream is larger than
+    # PDF_ANALYSIS_MAX_CONTENT_BYTES count as dense vector graphics without
+    # enumerating their drawings.
+    PDF_ANALYSIS_SAMPLE_PAGES: int = 3
+    PDF_ANALYSIS_MAX_CONTENT_BYTES: int = 512 * 1024
+    # Stream cloud-bound uploads from S3 to LlamaParse without a local copy.
+    PARSE_STREAM_TO_CLOUD: bool = True
+    # Async cloud parsing: the cloud lane only submits the LlamaParse job and
+    # returns; the poller (python -m src.poller) collects results. Poll delays
+    # grow with job age from POLL_INTERVAL to POLL_MAX_INTERVAL seconds.
+    PARSE_CLOUD_ASYNC: bool = False
+    CLOUD_PARSE_POLL_TICK: float = 1.0
+    CLOUD_PARSE_POLL_INTERVAL: float = 5.0
+    CLOUD_PARSE_POLL_MAX_INTERVAL: float = 60.0
+    CLOUD_PARSE_POLL_CONCURRENCY: int = 200
+    CLOUD_PARSE_LEASE_SECONDS: float = 300.0
+    CLOUD_PARSE_JOB_TIMEOUT: float = 2 * 3600.0
+    # Batching: small cloud-bound uploads are buffered in Redis and parsed
+    # together by run_parse_cloud_batch, once CLOUD_BATCH_WINDOW_SECONDS have
+    # passed or the buffer reaches CLOUD_BATCH_MAX_FILES / CLOUD_BATCH_MAX_BYTES.
+    # Up to CLOUD_BATCH_NUM_WORKERS jobs of a batch run at the same time.
+    PARSE_CLOUD_BATCHING: bool = False
+    CLOUD_BATCH_MAX_FILE_BYTES: int = 2 * 1024 * 1024
+    CLOUD_BATCH_WINDOW_SECONDS: float = 10.0
+    CLOUD_BATCH_MAX_FILES: int = 50
+    CLOUD_BATCH_MAX_BYTES: int = 32 * 1024 * 1024
+    CLOUD_BATCH_NUM_WORKERS: int = 10
+    # Drained files are leased for CLOUD_BATCH_LEASE_SECONDS; files of a batch
+    # whose worker died are put back by the first drain after that. Keep it above
+    # the time a batch takes.
+    CLOUD_BATCH_LEASE_SECONDS: float = 900.0
+    # A file the cloud parser returns nothing for is left leased and retried,
+    # up to CLOUD_BATCH_MAX_ATTEMPTS drains in all.
+    CLOUD_BATCH_MAX_ATTEMPTS: int = 3
+    # Layout lane: PDFs and Office documents scoring between PARSE_LAYOUT_MIN_SCORE
+    # and PARSE_LAYOUT_MAX_SCORE (tables, a few figures, but no scans) are
+    # parsed locally by Docling instead of LlamaParse. Compare both on your own
+    # documents with `python -m src.benchmark_parsers`.
+    PARSE_LAYOUT_ENABLED: bool = True
+    PARSE_LAYOUT_MIN_SCORE: int = 20
+    PARSE_LAYOUT_MAX_SCORE: int = 60
+    PARSE_LAYOUT_OCR: bool = False
+    # Mixed-mode PDFs: complex PDFs are classified page by page; text pages are
+    # converted locally and only complex page ranges go to LlamaParse. When more
+    # than PDF_MIXED_MAX_CLOUD_FRACTION of the pages are complex, the whole file
+    # goes to the cloud.
+    PDF_MIXED_MODE: bool = True
+    PDF_MIXED_MAX_CLOUD_FRACTION: float = 0.5
+    # Local PDFs of at least PDF_SHARD_MIN_PAGES pages are converted in chunks
+    # of PDF_SHARD_PAGES pages across PDF_SHARD_WORKERS processes; smaller PDFs
+    # keep the single-call path. Each parse_local worker process starts its own
+    # shard processes, so 0 (the default) gives each CPU count divided by
+    # CELERY_PARSE_LOCAL_CONCURRENCY, but at least 2. With the default local
+    # lane concurrency (one process per CPU) that is 2 per worker process, at
+    # most twice the CPU count in total while every worker converts a large
+    # PDF. Keep the product of both near the CPU count when setting
+    # PDF_SHARD_WORKERS.
+    PDF_SHARD_MIN_PAGES: int = 64
+    PDF_SHARD_PAGES: int = 16
+    PDF_SHARD_WORKERS: int = 0
+    # Fan-out: PDFs of at least PARSE_FANOUT_MIN_PAGES pages or
+    # PARSE_FANOUT_MIN_BYTES are split into parts of PARSE_FANOUT_PART_PAGES
+    # pages, parsed by any local lane worker in the cluster (Celery chord) and
+    # merged into one artifact. Parts are staged under PARSE_FANOUT_S3_PREFIX
+    # and removed after the merge (add an S3 lifecycle rule on the prefix for
+    # leftovers of chords that never completed).
+    PARSE_FANOUT_ENABLED: bool = True
+    PARSE_FANOUT_MIN_PAGES: int = 300
+    PARSE_FANOUT_MIN_BYTES: int = 200 * 1024 * 1024
+    PARSE_FANOUT_PART_PAGES: int = 100
+    PARSE_FANOUT_S3_PREFIX: str = "parse-parts"
+    # CSV and Excel files are read and emitted in chunks of TABULAR_CHUNK_ROWS
+    # rows (one Document per chunk, each repeating the header).
+    TABULAR_CHUNK_ROWS: int = 1000
+    # Tables are also uploaded as Parquet (dtypes kept) under
+    # TABULAR_PARQUET_S3_PREFIX/<sha256>-<PARSER_VERSION>/<sheet>.parquet,
+    # linked from each document's "parquet_s3_key". Needs the
+    # ai-worker[parquet] extra.
+    TABULAR_PARQUET_ENABLED: bool = True
+    TABULAR_PARQUET_S3_PREFIX: str = "parsed-tables"
+    # Two-tier parse result cache: size-bounded LRU under TEMP_DIR + S3 copy.
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    PARSE_CACHE_S3_PREFIX: str = "parse-cache"
+    # Parsed artifacts are compressed JSONL; zstd needs the ai-worker[zstd] extra
+    # and falls back to gzip without it.
+    PARSED_ARTIFACT_CODEC: Literal["zstd", "gzip"] = "zstd"
+    # Artifacts up to this size are staged in memory before upload.
+    PARSED_ARTIFACT_SPOOL_BYTES: int = 16 * 1024 * 1024
+
+    # --- SHARED CACHES (ingestion cache, embeddings) ---
+    # "sqlite" is shared by all worker processes on a host (WAL mode),
+    # "redis" by the whole cluster.
+    CACHE_BACKEND: Literal["sqlite", "redis"] = "sqlite"
+    CACHE_SQLITE_PATH: str | None = None  # defaults to TEMP_DIR/cache.sqlite3
+    CACHE_TTL_SECONDS: int | None = 30 * 24 * 3600
+    CACHE_MAX_ENTRIES: int | None = 500_000  # per namespace (SQLite LRU)
+    # Embedding vectors are cached across collections, keyed by model and text.
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_DTYPE: Literal["float32", "float16"] = "float16"
+    # LLM table summaries are cached by model and normalized table content.
+    # Tables with fewer than TABLE_SUMMARY_MIN_CELLS data cells are summarized
+    # from their columns and values without the LLM.
+    TABLE_SUMMARY_CACHE_ENABLED: bool = True
+    TABLE_SUMMARY_MIN_CELLS: int = 12
+
+    # --- EMBEDDING SCHEDULER ---
+    # Batches are cut by estimated tokens, up to EMBEDDING_MAX_BATCH_ITEMS texts
+    # per request, with up to EMBEDDING_MAX_CONCURRENCY requests in flight.
+    EMBEDDING_SCHEDULER_ENABLED: bool = True
+    EMBEDDING_TOKEN_BUDGET: int = 16_000
+    EMBEDDING_MAX_BATCH_ITEMS: int = 100
+    EMBEDDING_MAX_CONCURRENCY: int = 8
+
+    # --- VECTORIZE ---
+    # Streaming mode overlaps split, embed and upsert stages via bounded queues.
+    VECTORIZE_STREAMING: bool = False
+    VECTORIZE_QUEUE_SIZE: int = 4
+    VECTORIZE_BATCH_SIZE: int = 256  # nodes per embed/upsert batch
+    # Re-indexing a known source only embeds/upserts changed chunks and deletes
+    # vanished ones.
+    INDEXING_INCREMENTAL: bool = True
+    # Tabular documents skip LLM table summaries and are split into windows of
+    # this many rows, each repeating the table header.
+    TABULAR_WINDOW_ROWS: int = 50
 
     @field_validator("REDIS_DB", mode="before")
     @classmethod
@@ -1,14 +1,34 @@
 import logging
 import os
+from typing import BinaryIO, List, Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from botocore.response import StreamingBody
 
 from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+def is_not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("404", "NoSuchKey")
+
+
+def byte_range(start: Optional[int] = None, end: Optional[int] = None) -> str:
+    """
+    HTTP Range header value. `end` is inclusive; a negative `start` with no
+    `end` selects the last -start bytes (e.g. start=-65536 reads the tail).
+    """
+    if start is not None and start < 0:
+        if end is not None:
+            raise ValueError("Suffix ranges cannot have an end")
+        return f"bytes={start}"
+    return f"bytes={start or 0}-{'' if end is None else end}"
+
+
 class S3Client:
     def __init__(self):
         endpoint = settings.AWS_ENDPOINT_URL
@@ -21,24 +41,133 @@ class S3Client:
             "aws_access_key_id": settings.AWS_ACCESS_KEY.get_secret_value(),
             "aws_secret_access_key": settings.AWS_SECRET_KEY.get_secret_value(),
             "region_name": settings.AWS_REGION,
+            "config": Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={"mode": "adaptive", "max_attempts": 5},
+                tcp_keepalive=True,
+            ),
         }
         if endpoint:
             client_kwargs["endpoint_url"] = endpoint
 
         self._s3 = boto3.client("s3", **client_kwargs)
         self._bucket_name = settings.S3_BUCKET_NAME
+        self._transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+            use_threads=True,
+        )
 
     def download_file(self, s3_key: str, local_path: str):
         try:
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            self._s3.download_file(self._bucket_name, s3_key, local_path)
+            self._s3.download_file(
+                self._bucket_name, s3_key, local_path, Config=self._transfer_config
+            )
         except ClientError as e:
             logger.error("S3 download failed: %s", e)
             raise
 
     def upload_file(self, local_path: str, s3_key: str):
         try:
-            self._s3.upload_file(local_path, self._bucket_name, s3_key)
+            self._s3.upload_file(
+                local_path, self._bucket_name, s3_key, Config=self._transfer_config
+            )
+        except ClientError as e:
+            logger.error("S3 upload failed: %s", e)
+            raise
+
+    def put_stream(self, fileobj: BinaryIO, s3_key: str):
+        """Upload a readable binary file object (multipart for large objects)."""
+        try:
+            self._s3.upload_fileobj(
+                fileobj, self._bucket_name, s3_key, Config=self._transfer_config
+            )
         except ClientError as e:
             logger.error("S3 upload failed: %s", e)
             raise
+
+    def download_fileobj(self, s3_key: str, fileobj: BinaryIO):
+        """Download into a writable binary file object (parallel ranged GETs)."""
+        try:
+            self._s3.download_fileobj(
+                self._bucket_name, s3_key, fileobj, Config=self._transfer_config
+            )
+        except ClientError as e:
+            logger.error("S3 download failed: %s", e)
+            raise
+
+    def get_stream(
+        self, s3_key: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> StreamingBody:
+        """Open the object (or a byte range of it) as a readable stream."""
+        kwargs = {"Bucket": self._bucket_name, "Key": s3_key}
+        if start is not None or end is not None:
+            kwargs["Range"] = byte_range(start, end)
+        try:
+            return self._s3.get_object(**kwargs)["Body"]
+        except ClientError as e:
+            if not is_not_found(e):
+                logger.error("S3 get failed: %s", e)
+            raise
+
+    def get_bytes(
+        self, s3_key: str, start: Optional[int] = None, end: Optional[int] = None
+    ) -> bytes:
+        """Read the object (or a byte range of it) into memory."""
+        body = self.get_stream(s3_key, start, end)
+        try:
+            return body.read()
+        finally:
+            body.close()
+
+    def put_bytes(self, data: bytes, s3_key: str):
+        try:
+            self._s3.put_object(Bucket=self._bucket_name, Key=s3_key, Body=data)
+        except ClientError as e:
+            logger.error("S3 upload failed: %s", e)
+            raise
+
+    def copy_object(self, source_key: str, s3_key: str):
+        """Server-side copy within the bucket (no download)."""
+        try:
+            self._s3.copy(
+                {"Bucket": self._bucket_name, "Key": source_key},
+                self._bucket_name,
+                s3_key,
+                Config=self._transfer_config,
+            )
+        except ClientError as e:
+            logger.error("S3 copy failed: %s", e)
+            raise
+
+    def head_object(self, s3_key: str) -> dict:
+        try:
+            return self._s3.head_object(Bucket=self._bucket_name, Key=s3_key)
+        except ClientError as e:
+            logger.error("S3 head failed: %s", e)
+            raise
+
+    def exists(self, s3_key: str) -> bool:
+        try:
+            self._s3.head_object(Bucket=self._bucket_name, Key=s3_key)
+            return True
+        except ClientError as e:
+            if is_not_found(e):
+                return False
+            logger.error("S3 head failed: %s", e)
+            raise
+
+    def delete_objects(self, s3_keys: List[str]) -> None:
+        # DeleteObjects takes up to 1000 keys per request.
+        for start in range(0, len(s3_keys), 1000):
+            objects = [{"Key": key} for key in s3_keys[start : start + 1000]]
+            try:
+                self._s3.delete_objects(
+                    Bucket=self._bucket_name,
+                    Delete={"Objects": objects, "Quiet": True},
+                )
+            except ClientError as e:
+                logger.error("S3 delete failed: %s", e)
+                raise
@@ -0,0 +1,168 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Any, Dict, List, Literal, Optional
+
+import numpy as np
+from llama_index.core.base.embeddings.base import Embedding
+from llama_index.core.embeddings import BaseEmbedding
+from pydantic import PrivateAttr
+
+from src.core.cache_backend import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(_normalize(text).encode()).hexdigest()
+
+
+def _embedding_dimensions(embedding: BaseEmbedding) -> Optional[int]:
+    """Requested output dimensionality, if the model was configured with one."""
+    dimensions = getattr(embedding, "dimensions", None)
+    if dimensions is None:
+        config = getattr(embedding, "embedding_config", None)
+        if isinstance(config, dict):
+            dimensions = config.get("output_dimensionality")
+        else:
+            dimensions = getattr(config, "output_dimensionality", None)
+    return dimensions if isinstance(dimensions, int) else None
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper with a persistent vector cache.
+
+    Vectors are keyed by (provider, model name, dimensionality, hash of the
+    whitespace-normalized text) and stored as compact float16/float32 bytes in
+    a shared CacheBackend. The key does not include the collection, so the same
+    text indexed into another collection is served from the cache.
+    Query embeddings are not cached and go straight to the wrapped model.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _backend: CacheBackend = PrivateAttr()
+    _namespace: str = PrivateAttr()
+    _dtype: Any = PrivateAttr()
+    _counters: Dict[str, int] = PrivateAttr()
+
+    def __init__(
+        self,
+        inner: BaseEmbedding,
+        provider: str,
+        backend: CacheBackend,
+        dtype: Literal["float32", "float16"] = "float16",
+        **kwargs: Any,
+    ):
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=inner.embed_batch_size,
+            **kwargs,
+        )
+        self._inner = inner
+        self._backend = backend
+        self._dtype = np.dtype(dtype)
+        dimensions = _embedding_dimensions(inner) or "native"
+        self._namespace = (
+            f"embeddings:{provider}:{inner.model_name}:{dimensions}:{dtype}"
+        )
+        self._counters = {"hits": 0, "misses": 0}
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    @property
+    def inner(self) -> BaseEmbedding:
+        return self._inner
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    def _encode(self, embedding: Embedding) -> bytes:
+        return np.asarray(embedding, dtype=self._dtype).tobytes()
+
+    def _decode(self, value: bytes) -> Embedding:
+        return np.frombuffer(value, dtype=self._dtype).astype(np.float32).tolist()
+
+    def lookup(self, texts: List[str]) -> List[Optional[Embedding]]:
+        """Bulk cache lookup; None marks a miss."""
+        keys = [_text_key(text) for text in texts]
+        try:
+            found = self._backend.get_many(self._namespace, set(keys))
+        except Exception as e:
+            logger.warning("Embedding cache lookup failed: %s", e)
+            found = {}
+        return [self._decode(found[key]) if key in found else None for key in keys]
+
+    def store(self, texts: List[str], embeddings: List[Embedding]) -> None:
+        items = {
+            _text_key(text): self._encode(embedding)
+            for text, embedding in zip(texts, embeddings, strict=True)
+        }
+        try:
+            self._backend.put_many(self._namespace, items)
+        except Exception as e:
+            logger.warning("Embedding cache write failed: %s", e)
+
+    def _split_misses(
+        self, texts: List[str], cached: List[Optional[Embedding]]
+    ) -> List[str]:
+        # Unique texts to embed, in first-seen order.
+        misses = dict.fromkeys(
+            text for text, hit in zip(texts, cached, strict=True) if hit is None
+        )
+        self._counters["hits"] += len(texts) - sum(hit is None for hit in cached)
+        self._counters["misses"] += len(misses)
+        return list(misses)
+
+    @staticmethod
+    def _merge(
+        texts: List[str],
+        cached: List[Optional[Embedding]],
+        misses: List[str],
+        fresh: List[Embedding],
+    ) -> List[Embedding]:
+        by_text = dict(zip(misses, fresh, strict=True))
+        return [
+            hit if hit is not None else by_text[text]
+            for text, hit in zip(texts, cached, strict=True)
+        ]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        cached = self.lookup(texts)
+        misses = self._split_misses(texts, cached)
+        fresh: List[Embedding] = []
+        if misses:
+            fresh = self._inner.get_text_embedding_batch(misses)
+            self.store(misses, fresh)
+        logger.debug("Embedding cache stats: %s", self._counters)
+        return self._merge(texts, cached, misses, fresh)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        cached = self.lookup(texts)
+        misses = self._split_misses(texts, cached)
+        fresh: List[Embedding] = []
+        if misses:
+            fresh = await self._inner.aget_text_embedding_batch(misses)
+            self.store(misses, fresh)
+        return self._merge(texts, cached, misses, fresh)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return (await self._aget_text_embeddings([text]))[0]
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._inner.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await self._inner.aget_query_embedding(query)
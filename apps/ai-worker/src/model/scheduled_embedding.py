@@ -0,0 +1,63 @@
+import asyncio
+from typing import Any, List
+
+from llama_index.core.base.embeddings.base import Embedding
+from llama_index.core.embeddings import BaseEmbedding
+from pydantic import PrivateAttr
+
+from src.services.embedding_scheduler import EmbeddingScheduler
+
+# Largest batch llama_index accepts; the scheduler re-batches by token budget.
+_MAX_EMBED_BATCH_SIZE = 2048
+
+
+class ScheduledEmbedding(BaseEmbedding):
+    """
+    Embedding model wrapper that sends text batches through an
+    EmbeddingScheduler (token-budgeted, concurrent, adaptive) instead of
+    llama_index's fixed-size synchronous batches.
+    """
+
+    _inner: BaseEmbedding = PrivateAttr()
+    _scheduler: EmbeddingScheduler = PrivateAttr()
+
+    def __init__(
+        self, inner: BaseEmbedding, scheduler: EmbeddingScheduler, **kwargs: Any
+    ):
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=_MAX_EMBED_BATCH_SIZE,
+            **kwargs,
+        )
+        self._inner = inner
+        self._scheduler = scheduler
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ScheduledEmbedding"
+
+    @property
+    def inner(self) -> BaseEmbedding:
+        return self._inner
+
+    @property
+    def scheduler(self) -> EmbeddingScheduler:
+        return self._scheduler
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self._scheduler.embed(self._inner._get_text_embeddings, texts)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return await asyncio.to_thread(self._get_text_embeddings, texts)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._inner.get_text_embedding(text)
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return await self._inner.aget_text_embedding(text)
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._inner.get_query_embedding(query)
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await self._inner.aget_query_embedding(query)
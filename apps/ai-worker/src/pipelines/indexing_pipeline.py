@@ -1,50 +1,129 @@
 import logging
-import os
-from typing import List
+from typing import List, Optional
 
+from llama_index.core.embeddings import BaseEmbedding
 from llama_index.core.ingestion import IngestionPipeline
 from llama_index.core.ingestion.cache import IngestionCache
-from llama_index.core.schema import Document
-from llama_index.vector_stores.qdrant import QdrantVectorStore
-from qdrant_client import QdrantClient
+from llama_index.core.schema import BaseNode, Document
 
+from src.core.cache_backend import SharedKVStore, get_cache_backend
 from src.core.config import settings
+from src.model.cached_embedding import CachedEmbedding
 from src.model.factory import LLMFactory
+from src.model.scheduled_embedding import ScheduledEmbedding
+from src.services.chunk_index import assign_chunk_ids
+from src.services.embedding_scheduler import get_embedding_scheduler
 from src.services.hybrid_content_splitter import HybridContentSplitter
+from src.services.qdrant_registry import get_qdrant_registry
 
 logger = logging.getLogger(__name__)
 
 
+_embedding: BaseEmbedding | None = None
+_splitter: HybridContentSplitter | None = None
+
+
+def _get_embedding() -> BaseEmbedding:
+    """Process-wide embedding stack (scheduler and cache wrappers included)."""
+    global _embedding
+    if _embedding is None:
+        embedding = LLMFactory.create_embedding("gemini")
+        if settings.EMBEDDING_SCHEDULER_ENABLED:
+            embedding = ScheduledEmbedding(
+                embedding, scheduler=get_embedding_scheduler("gemini")
+            )
+        if settings.EMBEDDING_CACHE_ENABLED:
+            embedding = CachedEmbedding(
+                embedding,
+                provider="gemini",
+                backend=get_cache_backend(),
+                dtype=settings.EMBEDDING_CACHE_DTYPE,
+            )
+        _embedding = embedding
+    return _embedding
+
+
+def _get_splitter() -> HybridContentSplitter:
+    global _splitter
+    if _splitter is None:
+        _splitter = HybridContentSplitter()
+    return _splitter
+
+
 class IndexingPipeline:
+    """
+    Split, embed and upsert documents into one Qdrant collection.
+
+    Construction is cheap: the Qdrant client and vector store come from the
+    process-wide registry, and the splitter and embedding stack are built once
+    per process and shared by every task.
+    """
+
     def __init__(self, collection_name: str):
-        self.client = QdrantClient(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-        self.embedding = LLMFactory.create_embedding("gemini")
-        self.vector_store = QdrantVectorStore(
-            client=self.client, collection_name=collection_name
-        )
+        registry = get_qdrant_registry()
+        self.client = registry.client()
+        self.vector_store = registry.vector_store(collection_name)
+        self.chunk_index = registry.chunk_index(collection_name)
+        self.embedding = _get_embedding()
         self.collection_name = collection_name
-        self.cache_file = os.path.join(settings.TEMP_DIR, "ingestion_cache.json")
-        self.cache = IngestionCache.from_persist_path(
-            self.cache_file, self.collection_name
+        # Shared, incrementally written cache namespaced per collection: lookups
+        # and writes touch only this document's entries, never the whole cache.
+        self.cache = IngestionCache(
+            cache=SharedKVStore(get_cache_backend(), prefix="ingestion"),
+            collection=self.collection_name,
         )
 
-    def run(self, documents: List[Document]):
+    @property
+    def splitter(self) -> HybridContentSplitter:
+        return _get_splitter()
+
+    def _run_incremental(
+        self, documents: List[Document], source_id: str
+    ) -> List[BaseNode]:
+        """Embed and upsert only chunks not stored yet; delete vanished ones."""
+        nodes = self.splitter(documents)
+        ids = set(assign_chunk_ids(nodes, source_id))
+        existing = self.chunk_index.existing_ids(source_id)
+        new_nodes = [node for node in nodes if node.id_ not in existing]
+        stale = existing - ids
+
+        if new_nodes:
+            self.vector_store.add(self.embedding(new_nodes))
+        # Make the new chunks visible before the old ones disappear.
+        self.vector_store.flush()
+        if stale:
+            self.chunk_index.delete(stale)
+
+        logger.info(
+            "Incremental indexing of %s: %s chunks, %s new, %s unchanged, %s deleted",
+            source_id,
+            len(nodes),
+            len(new_nodes),
+            len(nodes) - len(new_nodes),
+            len(stale),
+        )
+        return new_nodes
+
+    def run(self, documents: List[Document], source_id: Optional[str] = None):
+        """
+        Index documents. When source_id identifies the document they came from
+        and incremental indexing is enabled, only changed chunks are embedded
+        and upserted and chunks no longer present are deleted.
+        """
         try:
+            if source_id and settings.INDEXING_INCREMENTAL:
+                return self._run_incremental(documents, source_id)
+
             pipeline = IngestionPipeline(
-                transformations=[HybridContentSplitter(), self.embedding],
+                transformations=[self.splitter, self.embedding],
                 vector_store=self.vector_store,
                 cache=self.cache,
             )
 
-            nodes = pipeline.run(documents=documents)
-
-            try:
-                self.cache.persist(self.cache_file)
-            except Exception as e:
-                logger.error(e)
-                pass  # optional persistence, ignore errors
-
-            return nodes
+            return pipeline.run(documents=documents)
         except Exception as e:
             logger.exception("Indexing failed: %s", e)
             raise
+        finally:
+            # Barrier for non-blocking upserts issued by the vector store.
+            self.vector_store.flush()
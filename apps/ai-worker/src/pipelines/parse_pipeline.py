@@ -1,10 +1,12 @@
 import logging
 import os
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 from llama_index.core.schema import Document
 from pydantic import BaseModel
 
+from src.services.complexity_analyzer import PdfAnalysis
+from src.services.documents_service import close_documents
 from src.services.file_parsing_service import FileParsingService
 
 logger = logging.getLogger(__name__)
@@ -13,19 +15,26 @@ logger = logging.getLogger(__name__)
 class ParseFilePipelinePayload(BaseModel):
     local_input_path: str
     force_ocr: Optional[bool] = None
+    # (score, mime, is_complex) when the file was already classified.
+    file_info: Optional[Tuple[int, str, bool]] = None
 
 
 class ParseFilePipeline:
     def __init__(self):
         self.parser = FileParsingService()
 
-    def run(self, task: ParseFilePipelinePayload) -> List[Document]:
+    def run(
+        self, task: ParseFilePipelinePayload, pdf: Optional[PdfAnalysis] = None
+    ) -> List[Document]:
         try:
             logger.info("Parsing document")
-            documents = self.parser.parse_file(task.local_input_path, task.force_ocr)
+            documents = self.parser.parse_file(
+                task.local_input_path, task.force_ocr, task.file_info, pdf
+            )
 
             if not documents:
                 logger.warning("Parser returned empty content, aborting")
+                close_documents(documents)
                 return []
 
             logger.info("Success: document is parsed")
@@ -39,3 +48,66 @@ class ParseFilePipeline:
             if os.path.exists(task.local_input_path):
                 os.remove(task.local_input_path)
                 logger.debug("Temp file removed: %s", task.local_input_path)
+
+    def classify(
+        self,
+        local_input_path: str,
+        force_ocr: Optional[bool] = None,
+        pdf: Optional[PdfAnalysis] = None,
+    ) -> Tuple[Optional[Tuple[int, str, bool]], bool]:
+        """(file_info, whole file goes to the cloud); (None, False) on failure."""
+        try:
+            return self.parser.classify(local_input_path, bool(force_ocr), pdf)
+
+        except Exception as e:
+            logger.warning("Classification failed, parsing in place: %s", e)
+            return None, False
+
+    def run_cloud_stream(self, stream: BinaryIO, file_name: str) -> List[Document]:
+        try:
+            logger.info("Parsing document (streamed to cloud)")
+            documents = self.parser.parse_cloud_stream(stream, file_name)
+
+            if not documents:
+                logger.warning("Parser returned empty content, aborting")
+                close_documents(documents)
+                return []
+
+            logger.info("Success: document is parsed")
+
+            return documents
+
+        except Exception as e:
+            logger.exception("Critical failure: %s", e)
+            return []
+
+    def run_cloud_batch(
+        self, files: List[Tuple[BinaryIO, str]]
+    ) -> List[List[Document]]:
+        try:
+            logger.info("Parsing %s documents (cloud batch)", len(files))
+            results = self.parser.parse_cloud_batch(files)
+            logger.info(
+                "Success: %s of %s documents are parsed",
+                sum(bool(docs) for docs in results),
+                len(files),
+            )
+
+            return results
+
+        except Exception as e:
+            logger.exception("Critical failure: %s", e)
+            return [[] for _ in files]
+
+    def submit_cloud_job(
+        self, file_input: Union[str, BinaryIO], file_name: str
+    ) -> Optional[str]:
+        try:
+            job_id = self.parser.submit_cloud_job(file_input, file_name)
+            logger.info("Submitted cloud parse job %s", job_id)
+
+            return job_id
+
+        except Exception as e:
+            logger.exception("Critical failure: %s", e)
+            return None
@@ -0,0 +1,192 @@
+import logging
+import queue
+import threading
+from collections import Counter
+from typing import Callable, Iterable, List, Optional, Sequence, Set
+
+from llama_index.core.schema import BaseNode, Document
+
+from src.core.config import settings
+from src.pipelines.indexing_pipeline import IndexingPipeline
+from src.services.chunk_index import assign_chunk_ids
+from src.services.hybrid_content_splitter import HybridContentSplitter
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output.
+_DONE = object()
+
+
+class _Aborted(Exception):
+    pass
+
+
+class StreamingIndexingPipeline:
+    """
+    Stage-overlapped variant of IndexingPipeline.run.
+
+    Documents flow through split -> embed -> upsert stages, each running in its
+    own thread and connected by bounded queues. Splitting document N+1 overlaps
+    embedding of document N and upserts of already embedded batches, and peak
+    memory is bounded by the queue sizes instead of by document size (as long
+    as `documents` is a lazy iterator). With a source_id, chunks get the same
+    deterministic ids as in IndexingPipeline's incremental mode; when
+    incremental indexing is enabled, chunks already stored are not embedded
+    again and the source's vanished chunks are deleted once the run is done.
+    """
+
+    def __init__(
+        self,
+        indexer: IndexingPipeline,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        self._indexer = indexer
+        self._queue_size = queue_size or settings.VECTORIZE_QUEUE_SIZE
+        self._batch_size = batch_size or settings.VECTORIZE_BATCH_SIZE
+        self._splitter: Optional[HybridContentSplitter] = None
+        self._stop = threading.Event()
+        self._upserted = 0
+        self._chunks = 0
+        self._source_id: Optional[str] = None
+        # Occurrences of each chunk hash across the documents of the source.
+        self._seen: Counter = Counter()
+        self._existing: Set[str] = set()
+        self._chunk_ids: Set[str] = set()
+
+    @property
+    def splitter(self) -> HybridContentSplitter:
+        if self._splitter is None:
+            self._splitter = self._indexer.splitter
+        return self._splitter
+
+    def _put(self, q: queue.Queue, item: object) -> None:
+        # Blocks while the next stage is busy, but gives up once another stage
+        # has failed so no thread hangs on a full queue.
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Aborted
+
+    def _get(self, q: queue.Queue) -> object:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        raise _Aborted
+
+    def _split(self, document: Document) -> Iterable[List[BaseNode]]:
+        nodes = self.splitter([document])
+        self._chunks += len(nodes)
+        if self._source_id:
+            self._chunk_ids.update(assign_chunk_ids(nodes, self._source_id, self._seen))
+            nodes = [node for node in nodes if node.id_ not in self._existing]
+        for start in range(0, len(nodes), self._batch_size):
+            yield nodes[start : start + self._batch_size]
+
+    def _embed(self, nodes: List[BaseNode]) -> Iterable[List[BaseNode]]:
+        yield list(self._indexer.embedding(nodes))
+
+    def _upsert(self, nodes: Sequence[BaseNode]) -> Iterable[List[BaseNode]]:
+        self._indexer.vector_store.add(list(nodes))
+        self._upserted += len(nodes)
+        return []
+
+    def _stage(
+        self,
+        name: str,
+        work: Callable[[object], Iterable[object]],
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue],
+        errors: List[BaseException],
+    ) -> None:
+        try:
+            while (item := self._get(inbox)) is not _DONE:
+                for result in work(item):
+                    if outbox is not None:
+                        self._put(outbox, result)
+            if outbox is not None:
+                self._put(outbox, _DONE)
+        except _Aborted:
+            pass
+        except BaseException as e:
+            logger.exception("Streaming %s stage failed: %s", name, e)
+            errors.append(e)
+            self._stop.set()
+
+    def run(
+        self, documents: Iterable[Document], source_id: Optional[str] = None
+    ) -> int:
+        """
+        Index documents, returning the number of chunks they were split into
+        (upserted, or already stored when indexing incrementally).
+        """
+        self._stop.clear()
+        self._upserted = 0
+        self._chunks = 0
+        self._source_id = source_id
+        self._seen = Counter()
+        self._chunk_ids = set()
+        incremental = bool(source_id) and settings.INDEXING_INCREMENTAL
+        self._existing = (
+            self._indexer.chunk_index.existing_ids(source_id) if incremental else set()
+        )
+        errors: List[BaseException] = []
+        documents_q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        split_q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+        embedded_q: queue.Queue = queue.Queue(maxsize=self._queue_size)
+
+        stages = [
+            ("split", self._split, documents_q, split_q),
+            ("embed", self._embed, split_q, embedded_q),
+            ("upsert", self._upsert, embedded_q, None),
+        ]
+        threads = [
+            threading.Thread(
+                target=self._stage,
+                args=(name, work, inbox, outbox, errors),
+                name=f"vectorize-{name}",
+                daemon=True,
+            )
+            for name, work, inbox, outbox in stages
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for document in documents:
+                self._put(documents_q, document)
+            self._put(documents_q, _DONE)
+        except _Aborted:
+            pass
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+            self._indexer.vector_store.flush()
+
+        if errors:
+            raise errors[0]
+
+        if incremental:
+            # The new chunks were flushed above, before the old ones disappear.
+            # A source that yields no chunks at all keeps its stored ones.
+            stale = self._existing - self._chunk_ids if self._chunks else set()
+            if stale:
+                self._indexer.chunk_index.delete(stale)
+            logger.info(
+                "Incremental streaming indexing of %s: %s chunks, %s new, %s deleted",
+                source_id,
+                self._chunks,
+                self._upserted,
+                len(stale),
+            )
+        else:
+            logger.info("Streaming indexing upserted %s nodes", self._upserted)
+        return self._chunks
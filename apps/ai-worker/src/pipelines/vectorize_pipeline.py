@@ -1,10 +1,13 @@
 import logging
 import os
+from typing import Optional
 
 from pydantic import BaseModel
 
+from src.core.config import settings
 from src.pipelines.indexing_pipeline import IndexingPipeline
-from src.services.file_parsing_service import FileParsingService
+from src.pipelines.streaming_indexing_pipeline import StreamingIndexingPipeline
+from src.services.documents_service import DocumentsService
 
 logger = logging.getLogger(__name__)
 
@@ -12,23 +15,42 @@ logger = logging.getLogger(__name__)
 class VectorizeFilePipelinePayload(BaseModel):
     local_input_path: str
     collection_name: str
+    source_id: Optional[str] = None
 
 
 class VectorizeFilePipeline:
     def __init__(self):
-        self.parser = FileParsingService()
+        self.documents_service = DocumentsService()
+
+    def _run_streaming(self, task: VectorizeFilePipelinePayload) -> None:
+        indexer = IndexingPipeline(collection_name=task.collection_name)
+        documents = self.documents_service.iter_documents(task.local_input_path)
+        nodes_count = StreamingIndexingPipeline(indexer).run(
+            documents, source_id=task.source_id
+        )
+        if not nodes_count:
+            logger.warning("Parser returned empty content, aborting")
+            return
+        logger.info("Success: document is RAG-ready")
 
     def run(self, task: VectorizeFilePipelinePayload):
         try:
+            if settings.VECTORIZE_STREAMING:
+                logger.info("Vectorizing file (streaming)")
+                self._run_streaming(task)
+                return
+
             logger.info("Vectorizing file")
-            documents = self.parser.read_text_file(task.local_input_path)
+            documents = list(
+                self.documents_service.iter_documents(task.local_input_path)
+            )
 
             if not documents:
                 logger.warning("Parser returned empty content, aborting")
                 return
 
             indexer = IndexingPipeline(collection_name=task.collection_name)
-            indexer.run(documents)
+            indexer.run(documents, source_id=task.source_id)
 
             logger.info("Success: document is RAG-ready")
 
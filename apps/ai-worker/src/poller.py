@@ -0,0 +1,21 @@
+"""
+Cloud parse poller: collects the results of async LlamaParse jobs
+(PARSE_CLOUD_ASYNC) and finishes their parse tasks. One process handles every
+outstanding job from a single asyncio loop:
+
+  uv run python -m src.poller
+"""
+
+import asyncio
+
+from src.core.logging_config import setup_logging
+from src.tasks.parse_file import poll_cloud_jobs
+
+
+def main() -> None:
+    setup_logging()
+    asyncio.run(poll_cloud_jobs())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from llama_index.core.schema import BaseNode, MetadataMode
+from qdrant_client import QdrantClient, models
+
+logger = logging.getLogger(__name__)
+
+# Payload fields written on every chunk indexed incrementally.
+SOURCE_ID_KEY = "source_id"
+CHUNK_HASH_KEY = "chunk_hash"
+
+_SCROLL_PAGE_SIZE = 1000
+_DELETE_BATCH_SIZE = 1000
+
+
+def chunk_hash(node: BaseNode) -> str:
+    """Stable hash of a chunk's text and metadata."""
+    payload = {
+        "text": node.get_content(metadata_mode=MetadataMode.NONE),
+        "metadata": {
+            key: value
+            for key, value in node.metadata.items()
+            if key not in (SOURCE_ID_KEY, CHUNK_HASH_KEY)
+        },
+    }
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _remap_relationships(nodes: Sequence[BaseNode], ids: Dict[str, str]) -> None:
+    for node in nodes:
+        for related in node.relationships.values():
+            for info in related if isinstance(related, list) else [related]:
+                if info.node_id in ids:
+                    info.node_id = ids[info.node_id]
+
+
+def assign_chunk_ids(
+    nodes: Sequence[BaseNode], source_id: str, seen: Optional[Counter] = None
+) -> List[str]:
+    """
+    Give nodes deterministic ids derived from their source and content.
+
+    The same chunk of the same source always gets the same point id, so a
+    re-index can tell new chunks from already stored ones by id alone.
+    Identical chunks within a source are told apart by occurrence; pass the
+    same `seen` counter to number them across calls when a source is assigned
+    in parts (e.g. document by document). The hash and source id are stored in
+    the node metadata (hidden from embedding and LLM content) and
+    relationships between the nodes are rewritten to the new ids.
+    """
+    seen = Counter() if seen is None else seen
+    ids: Dict[str, str] = {}
+    for node in nodes:
+        digest = chunk_hash(node)
+        occurrence = seen[digest]
+        seen[digest] += 1
+        new_id = str(
+            uuid.uuid5(uuid.NAMESPACE_URL, f"{source_id}\n{digest}\n{occurrence}")
+        )
+        ids[node.id_] = new_id
+        node.id_ = new_id
+        node.metadata[SOURCE_ID_KEY] = source_id
+        node.metadata[CHUNK_HASH_KEY] = digest
+        for excluded in (
+            node.excluded_embed_metadata_keys,
+            node.excluded_llm_metadata_keys,
+        ):
+            excluded.extend(
+                key for key in (SOURCE_ID_KEY, CHUNK_HASH_KEY) if key not in excluded
+            )
+    _remap_relationships(nodes, ids)
+    return [node.id_ for node in nodes]
+
+
+class QdrantChunkIndex:
+    """Reads and deletes the stored chunk ids of a source in one collection."""
+
+    def __init__(self, client: QdrantClient, collection_name: str):
+        self._client = client
+        self._collection_name = collection_name
+        self._payload_index_ready = False
+
+    def _source_filter(self, source_id: str) -> models.Filter:
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key=SOURCE_ID_KEY, match=models.MatchValue(value=source_id)
+                )
+            ]
+        )
+
+    def _ensure_payload_index(self) -> None:
+        if self._payload_index_ready:
+            return
+        try:
+            self._client.create_payload_index(
+                collection_name=self._collection_name,
+                field_name=SOURCE_ID_KEY,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+        except Exception as e:
+            # Not fatal: filtering still works, only slower.
+            logger.warning("Could not create %s payload index: %s", SOURCE_ID_KEY, e)
+        self._payload_index_ready = True
+
+    def existing_ids(self, source_id: str) -> Set[str]:
+        if not self._client.collection_exists(self._collection_name):
+            return set()
+        self._ensure_payload_index()
+        ids: Set[str] = set()
+        offset = None
+        while True:
+            records, offset = self._client.scroll(
+                collection_name=self._collection_name,
+                scroll_filter=self._source_filter(source_id),
+                limit=_SCROLL_PAGE_SIZE,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            ids.update(str(record.id) for record in records)
+            if offset is None:
+                return ids
+
+    def delete(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        for start in range(0, len(ids), _DELETE_BATCH_SIZE):
+            self._client.delete(
+                collection_name=self._collection_name,
+                points_selector=models.PointIdsList(
+                    points=ids[start : start + _DELETE_BATCH_SIZE]
+                ),
+            )
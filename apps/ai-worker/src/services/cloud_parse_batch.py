@@ -0,0 +1,114 @@
+import json
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ai_worker:cloud_batch"
+
+# Put entries whose lease expired at ARGV[1] back at the head of the list, then
+# lease up to ARGV[2] entries from the head until ARGV[3], counting the attempt
+# of each. Keeps the byte total in step and clears the flush flag.
+_DRAIN_SCRIPT = """
+local bytes = 0
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])
+for i = #stale, 1, -1 do
+    redis.call('LPUSH', KEYS[1], stale[i])
+    redis.call('ZREM', KEYS[2], stale[i])
+    bytes = bytes + cjson.decode(stale[i]).size
+end
+local entries = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[2]) - 1)
+if #entries > 0 then
+    redis.call('LTRIM', KEYS[1], #entries, -1)
+end
+for _, entry in ipairs(entries) do
+    local decoded = cjson.decode(entry)
+    redis.call('ZADD', KEYS[2], ARGV[3], entry)
+    redis.call('HINCRBY', KEYS[5], decoded.id, 1)
+    bytes = bytes - decoded.size
+end
+redis.call('INCRBY', KEYS[3], bytes)
+redis.call('DEL', KEYS[4])
+return entries
+"""
+
+
+class CloudParseBatchBuffer:
+    """
+    Redis buffer of small cloud-bound uploads waiting to be parsed together.
+
+    Every parser lane worker appends to the same list, so a batch collects
+    files from the whole cluster. A running byte total backs the size budget,
+    and a short-lived flag makes sure only one flush is scheduled per window.
+
+    Drained entries are leased, not removed: they stay in a processing set
+    until ack() and go back to the buffer once their lease expires, so the
+    files of a worker that died mid-batch are parsed by the next drain.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._redis = client or redis.Redis.from_url(settings.redis_url)
+        self._drain = self._redis.register_script(_DRAIN_SCRIPT)
+        self._files_key = f"{_KEY_PREFIX}:files"
+        self._processing_key = f"{_KEY_PREFIX}:processing"
+        self._bytes_key = f"{_KEY_PREFIX}:bytes"
+        self._flush_key = f"{_KEY_PREFIX}:flush_scheduled"
+        self._attempts_key = f"{_KEY_PREFIX}:attempts"
+
+    def add(self, payload: Dict[str, Any], size: int) -> Tuple[int, int]:
+        """Buffer a task payload, returning the buffered (files, bytes)."""
+        # The id keeps entries of the same upload apart in the processing set.
+        entry = {"id": uuid.uuid4().hex, "payload": payload, "size": size}
+        pipe = self._redis.pipeline()
+        pipe.rpush(self._files_key, json.dumps(entry))
+        pipe.incrby(self._bytes_key, size)
+        files, total_bytes = pipe.execute()
+        return int(files), int(total_bytes)
+
+    def schedule_flush(self, window_seconds: float) -> bool:
+        """Claim the pending flush of the current window; True if it was free."""
+        return bool(
+            self._redis.set(
+                self._flush_key, 1, nx=True, ex=max(1, int(window_seconds * 2))
+            )
+        )
+
+    def drain(
+        self, max_files: int, lease_seconds: float
+    ) -> List[Tuple[bytes, Dict[str, Any]]]:
+        """
+        Lease up to max_files buffered payloads, oldest first, as (entry,
+        payload) pairs; pass the entry to ack() once the file is done.
+        """
+        now = time.time()
+        raw_entries = self._drain(
+            keys=[
+                self._files_key,
+                self._processing_key,
+                self._bytes_key,
+                self._flush_key,
+                self._attempts_key,
+            ],
+            args=[now, max_files, now + lease_seconds],
+        )
+        return [(raw, json.loads(raw)["payload"]) for raw in raw_entries or []]
+
+    def ack(self, entry: bytes) -> None:
+        """Drop a drained entry for good."""
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._processing_key, entry)
+        pipe.hdel(self._attempts_key, json.loads(entry)["id"])
+        pipe.execute()
+
+    def attempts(self, entry: bytes) -> int:
+        """How many times a drained entry has been leased, this time included."""
+        return int(self._redis.hget(self._attempts_key, json.loads(entry)["id"]) or 0)
+
+    def pending(self) -> int:
+        return int(self._redis.llen(self._files_key))
@@ -0,0 +1,199 @@
+"""
+Asynchronous cloud parse jobs.
+
+Instead of blocking a worker for the whole LlamaParse job, the parser lane
+submits the upload, records the job in CloudParseJobStore and returns. A single
+CloudParseJobPoller (one asyncio loop, `python -m src.poller`) then checks all
+outstanding jobs concurrently and hands finished ones to a completion callback,
+so one node keeps hundreds of cloud parses in flight.
+
+Jobs live in Redis: one record per job plus a sorted set of job ids scored by
+their next poll time. Pollers claim due jobs by pushing their score one lease
+ahead, so several pollers can run side by side and a job claimed by a poller
+that died is picked up again once its lease expires.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import redis
+from llama_index.core.schema import Document
+from pydantic import BaseModel, Field
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ai_worker:cloud_parse"
+
+# Atomically take up to ARGV[2] jobs due at ARGV[1] and lease them until ARGV[3].
+_CLAIM_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, id in ipairs(ids) do
+    redis.call('ZADD', KEYS[1], ARGV[3], id)
+end
+return ids
+"""
+
+
+class CloudParseJobFailed(Exception):
+    """The cloud parser finished the job without a result."""
+
+
+class CloudParseJob(BaseModel):
+    job_id: str
+    file_name: str
+    submitted_at: float = Field(default_factory=time.time)
+    # Whatever the completion callback needs to finish the task.
+    payload: Dict[str, Any] = Field(default_factory=dict)
+
+
+class CloudParseJobStore:
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._redis = client or redis.Redis.from_url(settings.redis_url)
+        self._claim = self._redis.register_script(_CLAIM_SCRIPT)
+        self._pending_key = f"{_KEY_PREFIX}:pending"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{_KEY_PREFIX}:job:{job_id}"
+
+    def add(self, job: CloudParseJob) -> None:
+        pipe = self._redis.pipeline()
+        pipe.set(self._job_key(job.job_id), job.model_dump_json())
+        pipe.zadd(
+            self._pending_key,
+            {job.job_id: time.time() + settings.CLOUD_PARSE_POLL_INTERVAL},
+        )
+        pipe.execute()
+
+    def claim_due(self, limit: int, lease_seconds: float) -> List[CloudParseJob]:
+        """Lease up to `limit` jobs whose next poll is due."""
+        now = time.time()
+        ids = [
+            i.decode() if isinstance(i, bytes) else i
+            for i in self._claim(
+                keys=[self._pending_key], args=[now, limit, now + lease_seconds]
+            )
+        ]
+        if not ids:
+            return []
+        jobs = []
+        for job_id, raw in zip(
+            ids, self._redis.mget([self._job_key(i) for i in ids]), strict=True
+        ):
+            if raw is None:
+                # Record is gone (completed elsewhere); drop the stale entry.
+                self._redis.zrem(self._pending_key, job_id)
+                continue
+            jobs.append(CloudParseJob.model_validate_json(raw))
+        return jobs
+
+    def reschedule(self, job_id: str, delay: float) -> None:
+        self._redis.zadd(self._pending_key, {job_id: time.time() + delay})
+
+    def remove(self, job_id: str) -> None:
+        pipe = self._redis.pipeline()
+        pipe.zrem(self._pending_key, job_id)
+        pipe.delete(self._job_key(job_id))
+        pipe.execute()
+
+    def pending(self) -> int:
+        return int(self._redis.zcard(self._pending_key))
+
+
+FetchFn = Callable[[CloudParseJob], Awaitable[Optional[List[Document]]]]
+CompleteFn = Callable[[CloudParseJob, List[Document]], None]
+
+
+class CloudParseJobPoller:
+    """
+    Polls outstanding cloud jobs from one asyncio loop.
+
+    `fetch` returns a job's documents, or None while it is still running.
+    Finished jobs go to `on_complete` (run in a thread: it does blocking I/O)
+    and are removed from the store. Pending jobs are polled again after a delay
+    that grows with their age, from CLOUD_PARSE_POLL_INTERVAL up to
+    CLOUD_PARSE_POLL_MAX_INTERVAL; failed or timed out jobs are dropped.
+    """
+
+    def __init__(
+        self,
+        store: CloudParseJobStore,
+        fetch: FetchFn,
+        on_complete: CompleteFn,
+        max_in_flight: Optional[int] = None,
+    ):
+        self._store = store
+        self._fetch = fetch
+        self._on_complete = on_complete
+        self._max_in_flight = max_in_flight or settings.CLOUD_PARSE_POLL_CONCURRENCY
+
+    def _next_delay(self, job: CloudParseJob) -> float:
+        age = time.time() - job.submitted_at
+        return min(
+            settings.CLOUD_PARSE_POLL_MAX_INTERVAL,
+            max(settings.CLOUD_PARSE_POLL_INTERVAL, age / 10),
+        )
+
+    async def _poll(self, job: CloudParseJob) -> bool:
+        """Poll one job, returning whether it left the store."""
+        try:
+            documents = await self._fetch(job)
+        except CloudParseJobFailed as e:
+            logger.error("Cloud parse job %s failed: %s", job.job_id, e)
+            self._store.remove(job.job_id)
+            return True
+        except Exception as e:
+            # Transient (network, 5xx): try again on the next round.
+            logger.warning("Polling cloud parse job %s failed: %s", job.job_id, e)
+            documents = None
+
+        if documents is None:
+            if time.time() - job.submitted_at > settings.CLOUD_PARSE_JOB_TIMEOUT:
+                logger.error("Cloud parse job %s timed out", job.job_id)
+                self._store.remove(job.job_id)
+                return True
+            self._store.reschedule(job.job_id, self._next_delay(job))
+            return False
+
+        # Only drop the job once its result is stored; if completion fails the
+        # lease expires and the job is polled (and completed) again.
+        await asyncio.to_thread(self._on_complete, job, documents)
+        self._store.remove(job.job_id)
+        logger.info(
+            "Cloud parse job %s done after %.0fs",
+            job.job_id,
+            time.time() - job.submitted_at,
+        )
+        return True
+
+    async def poll_once(self) -> int:
+        """Poll every due job once, returning how many were finished."""
+        jobs = self._store.claim_due(
+            self._max_in_flight, settings.CLOUD_PARSE_LEASE_SECONDS
+        )
+        results = await asyncio.gather(
+            *(self._poll(job) for job in jobs), return_exceptions=True
+        )
+        for job, result in zip(jobs, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Completing cloud parse job %s failed: %s", job.job_id, result
+                )
+        return sum(result is True for result in results)
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        stop = stop or asyncio.Event()
+        logger.info(
+            "Cloud parse poller started (%s jobs pending)", self._store.pending()
+        )
+        while not stop.is_set():
+            await self.poll_once()
+            try:
+                await asyncio.wait_for(
+                    stop.wait(), timeout=settings.CLOUD_PARSE_POLL_TICK
+                )
+            except asyncio.TimeoutError:
+                pass
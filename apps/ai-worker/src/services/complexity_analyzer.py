@@ -1,21 +1,86 @@
+import contextlib
 import logging
 import os
+import struct
 import zipfile
-from typing import Tuple, TypedDict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
 
 import fitz  # PyMuPDF
 import magic
 from typing_extensions import ReadOnly
 
+from src.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+_OFFICE_MIME_TYPES = [
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/msword",  # .doc (Legacy)
+    "application/vnd.ms-excel",  # .xls (Legacy)
+]
+# Old magic databases report OOXML files as plain zip archives.
+_ZIP_MIME_TYPES = ["application/zip", "application/x-zip-compressed"]
+_OFFICE_ZIP_PARTS = {
+    "word/": _OFFICE_MIME_TYPES[0],
+    "ppt/": _OFFICE_MIME_TYPES[1],
+    "xl/": _OFFICE_MIME_TYPES[2],
+}
+_ZIP_EOCD = b"PK\x05\x06"
+_ZIP_CENTRAL_ENTRY = b"PK\x01\x02"
+# Drawing count given to pages whose content stream is too large to enumerate.
+_DENSE_DRAWINGS = 51
+
+
 class Response(TypedDict):
     score: ReadOnly[int]
     mime_type: ReadOnly[str]
     is_complex: ReadOnly[bool]
 
 
+class PdfAnalysis:
+    """
+    A PDF shared by the complexity analysis and the parser: one document
+    handle (opened on first use) and the page scores computed so far.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.page_scores: Dict[int, int] = {}
+        self._doc: Optional[fitz.Document] = None
+
+    @property
+    def doc(self) -> fitz.Document:
+        if self._doc is None:
+            self._doc = fitz.open(self.file_path)
+        return self._doc
+
+    def close(self) -> None:
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+    def __enter__(self) -> "PdfAnalysis":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@contextlib.contextmanager
+def open_pdf(
+    file_path: str, pdf: Optional[PdfAnalysis] = None
+) -> Iterator[PdfAnalysis]:
+    """Use the caller's shared PdfAnalysis, or one closed on exit."""
+    if pdf is not None:
+        yield pdf
+        return
+    with PdfAnalysis(file_path) as pdf:
+        yield pdf
+
+
 class DocumentComplexityAnalyzer:
     def _get_document_type(self, file_path: str) -> str:
         if not os.path.exists(file_path):
@@ -30,97 +95,245 @@ class DocumentComplexityAnalyzer:
     def _prepare_response(self, score: int, mime_type: str) -> Tuple[int, str, bool]:
         return [score, mime_type, self._is_complex(score)]
 
-    def _score_pdf(self, file_path: str) -> int:
-        """
-        Analyzes PDF internals using PyMuPDF.
-        High Score = Scanned images or heavy vector graphics (tables).
-        """
-        try:
-            doc = fitz.open(file_path)
-            total_score = 0
-            pages_to_check = min(3, len(doc))
+    def _score_page(self, page: fitz.Page) -> int:
+        """Score of one PDF page; 100 means it is a scan."""
+        # A. OCR CHECK: Full page image with no text?
+        if len(page.get_text()) < 50:
+            return 100  # It's a scan. Requires LlamaParse OCR.
 
-            for i in range(pages_to_check):
-                page = doc[i]
-                text = page.get_text()
-                drawings = page.get_drawings()
-                images = page.get_images()
+        score = 0
+        # B. TABLE CHECK: Lots of vector lines? Pages with huge content streams
+        # are dense anyway, so their paths are not enumerated at all.
+        if len(page.read_contents()) > settings.PDF_ANALYSIS_MAX_CONTENT_BYTES:
+            drawings = _DENSE_DRAWINGS
+        else:
+            drawings = len(page.get_cdrawings())
+        if drawings > 50:
+            score += 40  # Likely a complex table
+        elif drawings > 20:
+            score += 20
 
-                # A. OCR CHECK: Full page image with no text?
-                if len(text) < 50:
-                    return 100  # It's a scan. Requires LlamaParse OCR.
+        # C. IMAGE CHECK: Embedded diagrams?
+        if len(page.get_images()) > 2:
+            score += 20
+        return score
 
-                # B. TABLE CHECK: Lots of vector lines?
-                if len(drawings) > 50:
-                    total_score += 40  # Likely a complex table
-                elif len(drawings) > 20:
-                    total_score += 20
+    def _page_score(self, pdf: PdfAnalysis, index: int) -> int:
+        if index not in pdf.page_scores:
+            pdf.page_scores[index] = self._score_page(pdf.doc[index])
+        return pdf.page_scores[index]
 
-                # C. IMAGE CHECK: Embedded diagrams?
-                if len(images) > 2:
-                    total_score += 20
+    @staticmethod
+    def sample_pages(page_count: int, samples: int) -> List[int]:
+        """Up to `samples` page indexes spread evenly from first to last page."""
+        if page_count <= samples:
+            return list(range(page_count))
+        if samples == 1:
+            return [0]
+        return [round(i * (page_count - 1) / (samples - 1)) for i in range(samples)]
 
-            doc.close()
-            return min(total_score, 100)
+    def _score_pdf(self, file_path: str, pdf: Optional[PdfAnalysis] = None) -> int:
+        """
+        Analyzes PDF internals using PyMuPDF, on PDF_ANALYSIS_SAMPLE_PAGES
+        pages spread across the document.
+        High Score = Scanned images or heavy vector graphics (tables).
+        """
+        try:
+            with open_pdf(file_path, pdf) as pdf:
+                total_score = 0
+                samples = self.sample_pages(
+                    len(pdf.doc), settings.PDF_ANALYSIS_SAMPLE_PAGES
+                )
+                for index in samples:
+                    page_score = self._page_score(pdf, index)
+                    if page_score >= 100:
+                        return 100
+                    total_score += page_score
+                return min(total_score, 100)
 
         except Exception as e:
             logger.warning("PDF score failed, defaulting to cloud: %s", e)
             return 100  # Fail safe -> Use Cloud
 
+    def classify_pdf_pages(
+        self, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> List[bool]:
+        """Per page, whether it needs the cloud parser (scans, dense tables)."""
+        with open_pdf(file_path, pdf) as pdf:
+            return [
+                self._is_complex(self._page_score(pdf, index))
+                for index in range(len(pdf.doc))
+            ]
+
+    @staticmethod
+    def page_segments(flags: List[bool]) -> List[Tuple[int, int, bool]]:
+        """Runs of equal flags as (first page, last page, flag), in page order."""
+        segments: List[Tuple[int, int, bool]] = []
+        for index, flag in enumerate(flags):
+            if segments and segments[-1][2] == flag:
+                segments[-1] = (segments[-1][0], index, flag)
+            else:
+                segments.append((index, index, flag))
+        return segments
+
+    def _score_office_names(self, file_list: List[str]) -> int:
+        score = 0
+        has_charts = any("charts/" in name for name in file_list)
+        has_embeddings = any("embeddings/" in name for name in file_list)
+
+        if has_charts:
+            score += 50
+        if has_embeddings:
+            score += 40
+        return min(score, 100)
+
     def _score_office_xml(self, file_path: str) -> int:
         """
         Analyzes Office XML structure (unzipping headers).
         """
-        score = 0
-
         try:
             with zipfile.ZipFile(file_path, "r") as z:
-                file_list = z.namelist()
-
-                has_charts = any("charts/" in name for name in file_list)
-                has_embeddings = any("embeddings/" in name for name in file_list)
-
-                if has_charts:
-                    score += 50
-                if has_embeddings:
-                    score += 40
-            return min(score, 100)
+                return self._score_office_names(z.namelist())
         except zipfile.BadZipFile:
             return 100  # Corrupted or password protected -> Hard
 
-    def get_file_info(self, file_path: str) -> Tuple[int, str, bool]:
-        mime_type = self._get_document_type(file_path=file_path)
+    @staticmethod
+    def zip_entry_names(tail: bytes) -> Optional[List[str]]:
+        """
+        Entry names from the central directory found in the last bytes of a zip
+        archive, or None when the tail does not hold the whole directory.
+        """
+        eocd = tail.rfind(_ZIP_EOCD)
+        if eocd < 0 or len(tail) - eocd < 22:
+            return None
+        count, cd_size = struct.unpack_from("<HI", tail, eocd + 10)
+        start = eocd - cd_size
+        if start < 0:
+            return None
+        names = []
+        pos = start
+        for _ in range(count):
+            if tail[pos : pos + 4] != _ZIP_CENTRAL_ENTRY:
+                return None
+            name_len, extra_len, comment_len = struct.unpack_from(
+                "<HHH", tail, pos + 28
+            )
+            name = tail[pos + 46 : pos + 46 + name_len]
+            names.append(name.decode("utf-8", "replace"))
+            pos += 46 + name_len + extra_len + comment_len
+        return names
 
+    def _score_by_mime(
+        self,
+        mime_type: str,
+        score_pdf: Callable[[], Optional[int]],
+        score_office: Callable[[], Optional[int]],
+    ) -> Optional[int]:
         # --- PDF ---
         if mime_type == "application/pdf":
-            score = self._score_pdf(file_path)
-            return self._prepare_response(score, mime_type)
+            return score_pdf()
 
         # --- OFFICE DOCUMENTS (Word, PPT, Excel) ---
         # Note: Valid Office files are often identified as generic zip or octet-stream
         # if magic definitions are old, but usually they have specific VND types.
-        if mime_type in [
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            "application/msword",  # .doc (Legacy)
-            "application/vnd.ms-excel",  # .xls (Legacy)
-        ]:
+        if mime_type in _OFFICE_MIME_TYPES:
             if "spreadsheet" in mime_type or "excel" in mime_type:
-                return self._prepare_response(
-                    10, mime_type
-                )  # Low score -> Local Pandas
-            return self._prepare_response(self._score_office_xml(file_path), mime_type)
+                return 10  # Low score -> Local Pandas
+            return score_office()
 
         # --- TEXT / CSV ---
         if mime_type.startswith("text/") or mime_type == "application/csv":
-            return self._prepare_response(0, mime_type)  # Text is always easy
+            return 0  # Text is always easy
 
         # --- IMAGES ---
         if mime_type.startswith("image/"):
-            return self._prepare_response(
-                100, mime_type
-            )  # Images always need OCR -> Cloud
+            return 100  # Images always need OCR -> Cloud
 
         # --- UNKNOWN / BINARY ---
-        return self._prepare_response(100, mime_type)  # Safety fallback
+        return 100  # Safety fallback
+
+    def get_file_info(
+        self, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> Tuple[int, str, bool]:
+        """
+        Classify a local file. A PdfAnalysis passed in keeps the opened PDF and
+        its page scores for the parser.
+        """
+        mime_type = self._get_document_type(file_path=file_path)
+        score = self._score_by_mime(
+            mime_type,
+            score_pdf=lambda: self._score_pdf(file_path, pdf),
+            score_office=lambda: self._score_office_xml(file_path),
+        )
+        return self._prepare_response(score, mime_type)
+
+    def score_pdf_sample(self, sample: bytes) -> Optional[int]:
+        """
+        Score a PDF from a sample of its bytes (its start and its end), before
+        it is downloaded. MuPDF rebuilds the page tree from the objects in the
+        sample; the leading pages whose content is in it are checked for
+        scans. Returns 100 when all of them are scans, None when the sample
+        cannot tell.
+        """
+        try:
+            with fitz.open(stream=sample, filetype="pdf") as doc:
+                scans = []
+                for page in doc:
+                    if not page.read_contents():
+                        break  # The rest of the document is not in the sample.
+                    scans.append(
+                        len(page.get_text()) < 50 and len(page.get_images()) > 0
+                    )
+        except Exception as e:
+            logger.debug("PDF sample unreadable: %s", e)
+            return None
+        if scans and all(scans):
+            return 100
+        return None
+
+    def _score_pdf_sample(
+        self, read_pdf_sample: Optional[Callable[[], Optional[bytes]]]
+    ) -> Optional[int]:
+        sample = read_pdf_sample() if read_pdf_sample else None
+        return self.score_pdf_sample(sample) if sample else None
+
+    def get_header_info(
+        self,
+        header: bytes,
+        read_tail: Callable[[], bytes],
+        read_pdf_sample: Optional[Callable[[], Optional[bytes]]] = None,
+    ) -> Optional[Tuple[int, str, bool]]:
+        """
+        Classify a file from its first bytes, before it is downloaded.
+
+        Office archives are scored from their central directory, which
+        read_tail() returns from the end of the object; PDFs from the sample
+        read_pdf_sample() returns (see score_pdf_sample). Returns None when the
+        whole file is needed to decide (PDFs the sample cannot tell, or
+        archives whose directory is not in the tail).
+        """
+        mime_type = magic.from_buffer(header, mime=True)
+        names: Optional[List[str]] = None
+        if mime_type in _ZIP_MIME_TYPES or mime_type in _OFFICE_MIME_TYPES:
+            names = self.zip_entry_names(read_tail())
+            if names is None:
+                return None
+            if mime_type in _ZIP_MIME_TYPES:
+                mime_type = next(
+                    (
+                        office_mime
+                        for prefix, office_mime in _OFFICE_ZIP_PARTS.items()
+                        if any(name.startswith(prefix) for name in names)
+                    ),
+                    mime_type,
+                )
+        score = self._score_by_mime(
+            mime_type,
+            score_pdf=lambda: self._score_pdf_sample(read_pdf_sample),
+            score_office=lambda: (
+                self._score_office_names(names) if names is not None else 100
+            ),
+        )
+        if score is None:
+            return None
+        return self._prepare_response(score, mime_type)
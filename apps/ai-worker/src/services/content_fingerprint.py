@@ -0,0 +1,53 @@
+import hashlib
+import io
+from typing import BinaryIO, Optional
+
+from pydantic import BaseModel
+
+# Read files in 1 MiB chunks so hashing never loads a whole upload into memory.
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ContentFingerprint(BaseModel):
+    sha256: str
+    size: int
+    etag: Optional[str] = None
+
+
+class ContentFingerprintService:
+    def sha256_file(self, file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def from_file(
+        self, file_path: str, size: int, etag: Optional[str] = None
+    ) -> ContentFingerprint:
+        return ContentFingerprint(
+            sha256=self.sha256_file(file_path), size=size, etag=etag
+        )
+
+
+class HashingReader(io.RawIOBase):
+    """Raw stream that hashes everything read through it from `stream`."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._digest = hashlib.sha256()
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        self._digest.update(data)
+        self.bytes_read += size
+        return size
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
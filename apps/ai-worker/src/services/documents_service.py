@@ -1,7 +1,40 @@
+"""
+Serialization of parsed documents.
+
+Parsed artifacts are stored as compressed JSON Lines: a header line with the
+format name and version, then one JSON object per document. Writers and readers
+work on binary file objects and handle one document at a time, so neither side
+ever holds the whole artifact in memory. The codec (zstd or gzip) is detected
+from the magic bytes; legacy artifacts (a plain JSON array) are still read.
+"""
+
+import gzip
+import io
 import json
+import logging
+import tempfile
+from typing import BinaryIO, Iterable, Iterator, Literal, Optional
 
 from llama_index.core.schema import Document
 
+from src.core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional dependency: ai-worker[zstd]
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "omni.parsed-documents"
+ARTIFACT_VERSION = 1
+
+Codec = Literal["zstd", "gzip"]
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_EXTENSIONS = {"zstd": ".jsonl.zst", "gzip": ".jsonl.gz"}
+
 
 class DocumentsService:
     def to_json(self, documents: list[Document]) -> str:
@@ -15,3 +48,119 @@ class DocumentsService:
             Document(text=d["text"], metadata=d["metadata"])
             for d in json.loads(json_str)
         ]
+
+    def resolve_codec(self, codec: Optional[Codec] = None) -> Codec:
+        codec = codec or settings.PARSED_ARTIFACT_CODEC
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, writing gzip artifacts")
+            return "gzip"
+        return codec
+
+    def artifact_extension(self, codec: Optional[Codec] = None) -> str:
+        return _EXTENSIONS[self.resolve_codec(codec)]
+
+    def write_documents(
+        self,
+        documents: Iterable[Document],
+        fileobj: BinaryIO,
+        codec: Optional[Codec] = None,
+    ) -> int:
+        """Stream documents to fileobj as compressed JSONL, returning the count."""
+        codec = self.resolve_codec(codec)
+        if codec == "zstd":
+            compressed = zstandard.ZstdCompressor(level=3).stream_writer(
+                fileobj, closefd=False
+            )
+        else:
+            compressed = gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6)
+        count = 0
+        try:
+            header = {"format": ARTIFACT_FORMAT, "version": ARTIFACT_VERSION}
+            compressed.write(json.dumps(header).encode() + b"\n")
+            for document in documents:
+                record = {"text": document.text, "metadata": document.metadata}
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                compressed.write(line.encode("utf-8"))
+                count += 1
+        finally:
+            # Ends the compressed stream; fileobj itself stays open.
+            compressed.close()
+        return count
+
+    def read_documents(self, fileobj: BinaryIO) -> Iterator[Document]:
+        """Yield the documents of an artifact, whatever its format or codec."""
+        magic = fileobj.read(4)
+        fileobj.seek(0)
+        if magic.startswith(_GZIP_MAGIC):
+            stream = gzip.GzipFile(fileobj=fileobj, mode="rb")
+        elif magic.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd artifacts")
+            stream = zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+        else:
+            # Legacy artifact: a single JSON array.
+            yield from self.from_json(fileobj.read().decode("utf-8"))
+            return
+
+        with io.TextIOWrapper(stream, encoding="utf-8") as reader:
+            header = json.loads(reader.readline() or "{}")
+            if header.get("format") != ARTIFACT_FORMAT:
+                raise ValueError("Not a parsed documents artifact")
+            if header.get("version", 0) > ARTIFACT_VERSION:
+                raise ValueError(
+                    f"Unsupported artifact version {header.get('version')}"
+                )
+            for line in reader:
+                if line.strip():
+                    record = json.loads(line)
+                    yield Document(text=record["text"], metadata=record["metadata"])
+
+    def iter_documents(self, file_path: str) -> Iterator[Document]:
+        """Yield the documents of a parsed artifact stored at file_path."""
+        with open(file_path, "rb") as f:
+            yield from self.read_documents(f)
+
+
+class SpooledDocuments:
+    """
+    Documents held as a compressed artifact in a spooled temporary file
+    instead of a list: memory stays bounded however many documents a parser
+    emits. Iterating reads them back one at a time (not concurrently).
+    """
+
+    def __init__(
+        self,
+        documents: Iterable[Document],
+        max_size: Optional[int] = None,
+        service: Optional[DocumentsService] = None,
+    ):
+        self._service = service or DocumentsService()
+        self._file = tempfile.SpooledTemporaryFile(
+            max_size=max_size or settings.PARSED_ARTIFACT_SPOOL_BYTES
+        )
+        # Private scratch data: the fastest codec available, whatever the
+        # artifact setting says.
+        codec = "zstd" if zstandard is not None else "gzip"
+        self._count = self._service.write_documents(documents, self._file, codec)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Document]:
+        self._file.seek(0)
+        yield from self._service.read_documents(self._file)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "SpooledDocuments":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def close_documents(documents: Iterable[Document]) -> None:
+    """Release the temporary file behind spooled parse results, if any."""
+    if isinstance(documents, SpooledDocuments):
+        documents.close()
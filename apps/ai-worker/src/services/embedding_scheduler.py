@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from llama_index.core.base.embeddings.base import Embedding
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[List[str]], List[Embedding]]
+
+# HTTP statuses that mean "slow down" rather than "this request is invalid".
+_THROTTLE_STATUSES = {408, 429, 502, 503, 504}
+_THROTTLE_MARKERS = ("429", "resource_exhausted", "rate limit", "quota", "timeout")
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text; cheap and provider agnostic.
+    return len(text) // 4 + 1
+
+
+def is_throttle_error(error: BaseException) -> bool:
+    if isinstance(error, TimeoutError):
+        return True
+    for status in (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),
+        getattr(getattr(error, "response", None), "status_code", None),
+    ):
+        if isinstance(status, int) and status in _THROTTLE_STATUSES:
+            return True
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in _THROTTLE_MARKERS)
+
+
+class EmbeddingScheduler:
+    """
+    Concurrent, token-budgeted embedding batches with adaptive limits.
+
+    Texts are cut into batches by estimated token count (capped at
+    max_batch_items per request) and up to `concurrency` batches are kept in
+    flight. On 429/timeouts the token budget and concurrency are halved and the
+    failed batch is split and retried after a back-off; after a run of healthy
+    responses both grow again (AIMD). Achieved tokens/sec is tracked per
+    provider and reported through stats().
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        token_budget: int,
+        max_batch_items: int,
+        max_concurrency: int,
+        min_token_budget: int = 512,
+        grow_after: int = 5,
+        max_retries: int = 6,
+        base_backoff: float = 1.0,
+    ):
+        self.provider = provider
+        self._max_token_budget = token_budget
+        self._min_token_budget = min(min_token_budget, token_budget)
+        self._max_batch_items = max_batch_items
+        self._max_concurrency = max_concurrency
+        self._grow_after = grow_after
+        self._max_retries = max_retries
+        self._base_backoff = base_backoff
+
+        self.token_budget = token_budget
+        self.concurrency = max_concurrency
+        self._healthy_streak = 0
+        self._tokens = 0
+        self._seconds = 0.0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "provider": self.provider,
+            "tokens": self._tokens,
+            "seconds": round(self._seconds, 3),
+            "tokens_per_sec": (
+                round(self._tokens / self._seconds, 1) if self._seconds else 0.0
+            ),
+            "token_budget": self.token_budget,
+            "concurrency": self.concurrency,
+        }
+
+    def _next_batch(self, texts: List[str], start: int) -> List[int]:
+        batch: List[int] = []
+        tokens = 0
+        for index in range(start, len(texts)):
+            cost = estimate_tokens(texts[index])
+            if batch and (
+                tokens + cost > self.token_budget or len(batch) >= self._max_batch_items
+            ):
+                break
+            batch.append(index)
+            tokens += cost
+        return batch
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._healthy_streak += 1
+            if self._healthy_streak >= self._grow_after:
+                self._healthy_streak = 0
+                self.concurrency = min(self._max_concurrency, self.concurrency + 1)
+                self.token_budget = min(
+                    self._max_token_budget, int(self.token_budget * 1.25)
+                )
+
+    def _on_throttle(self) -> None:
+        with self._lock:
+            self._healthy_streak = 0
+            self.concurrency = max(1, self.concurrency // 2)
+            self.token_budget = max(self._min_token_budget, self.token_budget // 2)
+        logger.warning(
+            "%s embeddings throttled, backing off: concurrency=%s token_budget=%s",
+            self.provider,
+            self.concurrency,
+            self.token_budget,
+        )
+
+    def embed(self, embed_batch: EmbedBatchFn, texts: List[str]) -> List[Embedding]:
+        results: List[Optional[Embedding]] = [None] * len(texts)
+        # (indices, attempt) of batches waiting to be retried
+        retries: Deque[Tuple[List[int], int]] = deque()
+        in_flight: Dict[Future, Tuple[List[int], int]] = {}
+        cursor = 0
+        not_before = 0.0
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as pool:
+            while cursor < len(texts) or retries or in_flight:
+                cooling_down = time.monotonic() < not_before
+                while (
+                    not cooling_down
+                    and len(in_flight) < self.concurrency
+                    and (retries or cursor < len(texts))
+                ):
+                    if retries:
+                        indices, attempt = retries.popleft()
+                    else:
+                        indices, attempt = self._next_batch(texts, cursor), 0
+                        cursor += len(indices)
+                    future = pool.submit(embed_batch, [texts[i] for i in indices])
+                    in_flight[future] = (indices, attempt)
+
+                if not in_flight:
+                    time.sleep(max(0.0, not_before - time.monotonic()))
+                    continue
+
+                done, _ = wait(
+                    in_flight,
+                    timeout=max(0.0, not_before - time.monotonic()) or None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    indices, attempt = in_flight.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        for index, vector in zip(indices, future.result(), strict=True):
+                            results[index] = vector
+                        self._on_success()
+                        continue
+                    if not is_throttle_error(error) or attempt >= self._max_retries:
+                        raise error
+                    self._on_throttle()
+                    not_before = time.monotonic() + self._base_backoff * 2**attempt
+                    half = max(1, len(indices) // 2)
+                    for part in (indices[:half], indices[half:]):
+                        if part:
+                            retries.append((part, attempt + 1))
+
+        elapsed = time.monotonic() - started
+        tokens = sum(estimate_tokens(text) for text in texts)
+        with self._lock:
+            self._tokens += tokens
+            self._seconds += elapsed
+        logger.info(
+            "Embedded %s texts (~%s tokens) via %s in %.2fs: %s",
+            len(texts),
+            tokens,
+            self.provider,
+            elapsed,
+            self.stats(),
+        )
+        return results
+
+
+_schedulers: Dict[str, EmbeddingScheduler] = {}
+
+
+def get_embedding_scheduler(provider: str) -> EmbeddingScheduler:
+    """Process-wide scheduler per provider, so adaptive limits and throughput
+    stats carry over from one task to the next."""
+    if provider not in _schedulers:
+        _schedulers[provider] = EmbeddingScheduler(
+            provider=provider,
+            token_budget=settings.EMBEDDING_TOKEN_BUDGET,
+            max_batch_items=settings.EMBEDDING_MAX_BATCH_ITEMS,
+            max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        )
+    return _schedulers[provider]
@@ -1,20 +1,79 @@
+import asyncio
+import hashlib
+import io
+import json
 import logging
 import os
-from typing import List
-
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import billiard
+import httpx
 import nest_asyncio
 import pandas as pd
 import pymupdf4llm
+from llama_index.core.async_utils import asyncio_run
 from llama_index.core.schema import Document
 from llama_parse import LlamaParse
+from llama_parse.base import JOB_RESULT_URL, JOB_STATUS_ROUTE
 
 from src.core.config import settings
-from src.services.complexity_analyzer import DocumentComplexityAnalyzer
+from src.core.s3_client import S3Client
+from src.services.cloud_parse_jobs import CloudParseJobFailed
+from src.services.complexity_analyzer import (
+    DocumentComplexityAnalyzer,
+    PdfAnalysis,
+    open_pdf,
+)
+from src.services.content_fingerprint import ContentFingerprintService
+from src.services.documents_service import SpooledDocuments
+from src.services.layout_parser import LayoutParser, in_layout_band
+from src.services.office_extractor import (
+    DOCX_MIME_TYPE,
+    PPTX_MIME_TYPE,
+    OfficeExtractor,
+)
+from src.services.parquet_sidecar import ParquetSidecars, parquet_available
+from src.services.parse_cache import ParseCache
+from src.services.pdf_partitioner import PdfPartitioner
+from src.services.tabular_reader import TableChunk, TabularReader
 
 logger = logging.getLogger(__name__)
 
 nest_asyncio.apply()
 
+T = TypeVar("T")
+
+
+def _pdf_pages_to_markdown(job: Tuple[str, List[int]]) -> str:
+    """Process pool worker: markdown of the given pages of a PDF."""
+    file_path, pages = job
+    return pymupdf4llm.to_markdown(file_path, pages=pages)
+
+
+def _shard_workers() -> int:
+    """
+    Processes for a sharded PDF conversion. Every parse_local worker process
+    may convert a PDF at the same time, so by default they split the CPUs
+    between them instead of each starting one process per CPU; at least two,
+    so large PDFs are still sharded when the lane has one process per CPU.
+    """
+    if settings.PDF_SHARD_WORKERS:
+        return settings.PDF_SHARD_WORKERS
+    cpus = os.cpu_count() or 1
+    return max(2, cpus // (settings.CELERY_PARSE_LOCAL_CONCURRENCY or cpus))
+
 
 class FileParsingService:
     """
@@ -23,18 +82,23 @@ class FileParsingService:
     Routing Logic:
     1. Complex Layouts (PDF, DOCX, PPTX, Images) -> LlamaParse (Cloud API).
        Ensures tables and visual structures are preserved in Markdown.
+       Complex PDFs are split by page: only scanned/complex pages go to the
+       cloud, text pages are converted locally (mixed mode).
+       Moderately complex PDF/DOCX/PPTX (tables, no scans) -> Docling (Local).
     2. Structured Data (Excel, CSV) -> Pandas (Local).
-       Fast, zero-cost, perfect data fidelity.
-    3. Plain Text (MD, TXT, JSON) -> Local I/O.
+       Fast, zero-cost, perfect data fidelity. Read in row chunks, one
+       Document (with the header) per chunk.
+    3. Simple Office Files (DOCX, PPTX) -> Native XML / python-pptx (Local).
+    4. Plain Text (MD, TXT, JSON) -> Local I/O.
+
+    Results are cached per (content hash, route, parser config) in ParseCache,
+    so task retries do not parse the same file twice.
     """
 
-    def __init__(self):
-        self._llama_parser = LlamaParse(
-            result_type="markdown",
-            api_key=settings.LLAMA_CLOUD_KEY.get_secret_value(),
-            verbose=True,
-            language="en",
-            parsing_instruction="""
+    _CLOUD_PARSER_OPTIONS = {
+        "result_type": "markdown",
+        "language": "en",
+        "parsing_instruction": """
             You are converting a document to Markdown for a RAG system.
             1. Preserve ALL text, including headers, footers, and legal disclaimers.
             2. Convert all tables into Markdown tables. Do not summarize them.
@@ -42,8 +106,73 @@ class FileParsingService:
             3. For PowerPoint/Images, describe diagrams and charts in detail.
             4. Output strictly Markdown.
             """,
-        )
+    }
+
+    # Route -> handler method name, resolved at call time.
+    _ROUTE_HANDLERS = {
+        "cloud": "_parse_cloud",
+        "csv": "_parse_csv_local",
+        "docx": "_parse_docx_local",
+        "excel": "_parse_excel_local",
+        "layout": "_parse_layout",
+        "pdf": "_read_pdf_local",
+        "pdf_mixed": "_parse_pdf_mixed",
+        "pptx": "_parse_pptx_local",
+        "text": "read_text_file",
+    }
+    # Handlers that take the PdfAnalysis shared with the complexity analysis.
+    _PDF_ROUTES = {"pdf", "pdf_mixed"}
+    # Tabular results can be as large as the input and re-reading the source
+    # is as cheap as the cache, so they are not cached.
+    _UNCACHED_ROUTES = {"csv", "excel"}
+
+    def __init__(self):
+        # Configuration only (base URL, API key); requests go through
+        # _cloud_parser, see _run_cloud.
+        self._llama_parser = self._cloud_parser()
         self._file_analyzer = DocumentComplexityAnalyzer()
+        self._layout_parser = LayoutParser()
+        self._office_extractor = OfficeExtractor()
+        self._tabular_reader = TabularReader()
+        self._s3_client: Optional[S3Client] = None
+        self._fingerprint_service = ContentFingerprintService()
+        self._parse_cache = ParseCache() if settings.PARSE_CACHE_ENABLED else None
+        # Parser configuration is part of the cache key: changing the cloud
+        # options or bumping PARSER_VERSION invalidates cached results.
+        self._parser_config = hashlib.sha256(
+            json.dumps(
+                {"version": settings.PARSER_VERSION, **self._CLOUD_PARSER_OPTIONS},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
+    @property
+    def s3_client(self) -> S3Client:
+        if self._s3_client is None:
+            self._s3_client = S3Client()
+        return self._s3_client
+
+    def _cloud_parser(self, client: Optional[httpx.AsyncClient] = None) -> LlamaParse:
+        return LlamaParse(
+            api_key=settings.LLAMA_CLOUD_KEY.get_secret_value(),
+            verbose=True,
+            custom_client=client,
+            **self._CLOUD_PARSER_OPTIONS,
+        )
+
+    def _run_cloud(self, call: Callable[[LlamaParse], Awaitable[T]]) -> T:
+        """
+        Runs call with a LlamaParse whose HTTP client lives only as long as the
+        call's event loop. LlamaParse caches its httpx client, which is bound
+        to the loop that first used it; the service is shared by worker
+        threads, each running its own loops, so no client is reused.
+        """
+
+        async def run() -> T:
+            async with httpx.AsyncClient() as client:
+                return await call(self._cloud_parser(client))
+
+        return asyncio_run(run())
 
     def _parse_cloud(self, file_path: str) -> List[Document]:
         """
@@ -52,12 +181,118 @@ class FileParsingService:
         """
         logger.info("LlamaParse: uploading %s to cloud", os.path.basename(file_path))
 
-        docs = self._llama_parser.load_data(file_path)
+        docs = self._run_cloud(lambda parser: parser.aload_data(file_path))
+
+        return self._tag_cloud_documents(docs, os.path.basename(file_path))
 
+    def parse_cloud_stream(self, stream: BinaryIO, file_name: str) -> List[Document]:
+        """
+        Uploads a readable stream to LlamaCloud, e.g. an S3 object body, so
+        cloud-bound files never need a local copy.
+        """
+        logger.info("LlamaParse: streaming %s to cloud", file_name)
+
+        docs = self._run_cloud(
+            lambda parser: parser.aload_data(
+                stream, extra_info={"file_name": file_name}
+            )
+        )
+
+        return self._tag_cloud_documents(docs, file_name)
+
+    def parse_cloud_batch(
+        self, files: List[Tuple[BinaryIO, str]], num_workers: Optional[int] = None
+    ) -> List[List[Document]]:
+        """
+        Parses many small (stream, file name) pairs in one event loop, sharing
+        the LlamaCloud connection pool, with at most num_workers jobs at a time.
+        Returns the documents of each file in order; failed files get [].
+        """
+        logger.info("LlamaParse: parsing a batch of %s files", len(files))
+
+        async def parse_one(
+            parser: LlamaParse,
+            semaphore: asyncio.Semaphore,
+            stream: BinaryIO,
+            file_name: str,
+        ) -> List[Document]:
+            async with semaphore:
+                try:
+                    docs = await parser.aload_data(
+                        stream, extra_info={"file_name": file_name}
+                    )
+                except Exception as e:
+                    logger.warning("LlamaParse failed for %s: %s", file_name, e)
+                    return []
+            return self._tag_cloud_documents(docs, file_name)
+
+        async def parse_all(parser: LlamaParse) -> List[List[Document]]:
+            semaphore = asyncio.Semaphore(
+                num_workers or settings.CLOUD_BATCH_NUM_WORKERS
+            )
+            return await asyncio.gather(
+                *(parse_one(parser, semaphore, stream, name) for stream, name in files)
+            )
+
+        return self._run_cloud(parse_all)
+
+    def submit_cloud_job(self, file_input: Union[str, BinaryIO], file_name: str) -> str:
+        """
+        Starts a LlamaCloud parse job for a path or stream without waiting for
+        it, returning the job id; collect the result with fetch_cloud_job.
+        """
+        logger.info("LlamaParse: submitting %s to cloud", file_name)
+
+        return self._run_cloud(
+            lambda parser: parser._create_job(
+                file_input, extra_info={"file_name": file_name}
+            )
+        )
+
+    def cloud_client(self) -> httpx.AsyncClient:
+        """Async client for the LlamaCloud parsing API (one per event loop)."""
+        return httpx.AsyncClient(
+            base_url=self._llama_parser.base_url,
+            headers={"Authorization": f"Bearer {self._llama_parser.api_key}"},
+            timeout=60,
+        )
+
+    async def fetch_cloud_job(
+        self, client: httpx.AsyncClient, job_id: str, file_name: str
+    ) -> Optional[List[Document]]:
+        """
+        Documents of a finished cloud job, or None while it is still running.
+        Raises CloudParseJobFailed when the job ended without a result.
+        """
+        response = await client.get(JOB_STATUS_ROUTE.format(job_id=job_id))
+        response.raise_for_status()
+        status = response.json()["status"]
+        if status == "PENDING":
+            return None
+        if status == "PARTIAL_SUCCESS":
+            # Some pages failed; keep the ones that did parse.
+            logger.warning(
+                "Cloud parse job %s for %s partially succeeded", job_id, file_name
+            )
+        elif status != "SUCCESS":
+            raise CloudParseJobFailed(f"job {job_id} ended with status {status}")
+
+        result_type = self._CLOUD_PARSER_OPTIONS["result_type"]
+        response = await client.get(
+            JOB_RESULT_URL.format(job_id=job_id, result_type=result_type)
+        )
+        response.raise_for_status()
+        docs = [Document(text=response.json()[result_type])]
+
+        return self._tag_cloud_documents(docs, file_name)
+
+    def _tag_cloud_documents(
+        self, docs: List[Document], file_name: str
+    ) -> List[Document]:
         for doc in docs:
             doc.metadata.update(
                 {
-                    "file_name": os.path.basename(file_path),
+                    "file_name": file_name,
                     "parsing_method": "llama_parse_cloud",
                     "file_type": "complex_doc",
                 }
@@ -65,22 +300,100 @@ class FileParsingService:
 
         return docs
 
-    def _parse_excel_local(self, file_path: str) -> List[Document]:
+    def _parse_excel_local(self, file_path: str) -> SpooledDocuments:
         """
         Uses Pandas to convert Excel sheets to Markdown tables locally.
         """
-        xls = pd.read_excel(file_path)
-        docs = []
+        return self._tabular_documents(
+            file_path, self._tabular_reader.iter_excel(file_path)
+        )
 
-        for sheet in xls.sheet_names:
-            df = pd.read_excel(xls, sheet)
-            docs.append(self._df_to_doc(df, file_path, sheet))
+    def _tabular_documents(
+        self, file_path: str, chunks: Iterable[TableChunk]
+    ) -> SpooledDocuments:
+        sidecars = None
+        if settings.TABULAR_PARQUET_ENABLED and parquet_available():
+            sidecars = ParquetSidecars(
+                file_path, self._fingerprint_service.sha256_file(file_path)
+            )
 
-        return docs
+        def documents() -> Iterable[Document]:
+            for sheet, first_row, df in chunks:
+                doc = self._df_to_doc(df, file_path, sheet, first_row)
+                if sidecars is not None:
+                    sidecars.write(sheet, df)
+                    if sheet not in sidecars.failed:
+                        doc.metadata["parquet_s3_key"] = sidecars.s3_key(sheet)
+                yield doc
+
+        # Spooled to disk chunk by chunk: large exports never sit in memory.
+        if sidecars is None:
+            return SpooledDocuments(documents())
+        try:
+            spooled = SpooledDocuments(documents())
+            try:
+                uploaded = set(sidecars.upload(self.s3_client).values())
+            except BaseException:
+                spooled.close()
+                raise
+        finally:
+            sidecars.close()
+        if not sidecars.failed:
+            return spooled
+        # A sidecar dropped mid-table: unlink it from its earlier chunks.
+        with spooled as with_stale_keys:
+            return SpooledDocuments(
+                self._unlink_sidecar(doc, uploaded) for doc in with_stale_keys
+            )
+
+    @staticmethod
+    def _unlink_sidecar(doc: Document, uploaded: set) -> Document:
+        if doc.metadata.get("parquet_s3_key") not in uploaded:
+            doc.metadata.pop("parquet_s3_key", None)
+        return doc
+
+    def _pdf_to_markdown(
+        self, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> str:
+        """
+        Converts a PDF with pymupdf4llm. Large PDFs are split into page chunks
+        converted by a process pool and joined back in page order. billiard
+        (Celery's multiprocessing fork) also works inside prefork children,
+        which the stdlib refuses to let start processes.
+        """
+        with open_pdf(file_path, pdf) as pdf:
+            page_count = pdf.doc.page_count
+            workers = _shard_workers()
+            if page_count < settings.PDF_SHARD_MIN_PAGES or workers < 2:
+                return pymupdf4llm.to_markdown(pdf.doc)
+
+        size = settings.PDF_SHARD_PAGES
+        chunks = [
+            list(range(start, min(start + size, page_count)))
+            for start in range(0, page_count, size)
+        ]
+        workers = min(workers, len(chunks))
+        logger.info(
+            "Converting %s pages in %s chunks on %s processes",
+            page_count,
+            len(chunks),
+            workers,
+        )
+        try:
+            with billiard.Pool(processes=workers) as pool:
+                parts = pool.map(
+                    _pdf_pages_to_markdown, [(file_path, chunk) for chunk in chunks]
+                )
+        except Exception as e:
+            logger.warning("Sharded PDF conversion failed, converting whole: %s", e)
+            return pymupdf4llm.to_markdown(file_path)
+        return "".join(parts)
 
-    def _read_pdf_local(self, file_path: str) -> List[Document]:
+    def _read_pdf_local(
+        self, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> List[Document]:
         try:
-            md_content = pymupdf4llm.to_markdown(file_path)
+            md_content = self._pdf_to_markdown(file_path, pdf)
             return [
                 Document(
                     text=md_content,
@@ -96,13 +409,100 @@ class FileParsingService:
             logger.exception("Local PDF read failed: %s", e)
             raise
 
-    def _parse_csv_local(self, file_path: str) -> List[Document]:
+    def _parse_pdf_mixed(
+        self, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> List[Document]:
         """
-        Uses Pandas to convert CSV to Markdown tables locally.
+        Sends only the complex page ranges of a PDF to LlamaCloud and converts
+        the other pages locally (concurrently), merging both in page order.
         """
-        df = pd.read_csv(file_path)
+        with open_pdf(file_path, pdf) as pdf:
+            return self._parse_pdf_pages(file_path, pdf)
+
+    @staticmethod
+    def _mostly_complex(flags: List[bool]) -> bool:
+        """Whether a mixed-mode PDF goes to the cloud as a whole."""
+        return bool(flags) and (
+            sum(flags) / len(flags) > settings.PDF_MIXED_MAX_CLOUD_FRACTION
+        )
+
+    def _parse_pdf_pages(self, file_path: str, pdf: PdfAnalysis) -> List[Document]:
+        # Pages scored by the complexity analysis are not scored again.
+        flags = self._file_analyzer.classify_pdf_pages(file_path, pdf)
+        cloud_pages = sum(flags)
+        if not cloud_pages:
+            return self._read_pdf_local(file_path, pdf)
+        if self._mostly_complex(flags):
+            return self._parse_cloud(file_path)
+
+        file_name = os.path.basename(file_path)
+        segments = self._file_analyzer.page_segments(flags)
+        cloud_segments = [(first, last) for first, last, cloud in segments if cloud]
+        logger.info(
+            "Mixed PDF %s: %s of %s pages go to the cloud",
+            file_name,
+            cloud_pages,
+            len(flags),
+        )
+
+        doc = pdf.doc
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            cloud_future = pool.submit(
+                self.parse_cloud_batch,
+                [
+                    (
+                        io.BytesIO(PdfPartitioner.extract_pages(doc, first, last)),
+                        f"{file_name}.p{first + 1}-{last + 1}.pdf",
+                    )
+                    for first, last in cloud_segments
+                ],
+            )
+            local_parts = {
+                first: pymupdf4llm.to_markdown(doc, pages=list(range(first, last + 1)))
+                for first, last, cloud in segments
+                if not cloud
+            }
+            cloud_parts = {}
+            for (first, last), docs in zip(
+                cloud_segments, cloud_future.result(), strict=True
+            ):
+                if not docs:
+                    # Degrade to local text rather than dropping the pages.
+                    logger.warning(
+                        "Cloud parse of %s pages %s-%s failed, converting locally",
+                        file_name,
+                        first + 1,
+                        last + 1,
+                    )
+                    cloud_parts[first] = pymupdf4llm.to_markdown(
+                        doc, pages=list(range(first, last + 1))
+                    )
+                else:
+                    cloud_parts[first] = "\n\n".join(d.text for d in docs)
+
+        parts = {**local_parts, **cloud_parts}
+        return [
+            Document(
+                text="\n\n".join(parts[first] for first, _, _ in segments),
+                metadata={
+                    "file_name": file_name,
+                    "parsing_method": "hybrid_pdf",
+                    "file_type": "pdf",
+                    "cloud_pages": ",".join(
+                        f"{first + 1}-{last + 1}" if last > first else str(first + 1)
+                        for first, last in cloud_segments
+                    ),
+                },
+            )
+        ]
 
-        return [self._df_to_doc(df, file_path)]
+    def _parse_csv_local(self, file_path: str) -> SpooledDocuments:
+        """
+        Uses Pandas to convert CSV to Markdown tables locally.
+        """
+        return self._tabular_documents(
+            file_path, self._tabular_reader.iter_csv(file_path)
+        )
 
     def read_text_file(self, file_path: str) -> List[Document]:
         with open(file_path) as f:
@@ -119,11 +519,20 @@ class FileParsingService:
             ]
 
     def _df_to_doc(
-        self, df: pd.DataFrame, file_path: str, sheet: str = None
+        self,
+        df: pd.DataFrame,
+        file_path: str,
+        sheet: str = None,
+        first_row: Optional[int] = None,
     ) -> Document:
         """
-        Helper: DataFrame -> Markdown Document
+        Helper: DataFrame -> Markdown Document. first_row (0-based) marks a
+        chunk of a larger table.
         """
+        rows = None
+        if first_row is not None:
+            rows = (first_row + 1, first_row + len(df))
+
         # Cleanup: Remove completely empty rows/cols
         df = df.dropna(how="all").dropna(axis=1, how="all")
 
@@ -135,6 +544,9 @@ class FileParsingService:
         if sheet:
             header += f" | Sheet: {sheet}"
 
+        if rows:
+            header += f" | Rows: {rows[0]}-{rows[1]}"
+
         full_text = f"{header}\n\n{md_table}"
 
         meta = {
@@ -144,31 +556,173 @@ class FileParsingService:
         }
         if sheet:
             meta["sheet_name"] = sheet
+        if rows:
+            meta["row_start"], meta["row_end"] = rows
 
         return Document(text=full_text, metadata=meta)
 
-    def parse_file(self, file_path: str, force_ocr: bool = False) -> List[Document]:
-        score, mime, is_complex = self._file_analyzer.get_file_info(file_path)
+    def _parse_layout(self, file_path: str) -> List[Document]:
+        """
+        Moderately complex PDFs and Office files: local layout-aware parsing,
+        falling back to LlamaCloud if it fails.
+        """
+        try:
+            docs = self._layout_parser.parse(file_path)
+        except Exception as e:
+            logger.warning("Layout parse failed, using LlamaCloud: %s", e)
+            return self._parse_cloud(file_path)
+        return docs or self._parse_cloud(file_path)
+
+    def _read_office_local(
+        self, file_path: str, file_type: str, to_markdown: Callable[[str], str]
+    ) -> List[Document]:
+        try:
+            md_content = to_markdown(file_path)
+        except Exception as e:
+            logger.warning("Local %s read failed, using LlamaCloud: %s", file_type, e)
+            return self._parse_cloud(file_path)
+        if not md_content.strip():
+            # Nothing but images: needs OCR.
+            return self._parse_cloud(file_path)
+        return [
+            Document(
+                text=md_content,
+                metadata={
+                    "file_name": os.path.basename(file_path),
+                    "parsing_method": f"{file_type}_local",
+                    "file_type": file_type,
+                    "is_premium": False,
+                },
+            )
+        ]
+
+    def _parse_docx_local(self, file_path: str) -> List[Document]:
+        return self._read_office_local(
+            file_path, "docx", self._office_extractor.docx_to_markdown
+        )
 
-        logger.info("Router: mime=%s score=%s/100", mime, score)
+    def _parse_pptx_local(self, file_path: str) -> List[Document]:
+        return self._read_office_local(
+            file_path, "pptx", self._office_extractor.pptx_to_markdown
+        )
+
+    def _route(
+        self,
+        mime: str,
+        is_complex: bool,
+        force_ocr: bool,
+        score: Optional[int] = None,
+    ) -> str:
+        if score is not None and not force_ocr and in_layout_band(mime, score):
+            return "layout"
+
+        if (
+            mime == "application/pdf"
+            and is_complex
+            and not force_ocr
+            and settings.PDF_MIXED_MODE
+        ):
+            return "pdf_mixed"
 
         if is_complex or force_ocr:
-            logger.info("Routing to LlamaParse (cloud)")
-            return self._parse_cloud(file_path)
+            return "cloud"
 
-        elif "spreadsheet" in mime or "csv" in mime or "excel" in mime:
-            logger.info("Routing to Pandas (local)")
+        if "spreadsheet" in mime or "csv" in mime or "excel" in mime:
             # Determine if CSV or Excel based on MIME, not extension!
-            if "csv" in mime:
-                return self._parse_csv_local(file_path)
-            else:
-                return self._parse_excel_local(file_path)
+            return "csv" if "csv" in mime else "excel"
 
-        elif mime == "application/pdf":
-            return self._read_pdf_local(file_path)
+        if mime == "application/pdf":
+            return "pdf"
 
-        elif mime.startswith("text/"):
-            return self.read_text_file(file_path)
+        if mime == DOCX_MIME_TYPE:
+            return "docx"
 
-        else:
-            return self.read_text_file(file_path)
+        if mime == PPTX_MIME_TYPE:
+            return "pptx"
+
+        return "text"
+
+    def _run_route(
+        self, route: str, file_path: str, pdf: Optional[PdfAnalysis] = None
+    ) -> List[Document]:
+        handler = getattr(self, self._ROUTE_HANDLERS[route])
+        if pdf is not None and route in self._PDF_ROUTES:
+            return handler(file_path, pdf)
+        return handler(file_path)
+
+    def classify(
+        self,
+        file_path: str,
+        force_ocr: bool = False,
+        pdf: Optional[PdfAnalysis] = None,
+    ) -> Tuple[Tuple[int, str, bool], bool]:
+        """
+        Classify a local file: its (score, mime, is_complex) and whether the
+        whole file goes to the cloud parser, including mixed-mode PDFs with too
+        many complex pages. Pass the PdfAnalysis given to parse_file to reuse
+        the open document and page scores.
+        """
+        with open_pdf(file_path, pdf) as pdf:
+            file_info = self._file_analyzer.get_file_info(file_path, pdf)
+            score, mime, is_complex = file_info
+            route = self._route(mime, is_complex, force_ocr, score)
+            if route == "pdf_mixed":
+                flags = self._file_analyzer.classify_pdf_pages(file_path, pdf)
+                return file_info, self._mostly_complex(flags)
+        return file_info, route == "cloud"
+
+    def parse_cache_stats(self) -> Dict[str, int]:
+        return self._parse_cache.stats() if self._parse_cache else {}
+
+    def parse_file(
+        self,
+        file_path: str,
+        force_ocr: bool = False,
+        file_info: Optional[Tuple[int, str, bool]] = None,
+        pdf: Optional[PdfAnalysis] = None,
+    ) -> List[Document]:
+        """
+        Parse a local file. file_info, when the caller already classified the
+        file (e.g. by pre-routing or classify), skips the complexity analysis.
+        PDFs are opened once for both the analysis and the parser, or not at
+        all when the caller passes its own PdfAnalysis.
+        """
+        with open_pdf(file_path, pdf) as pdf:
+            return self._parse_file(file_path, force_ocr, file_info, pdf)
+
+    def _parse_file(
+        self,
+        file_path: str,
+        force_ocr: bool,
+        file_info: Optional[Tuple[int, str, bool]],
+        pdf: PdfAnalysis,
+    ) -> List[Document]:
+        score, mime, is_complex = file_info or self._file_analyzer.get_file_info(
+            file_path, pdf
+        )
+
+        logger.info("Router: mime=%s score=%s/100", mime, score)
+
+        route = self._route(mime, is_complex, force_ocr, score)
+        logger.info("Routing to %s parser", route)
+
+        if self._parse_cache is None or route in self._UNCACHED_ROUTES:
+            return self._run_route(route, file_path, pdf)
+
+        cache_key = ParseCache.make_key(
+            self._fingerprint_service.sha256_file(file_path),
+            route,
+            self._parser_config,
+        )
+        documents = self._parse_cache.get(cache_key)
+        if documents is not None:
+            logger.info("Parse cache hit: %s", self._parse_cache.stats())
+            for doc in documents:
+                doc.metadata["file_name"] = os.path.basename(file_path)
+            return documents
+
+        documents = self._run_route(route, file_path, pdf)
+        if documents:
+            self._parse_cache.put(cache_key, documents)
+        logger.debug("Parse cache stats: %s", self._parse_cache.stats())
+        return documents
@@ -1,25 +1,82 @@
-from typing import List, Sequence
+import logging
+import re
+from typing import Dict, List, Sequence, Tuple
 
-from llama_index.core.node_parser import (
-    MarkdownElementNodeParser,
-    SentenceWindowNodeParser,
-)
+from llama_index.core.node_parser import SentenceWindowNodeParser
+from llama_index.core.node_parser.node_utils import build_nodes_from_splits
 from llama_index.core.schema import BaseNode, TransformComponent
 
+from src.core.cache_backend import get_cache_backend
+from src.core.config import settings
 from src.model.factory import LLMFactory
+from src.services.table_summaries import CachedMarkdownElementNodeParser
+
+logger = logging.getLogger(__name__)
+
+_TABLE_SEPARATOR = re.compile(r"^\|[\s:|-]+\|$")
+_ROWS_SUFFIX = re.compile(r" \| Rows: \d+-\d+$")
+
+
+def split_table_rows(
+    text: str, window_rows: int, row_start: int = 1
+) -> List[Tuple[str, int, int]]:
+    """
+    Split a document holding one markdown table into windows of window_rows
+    rows. Each window repeats the table header and the text before the table,
+    whose first line gets the window's "| Rows: a-b" (row numbers counted
+    from row_start). Returns (text, first row, last row); text without table
+    rows comes back whole as (text, 0, -1).
+    """
+    lines = text.splitlines()
+    for index in range(1, len(lines)):
+        if lines[index - 1].startswith("|") and _TABLE_SEPARATOR.match(lines[index]):
+            break
+    else:
+        return [(text, 0, -1)]
+    preamble = [line for line in lines[: index - 1] if line.strip()]
+    header = lines[index - 1 : index + 1]
+    rows = [line for line in lines[index + 1 :] if line.startswith("|")]
+    if not rows:
+        return [(text, 0, -1)]
+    windows = []
+    for offset in range(0, len(rows), window_rows):
+        window = rows[offset : offset + window_rows]
+        first, last = row_start + offset, row_start + offset + len(window) - 1
+        table = "\n".join(header + window)
+        if preamble:
+            title = f"{_ROWS_SUFFIX.sub('', preamble[0])} | Rows: {first}-{last}"
+            table = "\n".join([title, *preamble[1:]]) + "\n\n" + table
+        windows.append((table, first, last))
+    return windows
 
 
 class HybridContentSplitter(TransformComponent):
-    _md_parser: MarkdownElementNodeParser
+    """
+    Markdown documents: elements are parsed with MarkdownElementNodeParser
+    (table summaries come from the shared cache, a heuristic for small tables,
+    or the LLM) and text is split into sentence windows.
+    Tabular documents (CSV/Excel, file_type "tabular") skip the LLM: their
+    table is cut into row windows repeating the header. stats() reports the
+    table summaries avoided that way.
+    """
+
+    _md_parser: CachedMarkdownElementNodeParser
     _window_parser: SentenceWindowNodeParser
+    _counters: Dict[str, int]
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
         llm = LLMFactory.create_llm("gemini")
 
-        self._md_parser = MarkdownElementNodeParser(
-            llm=llm, num_workers=4, include_metadata=True
+        self._md_parser = CachedMarkdownElementNodeParser(
+            backend=(
+                get_cache_backend() if settings.TABLE_SUMMARY_CACHE_ENABLED else None
+            ),
+            min_cells=settings.TABLE_SUMMARY_MIN_CELLS,
+            llm=llm,
+            num_workers=4,
+            include_metadata=True,
         )
 
         self._window_parser = SentenceWindowNodeParser.from_defaults(
@@ -29,20 +86,52 @@ class HybridContentSplitter(TransformComponent):
             include_metadata=True,
             include_prev_next_rel=True,
         )
+        self._counters = {"tabular_documents": 0, "llm_calls_avoided": 0}
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    def _split_tabular(self, node: BaseNode) -> List[BaseNode]:
+        windows = split_table_rows(
+            node.get_content(),
+            settings.TABULAR_WINDOW_ROWS,
+            node.metadata.get("row_start", 1),
+        )
+        chunks = build_nodes_from_splits([text for text, _, _ in windows], node)
+        for chunk, (_, first, last) in zip(chunks, windows, strict=True):
+            if last >= first:
+                chunk.metadata["row_start"], chunk.metadata["row_end"] = first, last
+        self._counters["tabular_documents"] += 1
+        # MarkdownElementNodeParser summarizes each table with one LLM call.
+        if windows[0][2] >= windows[0][1]:
+            self._counters["llm_calls_avoided"] += 1
+        return chunks
 
     def __call__(self, nodes: Sequence[BaseNode], **kwargs) -> List[BaseNode]:
+        tabular_nodes = [
+            node for node in nodes if node.metadata.get("file_type") == "tabular"
+        ]
+        nodes = [node for node in nodes if node.metadata.get("file_type") != "tabular"]
 
-        parsed_nodes = self._md_parser.get_nodes_from_documents(nodes)
+        all_nodes = []
+        if nodes:
+            parsed_nodes = self._md_parser.get_nodes_from_documents(nodes)
+            logger.debug("Table summaries: %s", self._md_parser.stats())
 
-        base_text_nodes, table_nodes = self._md_parser.get_nodes_and_objects(
-            parsed_nodes
-        )
+            base_text_nodes, table_nodes = self._md_parser.get_nodes_and_objects(
+                parsed_nodes
+            )
+
+            final_text_nodes = []
 
-        final_text_nodes = []
+            if base_text_nodes:
+                final_text_nodes = self._window_parser(base_text_nodes)
 
-        if base_text_nodes:
-            final_text_nodes = self._window_parser(base_text_nodes)
+            all_nodes = final_text_nodes + table_nodes
 
-        all_nodes = final_text_nodes + table_nodes
+        if tabular_nodes:
+            for node in tabular_nodes:
+                all_nodes.extend(self._split_tabular(node))
+            logger.info("Tabular fast path: %s", self.stats())
 
         return all_nodes
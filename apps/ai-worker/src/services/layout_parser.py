@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+from typing import List, Optional
+
+import magic
+from llama_index.core.readers.base import BaseReader
+from llama_index.core.schema import Document
+
+from src.core.config import settings
+from src.services.office_extractor import DOCX_MIME_TYPE, PPTX_MIME_TYPE
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_MIME_TYPES = {
+    "application/pdf": "pdf",
+    DOCX_MIME_TYPE: "docx",
+    PPTX_MIME_TYPE: "pptx",
+}
+
+
+def in_layout_band(mime: str, score: int) -> bool:
+    """Whether a classified file goes to the local layout parser."""
+    return (
+        mime in LAYOUT_MIME_TYPES
+        and settings.PARSE_LAYOUT_ENABLED
+        and settings.PARSE_LAYOUT_MIN_SCORE <= score <= settings.PARSE_LAYOUT_MAX_SCORE
+    )
+
+
+class LayoutParser:
+    """
+    Local layout-aware parsing with Docling, on CPU.
+
+    Sits between pymupdf4llm (plain text layers) and LlamaParse: it recovers
+    reading order and table structure of moderately complex documents without
+    a cloud round trip. Docling loads its layout and table models on first
+    use, once per process.
+    """
+
+    def __init__(self):
+        self._reader: Optional[BaseReader] = None
+        self._lock = threading.Lock()
+
+    def _create_reader(self) -> BaseReader:
+        # Imported here: docling pulls in torch and the layout models.
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.document_converter import DocumentConverter, PdfFormatOption
+        from llama_index.readers.docling import DoclingReader
+
+        pipeline_options = PdfPipelineOptions(
+            do_ocr=settings.PARSE_LAYOUT_OCR, do_table_structure=True
+        )
+        converter = DocumentConverter(
+            format_options={
+                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+            }
+        )
+        return DoclingReader(
+            export_type=DoclingReader.ExportType.MARKDOWN, doc_converter=converter
+        )
+
+    @property
+    def reader(self) -> BaseReader:
+        with self._lock:
+            if self._reader is None:
+                self._reader = self._create_reader()
+        return self._reader
+
+    def parse(self, file_path: str) -> List[Document]:
+        file_name = os.path.basename(file_path)
+        file_type = LAYOUT_MIME_TYPES.get(magic.from_file(file_path, mime=True))
+        logger.info("Docling: parsing %s locally", file_name)
+        docs = self.reader.load_data(file_path)
+        return [
+            Document(
+                text=doc.text,
+                metadata={
+                    "file_name": file_name,
+                    "parsing_method": "docling_local",
+                    "file_type": file_type or "document",
+                    "is_premium": False,
+                },
+            )
+            for doc in docs
+            if doc.text.strip()
+        ]
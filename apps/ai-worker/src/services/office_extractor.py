@@ -0,0 +1,171 @@
+"""
+Native Markdown extraction for simple Office documents.
+
+DOCX files are read straight from their WordprocessingML (no python-docx),
+PPTX files with python-pptx. Both keep headings, lists and tables, which is
+all a low-complexity document (no charts or embedded objects) has to offer.
+"""
+
+import re
+import zipfile
+from typing import Dict, Iterable, List, Optional
+from xml.etree import ElementTree
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+DOCX_MIME_TYPE = (
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+)
+PPTX_MIME_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_HEADING_STYLE = re.compile(r"^heading\s*(\d)$")
+
+
+def markdown_table(rows: List[List[str]]) -> str:
+    """Markdown table with the first row as header; short rows are padded."""
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    cells = [
+        [" ".join(cell.split()).replace("|", "\\|") for cell in row]
+        + [""] * (width - len(row))
+        for row in rows
+    ]
+    lines = ["| " + " | ".join(cells[0]) + " |", "|" + "---|" * width]
+    lines.extend("| " + " | ".join(row) + " |" for row in cells[1:])
+    return "\n".join(lines)
+
+
+class OfficeExtractor:
+    # --- DOCX ---
+    def _docx_heading_levels(self, archive: zipfile.ZipFile) -> Dict[str, int]:
+        """Style id -> heading level (0 for the title), from word/styles.xml."""
+        try:
+            styles = ElementTree.fromstring(archive.read("word/styles.xml"))
+        except KeyError:
+            return {}
+        levels = {}
+        for style in styles.iter(f"{_W}style"):
+            name = style.find(f"{_W}name")
+            if name is None:
+                continue
+            name = name.get(f"{_W}val", "").strip().lower()
+            style_id = style.get(f"{_W}styleId")
+            if name == "title":
+                levels[style_id] = 0
+            elif match := _HEADING_STYLE.match(name):
+                levels[style_id] = int(match.group(1))
+        return levels
+
+    def _docx_text(self, element: ElementTree.Element) -> str:
+        parts = []
+        for node in element.iter():
+            if node.tag == f"{_W}t":
+                parts.append(node.text or "")
+            elif node.tag == f"{_W}tab":
+                parts.append("\t")
+            elif node.tag in (f"{_W}br", f"{_W}cr"):
+                parts.append("\n")
+        return "".join(parts)
+
+    def _docx_paragraph(
+        self, paragraph: ElementTree.Element, headings: Dict[str, int]
+    ) -> str:
+        text = self._docx_text(paragraph).strip()
+        if not text:
+            return ""
+        properties = paragraph.find(f"{_W}pPr")
+        if properties is None:
+            return text
+        style = properties.find(f"{_W}pStyle")
+        level = headings.get(style.get(f"{_W}val")) if style is not None else None
+        if level is not None:
+            return "#" * max(level, 1) + " " + " ".join(text.split())
+        numbering = properties.find(f"{_W}numPr")
+        if numbering is not None:
+            depth = numbering.find(f"{_W}ilvl")
+            indent = int(depth.get(f"{_W}val", 0)) if depth is not None else 0
+            return "  " * indent + "- " + text
+        return text
+
+    def _docx_table(self, table: ElementTree.Element) -> str:
+        rows = []
+        for row in table.findall(f"{_W}tr"):
+            rows.append(
+                [
+                    " ".join(
+                        self._docx_text(p).strip() for p in cell.iter(f"{_W}p")
+                    ).strip()
+                    for cell in row.findall(f"{_W}tc")
+                ]
+            )
+        return markdown_table(rows)
+
+    def _docx_blocks(
+        self, body: ElementTree.Element, headings: Dict[str, int]
+    ) -> Iterable[str]:
+        for element in body:
+            if element.tag == f"{_W}p":
+                yield self._docx_paragraph(element, headings)
+            elif element.tag == f"{_W}tbl":
+                yield self._docx_table(element)
+            elif element.tag == f"{_W}sdt":
+                # Content controls (e.g. a table of contents) wrap regular blocks.
+                content = element.find(f"{_W}sdtContent")
+                if content is not None:
+                    yield from self._docx_blocks(content, headings)
+
+    def docx_to_markdown(self, file_path: str) -> str:
+        with zipfile.ZipFile(file_path) as archive:
+            headings = self._docx_heading_levels(archive)
+            document = ElementTree.fromstring(archive.read("word/document.xml"))
+        body = document.find(f"{_W}body")
+        if body is None:
+            return ""
+        return "\n\n".join(
+            block for block in self._docx_blocks(body, headings) if block
+        )
+
+    # --- PPTX ---
+    def _pptx_shape_blocks(self, shapes, title_id: Optional[int]) -> Iterable[str]:
+        # Reading order: top to bottom, then left to right.
+        for shape in sorted(shapes, key=lambda s: (s.top or 0, s.left or 0)):
+            if shape.shape_id == title_id:
+                continue
+            if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+                yield from self._pptx_shape_blocks(shape.shapes, title_id)
+            elif shape.has_table:
+                yield markdown_table(
+                    [[cell.text for cell in row.cells] for row in shape.table.rows]
+                )
+            elif shape.has_text_frame:
+                lines = []
+                for paragraph in shape.text_frame.paragraphs:
+                    text = paragraph.text.strip()
+                    if text:
+                        lines.append("  " * paragraph.level + "- " + text)
+                if lines:
+                    yield "\n".join(lines)
+
+    def pptx_to_markdown(self, file_path: str) -> str:
+        presentation = Presentation(file_path)
+        slides = []
+        for number, slide in enumerate(presentation.slides, start=1):
+            title = slide.shapes.title
+            heading = title.text.strip() if title is not None else ""
+            blocks = [f"## Slide {number}" + (f": {heading}" if heading else "")]
+            blocks.extend(
+                self._pptx_shape_blocks(
+                    slide.shapes, title.shape_id if title is not None else None
+                )
+            )
+            if slide.has_notes_slide:
+                notes = slide.notes_slide.notes_text_frame.text.strip()
+                if notes:
+                    blocks.append(f"> Notes: {' '.join(notes.split())}")
+            slides.append("\n\n".join(blocks))
+        return "\n\n".join(slides)
@@ -0,0 +1,117 @@
+"""
+Columnar copies of tabular inputs.
+
+Besides the markdown documents, CSV and Excel files are written to Parquet
+with the dtypes pandas inferred: one file per table (sheet), one row group per
+chunk. Vectorization and analytics tools can memory-map or column-project them
+instead of re-reading the source. Needs the ai-worker[parquet] extra.
+"""
+
+import logging
+import os
+import tempfile
+from typing import Dict, Optional, Set
+
+import pandas as pd
+
+from src.core.config import settings
+from src.core.s3_client import S3Client
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency: ai-worker[parquet]
+    pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+class ParquetSidecars:
+    """
+    Parquet writers for the tables of one tabular file, keyed by sheet name
+    (None for a CSV) and stored under the file's content hash and parser
+    version, like the parsed artifact. The first chunk of a table fixes its
+    schema; a later chunk that cannot be cast to it (e.g. text in a numeric
+    column) drops that table's sidecar instead of failing the parse.
+    """
+
+    def __init__(self, file_path: str, sha256: str):
+        self._file_name = os.path.basename(file_path)
+        self._sha256 = sha256
+        self._writers: Dict[Optional[str], "pq.ParquetWriter"] = {}
+        self._paths: Dict[Optional[str], str] = {}
+        self.failed: Set[Optional[str]] = set()
+
+    def s3_key(self, sheet: Optional[str]) -> str:
+        return (
+            f"{settings.TABULAR_PARQUET_S3_PREFIX}/"
+            f"{self._sha256}-{settings.PARSER_VERSION}/{sheet or 'table'}.parquet"
+        )
+
+    def write(self, sheet: Optional[str], df: pd.DataFrame) -> None:
+        if sheet in self.failed:
+            return
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            writer = self._writers.get(sheet)
+            if writer is None:
+                fd, path = tempfile.mkstemp(suffix=".parquet", dir=settings.TEMP_DIR)
+                os.close(fd)
+                self._paths[sheet] = path
+                writer = pq.ParquetWriter(path, table.schema)
+                self._writers[sheet] = writer
+            else:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+        except (pa.ArrowException, ValueError, TypeError) as e:
+            logger.warning(
+                "Dropping Parquet sidecar of %s (%s): %s",
+                self._file_name,
+                sheet or "table",
+                e,
+            )
+            self.failed.add(sheet)
+            self._discard(sheet)
+
+    def upload(self, s3_client: S3Client) -> Dict[Optional[str], str]:
+        """
+        Finish every complete table and upload it; returns sheet -> S3 key.
+        A table whose upload fails is dropped (added to failed) like one whose
+        chunks did not fit its schema.
+        """
+        keys = {}
+        try:
+            for sheet, writer in self._writers.items():
+                try:
+                    writer.close()
+                    s3_client.upload_file(self._paths[sheet], self.s3_key(sheet))
+                except Exception as e:
+                    logger.warning(
+                        "Dropping Parquet sidecar of %s (%s), upload failed: %s",
+                        self._file_name,
+                        sheet or "table",
+                        e,
+                    )
+                    self.failed.add(sheet)
+                    continue
+                keys[sheet] = self.s3_key(sheet)
+        finally:
+            self.close()
+        return keys
+
+    def _discard(self, sheet: Optional[str]) -> None:
+        writer = self._writers.pop(sheet, None)
+        if writer is not None:
+            writer.close()
+        path = self._paths.pop(sheet, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def close(self) -> None:
+        """Remove the local files (written or not)."""
+        for sheet in list(self._paths):
+            self._discard(sheet)
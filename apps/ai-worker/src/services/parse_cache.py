@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+import tempfile
+from collections import Counter
+from typing import Dict, List, Optional
+
+from botocore.exceptions import ClientError
+from llama_index.core.schema import Document
+
+from src.core.config import settings
+from src.core.s3_client import S3Client, is_not_found
+from src.services.documents_service import DocumentsService
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    Two-tier cache of parser output.
+
+    Tier 1: local disk LRU under TEMP_DIR/parse_cache, bounded by
+            PARSE_CACHE_MAX_BYTES. Recency is tracked with file mtimes so the
+            cache survives worker restarts and is shared by prefork children.
+    Tier 2: durable copy in S3 under PARSE_CACHE_S3_PREFIX, shared by all workers.
+
+    Counters (local_hits, remote_hits, misses, puts, evictions) are exposed
+    through stats() to size the local tier.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        s3_client: Optional[S3Client] = None,
+    ):
+        self._cache_dir = cache_dir or os.path.join(settings.TEMP_DIR, "parse_cache")
+        self._max_bytes = (
+            max_bytes if max_bytes is not None else settings.PARSE_CACHE_MAX_BYTES
+        )
+        self._s3_client = s3_client
+        self._documents_service = DocumentsService()
+        self._counters: Counter = Counter()
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def s3_client(self) -> S3Client:
+        if self._s3_client is None:
+            self._s3_client = S3Client()
+        return self._s3_client
+
+    @staticmethod
+    def make_key(content_sha256: str, route: str, parser_config: str) -> str:
+        raw = f"{content_sha256}:{route}:{parser_config}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            name: self._counters[name]
+            for name in ("local_hits", "remote_hits", "misses", "puts", "evictions")
+        }
+
+    def _local_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.json")
+
+    def _s3_key(self, key: str) -> str:
+        return f"{settings.PARSE_CACHE_S3_PREFIX}/{key}.json"
+
+    def _read_local(self, key: str) -> Optional[List[Document]]:
+        path = self._local_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                documents = self._documents_service.from_json(f.read())
+            os.utime(path)  # mark as recently used
+            return documents
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Dropping unreadable parse cache entry %s: %s", key, e)
+            self._remove(path)
+            return None
+
+    def _write_local(self, key: str, payload: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            # Atomic rename: concurrent readers never see a partial entry.
+            os.replace(tmp_path, self._local_path(key))
+        except OSError:
+            self._remove(tmp_path)
+            raise
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            self._counters["evictions"] += 1
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> Optional[List[Document]]:
+        documents = self._read_local(key)
+        if documents is not None:
+            self._counters["local_hits"] += 1
+            return documents
+
+        try:
+            # One GET, straight into memory; a missing key is a plain miss.
+            payload = self.s3_client.get_bytes(self._s3_key(key)).decode("utf-8")
+            documents = self._documents_service.from_json(payload)
+            self._write_local(key, payload)
+            self._counters["remote_hits"] += 1
+            self._evict()
+            return documents
+        except ClientError as e:
+            if not is_not_found(e):
+                logger.warning("Parse cache S3 lookup failed: %s", e)
+        except Exception as e:
+            logger.warning("Parse cache S3 lookup failed: %s", e)
+
+        self._counters["misses"] += 1
+        return None
+
+    def put(self, key: str, documents: List[Document]) -> None:
+        payload = self._documents_service.to_json(documents)
+        try:
+            self._write_local(key, payload)
+            self.s3_client.put_bytes(payload.encode("utf-8"), self._s3_key(key))
+            self._counters["puts"] += 1
+        except Exception as e:
+            logger.warning("Parse cache write failed: %s", e)
+        self._evict()
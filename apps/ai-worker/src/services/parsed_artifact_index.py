@@ -0,0 +1,64 @@
+import logging
+from typing import Optional
+
+import redis
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ai_worker:parsed_index"
+
+
+class ParsedArtifactIndex:
+    """
+    Persistent content index shared by all workers (Redis).
+
+    Two mappings are kept:
+    1. (S3 ETag, size) -> sha256, so a re-upload of known bytes is recognised
+       from a HEAD request alone, without downloading the object.
+    2. (sha256, parser version, force_ocr) -> parsed artifact S3 key.
+
+    The index is an optimization only: Redis errors are logged and treated
+    as a cache miss so parsing still goes ahead.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self._redis = client or redis.Redis.from_url(settings.redis_url)
+
+    def _etag_key(self, etag: str, size: int) -> str:
+        return f"{_KEY_PREFIX}:etag:{etag}:{size}"
+
+    def _artifact_key(self, sha256: str, force_ocr: bool) -> str:
+        return (
+            f"{_KEY_PREFIX}:artifact:{sha256}:"
+            f"{settings.PARSER_VERSION}:{int(force_ocr)}"
+        )
+
+    def _get(self, key: str) -> Optional[str]:
+        try:
+            value = self._redis.get(key)
+        except redis.RedisError as e:
+            logger.warning("Parsed artifact index lookup failed: %s", e)
+            return None
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def _set(self, key: str, value: str) -> None:
+        try:
+            self._redis.set(key, value)
+        except redis.RedisError as e:
+            logger.warning("Parsed artifact index write failed: %s", e)
+
+    def lookup_sha256(self, etag: str, size: int) -> Optional[str]:
+        return self._get(self._etag_key(etag, size))
+
+    def remember_sha256(self, etag: str, size: int, sha256: str) -> None:
+        self._set(self._etag_key(etag, size), sha256)
+
+    def lookup(self, sha256: str, force_ocr: bool) -> Optional[str]:
+        return self._get(self._artifact_key(sha256, force_ocr))
+
+    def record(self, sha256: str, force_ocr: bool, parsed_s3_key: str) -> None:
+        self._set(self._artifact_key(sha256, force_ocr), parsed_s3_key)
@@ -0,0 +1,36 @@
+from typing import Iterator, Tuple
+
+import fitz  # PyMuPDF
+
+_PDF_MAGIC = b"%PDF-"
+
+
+class PdfPartitioner:
+    """Splits PDFs into standalone page-range PDFs."""
+
+    def page_count(self, file_path: str) -> int:
+        """Number of pages of a PDF, 0 for anything that is not a PDF."""
+        with open(file_path, "rb") as f:
+            if f.read(len(_PDF_MAGIC)) != _PDF_MAGIC:
+                return 0
+        with fitz.open(file_path) as doc:
+            return doc.page_count
+
+    @staticmethod
+    def extract_pages(doc: fitz.Document, first: int, last: int) -> bytes:
+        """Pages first..last (0-based, inclusive) of doc as a new PDF."""
+        part = fitz.open()
+        try:
+            part.insert_pdf(doc, from_page=first, to_page=last)
+            return part.tobytes()
+        finally:
+            part.close()
+
+    def split(
+        self, file_path: str, part_pages: int
+    ) -> Iterator[Tuple[int, int, bytes]]:
+        """Yield (first, last, pdf bytes) for consecutive parts of part_pages."""
+        with fitz.open(file_path) as doc:
+            for first in range(0, doc.page_count, part_pages):
+                last = min(first + part_pages, doc.page_count) - 1
+                yield first, last, self.extract_pages(doc, first, last)
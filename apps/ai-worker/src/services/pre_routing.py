@@ -0,0 +1,66 @@
+import logging
+from typing import Callable, Optional, Tuple
+
+from src.core.config import settings
+from src.core.s3_client import S3Client
+from src.services.complexity_analyzer import DocumentComplexityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+class PreRoutingService:
+    """
+    Classifies an S3 object from ranged reads, before it is downloaded.
+
+    The first PRE_ROUTING_HEADER_BYTES are sniffed with libmagic; Office
+    archives additionally read their central directory from the last
+    PRE_ROUTING_TAIL_BYTES. Large PDFs are sampled from their first
+    PRE_ROUTING_PDF_SAMPLE_BYTES and the same tail, so scans go to the cloud
+    parser without being downloaded. Returns the same (score, mime,
+    is_complex) triple as DocumentComplexityAnalyzer.get_file_info, or None
+    when the file has to be downloaded to decide.
+    """
+
+    def __init__(
+        self,
+        s3_client: S3Client,
+        analyzer: Optional[DocumentComplexityAnalyzer] = None,
+    ):
+        self._s3_client = s3_client
+        self._analyzer = analyzer or DocumentComplexityAnalyzer()
+
+    def probe(
+        self, s3_key: str, size: Optional[int] = None
+    ) -> Optional[Tuple[int, str, bool]]:
+        try:
+            header = self._s3_client.get_bytes(
+                s3_key, start=0, end=settings.PRE_ROUTING_HEADER_BYTES - 1
+            )
+            if size is not None and size <= len(header):
+                # Small object: the header already is the whole file.
+                return self._analyzer.get_header_info(header, lambda: header)
+
+            def read_tail() -> bytes:
+                return self._s3_client.get_bytes(
+                    s3_key, start=-settings.PRE_ROUTING_TAIL_BYTES
+                )
+
+            return self._analyzer.get_header_info(
+                header,
+                read_tail,
+                read_pdf_sample=lambda: self._pdf_sample(s3_key, size, read_tail),
+            )
+        except Exception as e:
+            logger.warning("Pre-routing failed for %s: %s", s3_key, e)
+            return None
+
+    def _pdf_sample(
+        self, s3_key: str, size: Optional[int], read_tail: Callable[[], bytes]
+    ) -> Optional[bytes]:
+        head_bytes = settings.PRE_ROUTING_PDF_SAMPLE_BYTES
+        if size is not None and size <= head_bytes + settings.PRE_ROUTING_TAIL_BYTES:
+            # Cheap to download; the full analysis is more accurate.
+            return None
+        head = self._s3_client.get_bytes(s3_key, start=0, end=head_bytes - 1)
+        # The page tree usually sits at the end of the file.
+        return head + b"\n" + read_tail()
@@ -0,0 +1,125 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from qdrant_client import QdrantClient
+
+from src.core.config import settings
+from src.services.chunk_index import QdrantChunkIndex
+from src.services.qdrant_vector_store import BatchedQdrantVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class QdrantRegistry:
+    """
+    Per-process Qdrant client and vector-store handles.
+
+    The client is opened once per process and reused by every task; vector
+    stores are cached per collection so collection setup (existence check,
+    vector format detection) also happens once. The client is health-checked
+    at most every `health_check_interval` seconds and reopened, together with
+    its vector stores, when the check fails or after a fork (gRPC channels
+    must not be shared with a child process).
+    """
+
+    def __init__(self, health_check_interval: Optional[float] = None):
+        self._health_check_interval = (
+            settings.QDRANT_HEALTH_CHECK_INTERVAL
+            if health_check_interval is None
+            else health_check_interval
+        )
+        self._client: Optional[QdrantClient] = None
+        self._pid: Optional[int] = None
+        self._checked_at = 0.0
+        self._stores: Dict[str, BatchedQdrantVectorStore] = {}
+        self._chunk_indexes: Dict[str, QdrantChunkIndex] = {}
+        self._lock = threading.RLock()
+
+    def _connect(self) -> QdrantClient:
+        self._client = QdrantClient(
+            host=settings.QDRANT_HOST,
+            port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+        )
+        self._pid = os.getpid()
+        self._checked_at = time.monotonic()
+        self._stores.clear()
+        self._chunk_indexes.clear()
+        logger.info(
+            "Connected to Qdrant at %s (pid=%s)", settings.QDRANT_HOST, self._pid
+        )
+        return self._client
+
+    def _is_healthy(self, client: QdrantClient) -> bool:
+        try:
+            client.get_collections()
+            return True
+        except Exception as e:
+            logger.warning("Qdrant health check failed, reconnecting: %s", e)
+            return False
+
+    def reset(self) -> None:
+        """Drop the client and every cached vector store."""
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                try:
+                    self._client.close()
+                except Exception as e:
+                    logger.debug("Closing Qdrant client failed: %s", e)
+            self._client = None
+            self._pid = None
+            self._stores.clear()
+            self._chunk_indexes.clear()
+
+    def client(self) -> QdrantClient:
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                # Never close a parent's client from a forked child.
+                self._client = None
+                return self._connect()
+            now = time.monotonic()
+            if now - self._checked_at >= self._health_check_interval:
+                self._checked_at = now
+                if not self._is_healthy(self._client):
+                    self.reset()
+                    return self._connect()
+            return self._client
+
+    def vector_store(self, collection_name: str) -> BatchedQdrantVectorStore:
+        with self._lock:
+            client = self.client()
+            store = self._stores.get(collection_name)
+            if store is None:
+                store = BatchedQdrantVectorStore(
+                    client=client,
+                    collection_name=collection_name,
+                    batch_size=settings.QDRANT_UPSERT_BATCH_SIZE,
+                    workers=settings.QDRANT_UPSERT_WORKERS,
+                    wait=settings.QDRANT_UPSERT_WAIT,
+                )
+                self._stores[collection_name] = store
+            return store
+
+    def chunk_index(self, collection_name: str) -> QdrantChunkIndex:
+        with self._lock:
+            client = self.client()
+            index = self._chunk_indexes.get(collection_name)
+            if index is None:
+                index = QdrantChunkIndex(client, collection_name)
+                self._chunk_indexes[collection_name] = index
+            return index
+
+
+_registry: QdrantRegistry | None = None
+
+
+def get_qdrant_registry() -> QdrantRegistry:
+    """Process-wide Qdrant registry."""
+    global _registry
+    if _registry is None:
+        _registry = QdrantRegistry()
+    return _registry
@@ -0,0 +1,98 @@
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, List, Optional
+
+from llama_index.core.schema import BaseNode
+from llama_index.vector_stores.qdrant import QdrantVectorStore
+from pydantic import PrivateAttr
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedQdrantVectorStore(QdrantVectorStore):
+    """
+    QdrantVectorStore with batched, parallel, optionally non-blocking upserts.
+
+    add() cuts points into `batch_size` batches and uploads them from a pool
+    of `workers` threads. With wait=False, Qdrant acknowledges each batch once
+    it is in the WAL, without waiting for it to be applied. flush() is the
+    end-of-task barrier: it waits for every acknowledgement and then sends the
+    last batch with wait=True. Updates are applied in order, so once flush()
+    returns all upserted points are visible to searches.
+    """
+
+    _workers: int = PrivateAttr()
+    _wait: bool = PrivateAttr()
+    _pool: Optional[ThreadPoolExecutor] = PrivateAttr(default=None)
+    _in_flight: Deque[Future] = PrivateAttr()
+    _held_batch: Optional[List[Any]] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr()
+
+    def __init__(
+        self,
+        *args: Any,
+        workers: int = 4,
+        wait: bool = False,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self._workers = max(1, workers)
+        self._wait = wait
+        self._in_flight = deque()
+        self._lock = threading.Lock()
+
+    def _submit(self, points: List[Any], wait: bool) -> None:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._workers, thread_name_prefix="qdrant-upsert"
+            )
+        # Bound the number of outstanding batches so memory stays flat.
+        while len(self._in_flight) >= self._workers * 2:
+            self._in_flight.popleft().result()
+        self._in_flight.append(
+            self._pool.submit(
+                self._client.upsert,
+                collection_name=self.collection_name,
+                points=points,
+                wait=wait,
+            )
+        )
+
+    def add(self, nodes: List[BaseNode], **add_kwargs: Any) -> List[str]:
+        if not nodes:
+            return []
+
+        with self._lock:
+            if not self._collection_initialized:
+                self._create_collection(
+                    collection_name=self.collection_name,
+                    vector_size=len(nodes[0].get_embedding()),
+                )
+            if self._legacy_vector_format is None:
+                self._detect_vector_format(self.collection_name)
+
+            points, ids = self._build_points(nodes, self.sparse_vector_name)
+            for start in range(0, len(points), self.batch_size):
+                # Keep the newest batch back: flush() sends it with wait=True.
+                if self._held_batch is not None:
+                    self._submit(self._held_batch, wait=self._wait)
+                self._held_batch = points[start : start + self.batch_size]
+            return ids
+
+    def flush(self) -> None:
+        """Barrier: return once every upserted point is applied."""
+        with self._lock:
+            try:
+                while self._in_flight:
+                    self._in_flight.popleft().result()
+                if self._held_batch is not None:
+                    self._client.upsert(
+                        collection_name=self.collection_name,
+                        points=self._held_batch,
+                        wait=True,
+                    )
+            finally:
+                self._in_flight.clear()
+                self._held_batch = None
@@ -0,0 +1,217 @@
+"""
+Table summaries for MarkdownElementNodeParser without an LLM call per table.
+
+Summaries are cached in the shared cache backend, keyed by the LLM model and
+a hash of the normalized table (cell whitespace and column alignment do not
+matter), so tables recurring across versions of a report are summarized once
+for the whole cluster. Tables smaller than TABLE_SUMMARY_MIN_CELLS data cells
+get a heuristic summary (columns, types, sample values) instead.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Sequence
+
+from llama_index.core.node_parser import MarkdownElementNodeParser
+from llama_index.core.node_parser.relational.base_element import (
+    Element,
+    TableColumnOutput,
+    TableOutput,
+)
+from llama_index.core.settings import Settings
+from pydantic import PrivateAttr
+
+from src.core.cache_backend import CacheBackend
+
+logger = logging.getLogger(__name__)
+
+_TABLE_TYPES = ("table", "table_text")
+_SEPARATOR_CELL = re.compile(r"^:?-+:?$")
+
+
+def table_rows(markdown: str) -> List[List[str]]:
+    """Cells of a markdown table, whitespace-normalized, without separators."""
+    rows = []
+    for line in markdown.strip().splitlines():
+        line = line.strip()
+        if line.startswith("|"):
+            line = line[1:]
+        if line.endswith("|"):
+            line = line[:-1]
+        cells = [" ".join(cell.split()) for cell in line.split("|")]
+        if all(_SEPARATOR_CELL.match(cell) for cell in cells):
+            continue
+        rows.append(cells)
+    return rows
+
+
+def table_key(markdown: str) -> str:
+    normalized = "\n".join("|".join(row) for row in table_rows(markdown))
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _is_number(value: str) -> bool:
+    try:
+        float(value.replace(",", ""))
+    except ValueError:
+        return False
+    return True
+
+
+def heuristic_summary(rows: List[List[str]]) -> TableOutput:
+    """Summary of a small table from its header and values."""
+    header, body = rows[0], rows[1:]
+    columns = []
+    for index, name in enumerate(header):
+        values = [row[index] for row in body if index < len(row) and row[index]]
+        numeric = bool(values) and all(_is_number(value) for value in values)
+        samples = list(dict.fromkeys(values))[:3]
+        columns.append(
+            TableColumnOutput(
+                col_name=name or f"column {index + 1}",
+                col_type="number" if numeric else "text",
+                summary=f"e.g. {', '.join(samples)}" if samples else "empty",
+            )
+        )
+    names = ", ".join(column.col_name for column in columns)
+    return TableOutput(
+        summary=f"Table with {len(body)} rows and columns: {names}.",
+        columns=columns,
+    )
+
+
+class CachedMarkdownElementNodeParser(MarkdownElementNodeParser):
+    """
+    MarkdownElementNodeParser that only asks the LLM to summarize tables that
+    are neither cached nor small. Counters (hits, heuristic, misses: tables
+    sent to the LLM) are exposed through stats().
+    """
+
+    _backend: Optional[CacheBackend] = PrivateAttr(default=None)
+    _min_cells: int = PrivateAttr(default=0)
+    _counters: Dict[str, int] = PrivateAttr()
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        min_cells: int = 0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._backend = backend
+        self._min_cells = min_cells
+        self._counters = {"hits": 0, "heuristic": 0, "misses": 0}
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedMarkdownElementNodeParser"
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
+
+    @property
+    def _namespace(self) -> str:
+        llm = self.llm or Settings.llm
+        return f"table_summaries:{llm.metadata.model_name}"
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, TableOutput]:
+        if self._backend is None or not keys:
+            return {}
+        try:
+            found = self._backend.get_many(self._namespace, set(keys))
+            return {
+                key: TableOutput.model_validate_json(value)
+                for key, value in found.items()
+            }
+        except Exception as e:
+            logger.warning("Table summary cache lookup failed: %s", e)
+            return {}
+
+    def _store(self, elements: List[Element]) -> None:
+        if self._backend is None:
+            return
+        items = {
+            table_key(str(element.element)): element.table_output.model_dump_json()
+            for element in elements
+            if element.type in _TABLE_TYPES
+        }
+        try:
+            self._backend.put_many(
+                self._namespace, {key: value.encode() for key, value in items.items()}
+            )
+        except Exception as e:
+            logger.warning("Table summary cache write failed: %s", e)
+
+    @staticmethod
+    def _with_context(elements: List[Element], indexes: List[int]) -> List[Element]:
+        """
+        The tables at indexes with their neighbouring text elements (where the
+        parser looks for captions), runs separated by a placeholder element.
+        """
+        keep = set(indexes)
+        for index in indexes:
+            keep.update(
+                i
+                for i in (index - 1, index + 1)
+                if 0 <= i < len(elements) and elements[i].type == "text"
+            )
+        selected: List[Element] = []
+        previous = None
+        for index in sorted(keep):
+            if previous is not None and index != previous + 1:
+                selected.append(Element(id="gap", type="gap", element=""))
+            selected.append(elements[index])
+            previous = index
+        return selected
+
+    def _resolve(self, elements: List[Element]) -> List[Element]:
+        """
+        Fill table_output from the cache or heuristics; returns the elements
+        (with context) whose tables still need the LLM.
+        """
+        tables = [
+            (index, element, table_key(str(element.element)))
+            for index, element in enumerate(elements)
+            if element.type in _TABLE_TYPES
+        ]
+        cached = self._lookup([key for _, _, key in tables])
+        pending: Dict[str, int] = {}
+        for index, element, key in tables:
+            rows = table_rows(str(element.element))
+            if key in cached:
+                element.table_output = cached[key]
+                self._counters["hits"] += 1
+            elif rows and len(rows[0]) * (len(rows) - 1) < self._min_cells:
+                element.table_output = heuristic_summary(rows)
+                self._counters["heuristic"] += 1
+            else:
+                # Identical tables within the batch are summarized once.
+                pending.setdefault(key, index)
+        self._counters["misses"] += len(pending)
+        return self._with_context(elements, list(pending.values()))
+
+    def _finish(self, elements: List[Element]) -> None:
+        summarized: Dict[str, TableOutput] = {}
+        for element in elements:
+            if element.type in _TABLE_TYPES and element.table_output is not None:
+                summarized.setdefault(
+                    table_key(str(element.element)), element.table_output
+                )
+        for element in elements:
+            if element.type in _TABLE_TYPES and element.table_output is None:
+                element.table_output = summarized[table_key(str(element.element))]
+
+    def extract_table_summaries(self, elements: List[Element]) -> None:
+        pending = self._resolve(elements)
+        if pending:
+            super().extract_table_summaries(pending)
+            self._store(pending)
+        self._finish(elements)
+
+    async def aextract_table_summaries(self, elements: List[Element]) -> None:
+        pending = self._resolve(elements)
+        if pending:
+            await super().aextract_table_summaries(pending)
+            self._store(pending)
+        self._finish(elements)
@@ -0,0 +1,79 @@
+"""
+Chunked reading of CSV and Excel files.
+
+Rows are read in groups of TABULAR_CHUNK_ROWS, so memory stays bounded by the
+chunk size instead of growing with the file: CSVs through the pandas chunked
+reader, workbooks through openpyxl in read-only mode (opened once for all of
+their sheets). Legacy .xls workbooks, which openpyxl cannot read, are loaded
+sheet by sheet with pandas.
+"""
+
+import zipfile
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import openpyxl
+import pandas as pd
+from openpyxl.utils.exceptions import InvalidFileException
+
+from src.core.config import settings
+
+# (sheet name or None for CSV, 0-based index of the first data row, rows)
+TableChunk = Tuple[Optional[str], int, pd.DataFrame]
+
+
+class TabularReader:
+    def __init__(self, chunk_rows: Optional[int] = None):
+        self._chunk_rows = chunk_rows or settings.TABULAR_CHUNK_ROWS
+
+    def iter_csv(self, file_path: str) -> Iterator[TableChunk]:
+        start = 0
+        with pd.read_csv(file_path, chunksize=self._chunk_rows) as reader:
+            for chunk in reader:
+                yield None, start, chunk
+                start += len(chunk)
+
+    @staticmethod
+    def _columns(header: Sequence[object]) -> List[str]:
+        return [
+            f"Unnamed: {index}" if value is None else str(value)
+            for index, value in enumerate(header)
+        ]
+
+    def _iter_sheet_rows(
+        self, title: str, rows: Iterator[Sequence[object]]
+    ) -> Iterator[TableChunk]:
+        # The first non-empty row is the header, like pandas.read_excel.
+        header = next((row for row in rows if any(v is not None for v in row)), None)
+        if header is None:
+            return
+        columns = self._columns(header)
+        width = len(columns)
+        start, batch = 0, []
+        for row in rows:
+            batch.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if len(batch) == self._chunk_rows:
+                yield title, start, pd.DataFrame(batch, columns=columns)
+                start, batch = start + len(batch), []
+        if batch:
+            yield title, start, pd.DataFrame(batch, columns=columns)
+
+    def _iter_legacy_excel(self, file_path: str) -> Iterator[TableChunk]:
+        with pd.ExcelFile(file_path) as workbook:
+            for sheet in workbook.sheet_names:
+                df = workbook.parse(sheet)
+                for start in range(0, len(df), self._chunk_rows):
+                    yield sheet, start, df.iloc[start : start + self._chunk_rows]
+
+    def iter_excel(self, file_path: str) -> Iterator[TableChunk]:
+        try:
+            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile):
+            yield from self._iter_legacy_excel(file_path)
+            return
+        try:
+            for sheet in workbook.worksheets:
+                yield from self._iter_sheet_rows(
+                    sheet.title, sheet.iter_rows(values_only=True)
+                )
+        finally:
+            workbook.close()
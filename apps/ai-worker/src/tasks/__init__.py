@@ -8,7 +8,26 @@ To add a new task:
   4. Optionally add CELERY_QUEUE_* in config and use in TASK_QUEUES.
 """
 
-from src.tasks.parse_file import run_parse_file
+from src.tasks.parse_file import (
+    run_fan_out_failed,
+    run_merge_parts,
+    run_parse_cloud,
+    run_parse_cloud_batch,
+    run_parse_file,
+    run_parse_local,
+    run_parse_part,
+    run_parse_text,
+)
 from src.tasks.vectorize_file import run_vectorize_file
 
-__all__ = ["run_parse_file", "run_vectorize_file"]
+__all__ = [
+    "run_fan_out_failed",
+    "run_merge_parts",
+    "run_parse_cloud",
+    "run_parse_cloud_batch",
+    "run_parse_file",
+    "run_parse_local",
+    "run_parse_part",
+    "run_parse_text",
+    "run_vectorize_file",
+]
@@ -1,71 +1,624 @@
+import asyncio
+import hashlib
+import io
 import logging
 import os
 import tempfile
-from typing import Optional
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, List, Optional, Tuple, TypeVar
 
+from celery import chord
+from llama_index.core.schema import Document
 from pydantic import BaseModel
 
 from src.celery_app import app
 from src.core.config import settings
 from src.core.s3_client import S3Client
 from src.pipelines.parse_pipeline import ParseFilePipeline, ParseFilePipelinePayload
-from src.services.documents_service import DocumentsService
+from src.services.cloud_parse_batch import CloudParseBatchBuffer
+from src.services.cloud_parse_jobs import (
+    CloudParseJob,
+    CloudParseJobPoller,
+    CloudParseJobStore,
+)
+from src.services.complexity_analyzer import PdfAnalysis
+from src.services.content_fingerprint import (
+    ContentFingerprintService,
+    HashingReader,
+)
+from src.services.documents_service import DocumentsService, close_documents
+from src.services.layout_parser import in_layout_band
+from src.services.parsed_artifact_index import ParsedArtifactIndex
+from src.services.pdf_partitioner import PdfPartitioner
+from src.services.pre_routing import PreRoutingService
 from src.tasks.vectorize_file import VectorizeFileTaskPayload, run_vectorize_file
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 _pipeline: ParseFilePipeline | None = None
+# The cloud lane runs on a thread pool.
+_pipeline_lock = threading.Lock()
 
 
 class ParseFileTask(BaseModel):
     s3_key: str
     collection_name: str
     force_ocr: Optional[bool] = None
+    # Filled in by run_parse_file before the task is handed to a parser lane.
+    etag: Optional[str] = None
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    file_info: Optional[Tuple[int, str, bool]] = None
+
+
+class ParsePartTask(BaseModel):
+    """A page range of a fanned out PDF, staged in S3 as its own PDF."""
+
+    s3_key: str
+    first_page: int
+    last_page: int
+    force_ocr: Optional[bool] = None
 
 
 _s3_client = S3Client()
 _documents_service = DocumentsService()
+_fingerprint_service = ContentFingerprintService()
+_artifact_index = ParsedArtifactIndex()
+_pre_routing = PreRoutingService(_s3_client)
+_cloud_jobs = CloudParseJobStore()
+_cloud_batch = CloudParseBatchBuffer()
+_pdf_partitioner = PdfPartitioner()
 
 
 def _get_pipeline() -> ParseFilePipeline:
     global _pipeline
-    if _pipeline is None:
-        _pipeline = ParseFilePipeline()
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ParseFilePipeline()
     return _pipeline
 
 
-@app.task(bind=True)
-def run_parse_file(self, task_payload: dict):
-    """Run document ingestion: download from S3, parse, index to Qdrant."""
-    task = ParseFileTask.model_validate(task_payload)
-    logger.info("Received task for parsing: s3_key=%s", task.s3_key)
+def _enqueue_vectorize(
+    parsed_s3_key: str, collection_name: str, source_id: str
+) -> None:
+    run_vectorize_file.delay(
+        VectorizeFileTaskPayload(
+            s3_key=parsed_s3_key,
+            collection_name=collection_name,
+            source_id=source_id,
+        ).model_dump()
+    )
 
-    file_name = os.path.basename(task_payload["s3_key"])
-    local_input_path = os.path.join(settings.TEMP_DIR, "inputs", file_name)
-    _s3_client.download_file(task.s3_key, local_input_path)
-    pipeline = _get_pipeline()
-    documents = pipeline.run(
-        ParseFilePipelinePayload(
-            local_input_path=local_input_path, force_ocr=task.force_ocr
-        )
+
+def _content_key_prefix(sha256: str, force_ocr: bool) -> str:
+    return f"parsed/{sha256}-{settings.PARSER_VERSION}-{int(force_ocr)}"
+
+
+def _find_parsed_artifact(sha256: str, force_ocr: bool) -> Optional[str]:
+    """Return the parsed artifact key of already ingested content, if it exists."""
+    parsed_s3_key = _artifact_index.lookup(sha256, force_ocr)
+    # Only content-addressed artifacts are reused: older index entries point to
+    # per-file keys that a later upload with the same name may have overwritten.
+    if not (parsed_s3_key or "").startswith(
+        _content_key_prefix(sha256, force_ocr) + "."
+    ):
+        return None
+    if _s3_client.exists(parsed_s3_key):
+        return parsed_s3_key
+    return None
+
+
+def _stream_to_cloud(
+    s3_key: str, size: Optional[int], send: Callable[[BinaryIO], T]
+) -> Tuple[T, Optional[str]]:
+    """Stream the object straight to the cloud parser, hashing it on the way."""
+    body = _s3_client.get_stream(s3_key)
+    reader = HashingReader(body)
+    try:
+        result = send(io.BufferedReader(reader))
+    finally:
+        body.close()
+    # The hash identifies the content only if the parser consumed all of it.
+    complete = size is not None and reader.bytes_read == size
+    return result, reader.hexdigest() if complete else None
+
+
+def _parse_streamed(
+    s3_key: str, file_name: str, size: Optional[int]
+) -> Tuple[List[Document], Optional[str]]:
+    return _stream_to_cloud(
+        s3_key,
+        size,
+        lambda stream: _get_pipeline().run_cloud_stream(stream, file_name),
+    )
+
+
+def _submit_cloud_job(task: ParseFileTask, file_name: str) -> None:
+    """Submit the upload to the cloud parser; the poller finishes the task."""
+    job_id, sha256 = _stream_to_cloud(
+        task.s3_key,
+        task.size,
+        lambda stream: _get_pipeline().submit_cloud_job(stream, file_name),
+    )
+    if job_id is None:
+        logger.warning("Cloud parse submission failed, aborting")
+        return
+    if settings.PARSE_DEDUP_ENABLED and sha256:
+        task.sha256 = sha256
+        _artifact_index.remember_sha256(task.etag, task.size, sha256)
+    _cloud_jobs.add(
+        CloudParseJob(job_id=job_id, file_name=file_name, payload=task.model_dump())
+    )
+
+
+def _batchable(task: ParseFileTask) -> bool:
+    return (
+        settings.PARSE_CLOUD_BATCHING
+        and task.size is not None
+        and task.size <= settings.CLOUD_BATCH_MAX_FILE_BYTES
     )
 
+
+def _buffer_for_batch(task: ParseFileTask) -> None:
+    """Buffer a small cloud-bound upload and make sure a batch flush is due."""
+    files, total_bytes = _cloud_batch.add(task.model_dump(), task.size)
+    if (
+        files >= settings.CLOUD_BATCH_MAX_FILES
+        or total_bytes >= settings.CLOUD_BATCH_MAX_BYTES
+    ):
+        run_parse_cloud_batch.delay()
+    elif _cloud_batch.schedule_flush(settings.CLOUD_BATCH_WINDOW_SECONDS):
+        run_parse_cloud_batch.apply_async(countdown=settings.CLOUD_BATCH_WINDOW_SECONDS)
+    logger.info("Buffered %s for a cloud batch (%s files waiting)", task.s3_key, files)
+
+
+def _read_object(s3_key: str) -> Optional[bytes]:
+    try:
+        return _s3_client.get_bytes(s3_key)
+    except Exception as e:
+        logger.error("Reading %s for a cloud batch failed: %s", s3_key, e)
+        return None
+
+
+def _put_documents(documents: List[Document], s3_key: str) -> None:
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.PARSED_ARTIFACT_SPOOL_BYTES
+    ) as f:
+        _documents_service.write_documents(documents, f)
+        f.seek(0)
+        _s3_client.put_stream(f, s3_key)
+
+
+def _get_documents(s3_key: str) -> List[Document]:
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.PARSED_ARTIFACT_SPOOL_BYTES
+    ) as f:
+        _s3_client.download_fileobj(s3_key, f)
+        f.seek(0)
+        return list(_documents_service.read_documents(f))
+
+
+def _store_parsed(
+    task: ParseFileTask, documents: List[Document], sha256: Optional[str]
+) -> None:
+    """Upload the parsed artifact, index it and enqueue vectorization."""
     if not documents:
         logger.warning("Parser returned empty content, aborting")
         return
 
-    json_str = _documents_service.to_json(documents)
-    parsed_s3_key = f"parsed/{file_name}.json"
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-        f.write(json_str)
-        temp_path = f.name
+    file_name = os.path.basename(task.s3_key)
+    extension = _documents_service.artifact_extension()
+    file_s3_key = f"parsed/{file_name}{extension}"
+    if not sha256:
+        _put_documents(documents, file_s3_key)
+        _enqueue_vectorize(file_s3_key, task.collection_name, task.s3_key)
+        return
+
+    # The artifact is stored under its content hash, which a later upload with
+    # the same file name cannot overwrite; dedup and vectorization use that
+    # key. The per-file key is a copy for readers that look artifacts up by
+    # upload name.
+    force_ocr = bool(task.force_ocr)
+    parsed_s3_key = _content_key_prefix(sha256, force_ocr) + extension
+    _put_documents(documents, parsed_s3_key)
+    _s3_client.copy_object(parsed_s3_key, file_s3_key)
+    _artifact_index.record(sha256, force_ocr, parsed_s3_key)
+    _enqueue_vectorize(parsed_s3_key, task.collection_name, task.s3_key)
+
+
+def complete_cloud_job(job: CloudParseJob, documents: List[Document]) -> None:
+    """Poller callback: finish the parse task of an async cloud job."""
+    task = ParseFileTask.model_validate(job.payload)
+    _store_parsed(task, documents, task.sha256)
+
+
+async def poll_cloud_jobs(stop: Optional[asyncio.Event] = None) -> None:
+    """Collect the results of async cloud parse jobs until stop is set."""
+    parser = _get_pipeline().parser
+    async with parser.cloud_client() as client:
+        poller = CloudParseJobPoller(
+            _cloud_jobs,
+            fetch=lambda job: parser.fetch_cloud_job(client, job.job_id, job.file_name),
+            on_complete=complete_cloud_job,
+        )
+        await poller.run(stop)
+
+
+def _fan_out(task: ParseFileTask, local_input_path: str) -> bool:
+    """
+    Split a very large PDF into page-range parts parsed across the cluster.
+
+    The parts are staged in S3 and parsed by run_parse_part on any parser lane
+    worker; run_merge_parts joins them in page order once all are done.
+    Returns False (nothing done) for files below the fan-out thresholds.
+    """
+    part_pages = settings.PARSE_FANOUT_PART_PAGES
+    page_count = _pdf_partitioner.page_count(local_input_path)
+    large = (
+        page_count >= settings.PARSE_FANOUT_MIN_PAGES
+        or os.path.getsize(local_input_path) >= settings.PARSE_FANOUT_MIN_BYTES
+    )
+    if page_count <= part_pages or not large:
+        return False
+
+    prefix = f"{settings.PARSE_FANOUT_S3_PREFIX}/{uuid.uuid4().hex}"
+    parts = []
+    for first, last, data in _pdf_partitioner.split(local_input_path, part_pages):
+        part = ParsePartTask(
+            s3_key=f"{prefix}/p{first + 1:05d}-{last + 1:05d}.pdf",
+            first_page=first,
+            last_page=last,
+            force_ocr=task.force_ocr,
+        )
+        _s3_client.put_bytes(data, part.s3_key)
+        parts.append(part)
+    os.remove(local_input_path)
+
+    pdf_keys = [part.s3_key for part in parts]
+    chord(run_parse_part.s(part.model_dump()) for part in parts)(
+        run_merge_parts.s(task.model_dump(), pdf_keys).on_error(
+            run_fan_out_failed.s(task.model_dump(), pdf_keys)
+        )
+    )
+    logger.info(
+        "Fanned out %s (%s pages) into %s parts", task.s3_key, page_count, len(parts)
+    )
+    return True
+
+
+def _cloud_bound(file_info: Optional[Tuple[int, str, bool]], force_ocr: bool) -> bool:
+    if force_ocr:
+        return True
+    if not (file_info and file_info[2]):
+        return False
+    # Moderately complex documents are parsed locally by the layout parser.
+    return not in_layout_band(file_info[1], file_info[0])
+
+
+def parse_lane(file_info: Optional[Tuple[int, str, bool]], force_ocr: bool) -> str:
+    """Parser lane for a pre-routed upload: "cloud", "local" or "text"."""
+    if _cloud_bound(file_info, force_ocr):
+        return "cloud"
+    if file_info is None:
+        # Undecided (e.g. PDFs): downloaded and analyzed on the local lane.
+        return "local"
+    mime = file_info[1]
+    if mime.startswith("text/") or "csv" in mime:
+        return "text"
+    return "local"
+
+
+def _defer_cloud(task: ParseFileTask, file_name: str) -> bool:
+    """
+    Hand a cloud-bound upload to the batch buffer or an async cloud job when
+    enabled. Returns False when it has to be parsed in place.
+    """
+    if _batchable(task):
+        _buffer_for_batch(task)
+        return True
+    if settings.PARSE_CLOUD_ASYNC:
+        _submit_cloud_job(task, file_name)
+        return True
+    return False
+
+
+def _hand_to_cloud(task: ParseFileTask, file_name: str) -> bool:
+    """
+    Send a downloaded upload that the analysis routed to the cloud parser to
+    the cloud lane or, parsing inline, to _defer_cloud.
+    """
+    if settings.PARSE_LANES_ENABLED:
+        logger.info("Handing %s to the cloud parser lane", task.s3_key)
+        run_parse_cloud.delay(task.model_dump())
+        return True
+    return _defer_cloud(task, file_name)
+
+
+def _parse(task: ParseFileTask) -> None:
+    """Parse a routed upload, write its artifact and enqueue vectorization."""
+    force_ocr = bool(task.force_ocr)
+    etag, size, sha256, file_info = task.etag, task.size, task.sha256, task.file_info
+    file_name = os.path.basename(task.s3_key)
+    cloud_bound = _cloud_bound(file_info, force_ocr)
+
+    if cloud_bound and _defer_cloud(task, file_name):
+        return
+    if cloud_bound and settings.PARSE_STREAM_TO_CLOUD:
+        documents, streamed_sha256 = _parse_streamed(task.s3_key, file_name, size)
+        if settings.PARSE_DEDUP_ENABLED and streamed_sha256:
+            sha256 = streamed_sha256
+            _artifact_index.remember_sha256(etag, size, sha256)
+    else:
+        local_input_path = os.path.join(settings.TEMP_DIR, "inputs", file_name)
+        _s3_client.download_file(task.s3_key, local_input_path)
+
+        if settings.PARSE_DEDUP_ENABLED:
+            fingerprint = _fingerprint_service.from_file(local_input_path, size, etag)
+            sha256 = fingerprint.sha256
+            _artifact_index.remember_sha256(etag, size, sha256)
+            parsed_s3_key = _find_parsed_artifact(sha256, force_ocr)
+            if parsed_s3_key:
+                logger.info("Dedup hit by content hash, reusing %s", parsed_s3_key)
+                os.remove(local_input_path)
+                _enqueue_vectorize(parsed_s3_key, task.collection_name, task.s3_key)
+                return
+
+        if settings.PARSE_FANOUT_ENABLED and _fan_out(
+            task.model_copy(update={"sha256": sha256}), local_input_path
+        ):
+            return
+
+        pipeline = _get_pipeline()
+        # One document handle and set of page scores for the analysis and
+        # the parser.
+        with PdfAnalysis(local_input_path) as pdf:
+            if file_info is None:
+                # Uploads pre-routing could not classify (e.g. PDFs) are
+                # analyzed here; the ones bound for the cloud parser leave the
+                # CPU lane.
+                file_info, to_cloud = pipeline.classify(
+                    local_input_path, force_ocr, pdf
+                )
+                if to_cloud and _hand_to_cloud(
+                    task.model_copy(update={"sha256": sha256, "file_info": file_info}),
+                    file_name,
+                ):
+                    os.remove(local_input_path)
+                    return
+
+            documents = pipeline.run(
+                ParseFilePipelinePayload(
+                    local_input_path=local_input_path,
+                    force_ocr=task.force_ocr,
+                    file_info=file_info,
+                ),
+                pdf,
+            )
+
+    try:
+        _store_parsed(task, documents, sha256)
+    finally:
+        close_documents(documents)
+
+
+@app.task(bind=True)
+def run_parse_cloud(self, task_payload: dict):
+    """Parser lane for LlamaParse-bound uploads (I/O bound)."""
+    _parse(ParseFileTask.model_validate(task_payload))
+
+
+@app.task(bind=True)
+def run_parse_local(self, task_payload: dict):
+    """Parser lane for locally parsed PDFs and Office files (CPU bound)."""
+    _parse(ParseFileTask.model_validate(task_payload))
+
+
+@app.task(bind=True)
+def run_parse_text(self, task_payload: dict):
+    """Parser lane for plain text and CSV uploads (quick)."""
+    _parse(ParseFileTask.model_validate(task_payload))
+
+
+@app.task(bind=True)
+def run_parse_cloud_batch(self):
+    """
+    Parse buffered small cloud-bound uploads together, then fan results out.
+    Each file is acknowledged once its result is stored; files of a batch that
+    did not finish stay leased and are parsed again by a later batch.
+    """
+    drained = _cloud_batch.drain(
+        settings.CLOUD_BATCH_MAX_FILES, settings.CLOUD_BATCH_LEASE_SECONDS
+    )
+    if not drained:
+        return
+    if _cloud_batch.pending():
+        run_parse_cloud_batch.delay()
+    left_leased = True
     try:
-        _s3_client.upload_file(temp_path, parsed_s3_key)
-        run_vectorize_file.delay(
-            VectorizeFileTaskPayload(
-                s3_key=parsed_s3_key,
-                collection_name=task.collection_name,
-            ).model_dump()
+        left_leased = _parse_cloud_batch(drained)
+    finally:
+        # Leased files only go back to the buffer on a drain; make sure one
+        # runs after their lease even if no other upload is buffered.
+        if left_leased:
+            run_parse_cloud_batch.apply_async(
+                countdown=settings.CLOUD_BATCH_LEASE_SECONDS
+            )
+
+
+def _parse_cloud_batch(drained: List[Tuple[bytes, dict]]) -> bool:
+    """Parse and store a drained batch; returns whether files were left leased."""
+    entries = [entry for entry, _ in drained]
+    tasks = [ParseFileTask.model_validate(payload) for _, payload in drained]
+    left_leased = False
+
+    with ThreadPoolExecutor(max_workers=settings.CLOUD_BATCH_NUM_WORKERS) as pool:
+        contents = list(pool.map(_read_object, [task.s3_key for task in tasks]))
+
+    batch: List[Tuple[bytes, ParseFileTask, Optional[str], bytes]] = []
+    for entry, task, data in zip(entries, tasks, contents, strict=True):
+        if data is None:
+            # Retried when its lease expires, unless the upload is gone.
+            if _s3_client.exists(task.s3_key):
+                left_leased = True
+            else:
+                _cloud_batch.ack(entry)
+            continue
+        sha256 = None
+        if settings.PARSE_DEDUP_ENABLED:
+            sha256 = hashlib.sha256(data).hexdigest()
+            if task.etag:
+                _artifact_index.remember_sha256(task.etag, len(data), sha256)
+            parsed_s3_key = _find_parsed_artifact(sha256, bool(task.force_ocr))
+            if parsed_s3_key:
+                logger.info("Dedup hit by content hash, reusing %s", parsed_s3_key)
+                _enqueue_vectorize(parsed_s3_key, task.collection_name, task.s3_key)
+                _cloud_batch.ack(entry)
+                continue
+        batch.append((entry, task, sha256, data))
+    if not batch:
+        return left_leased
+
+    results = _get_pipeline().run_cloud_batch(
+        [
+            (io.BytesIO(data), os.path.basename(task.s3_key))
+            for _, task, _, data in batch
+        ]
+    )
+    for (entry, task, sha256, _), documents in zip(batch, results, strict=True):
+        if not documents:
+            attempts = _cloud_batch.attempts(entry)
+            if attempts < settings.CLOUD_BATCH_MAX_ATTEMPTS:
+                logger.warning(
+                    "Cloud parse of %s returned nothing (attempt %s), retrying",
+                    task.s3_key,
+                    attempts,
+                )
+                left_leased = True
+                continue
+            logger.error(
+                "Cloud parse of %s returned nothing after %s attempts, giving up",
+                task.s3_key,
+                attempts,
+            )
+            _cloud_batch.ack(entry)
+            continue
+        try:
+            _store_parsed(task, documents, sha256)
+        except Exception as e:
+            logger.exception("Storing the result of %s failed: %s", task.s3_key, e)
+            left_leased = True
+            continue
+        _cloud_batch.ack(entry)
+    return left_leased
+
+
+def _part_artifact_key(part_s3_key: str) -> str:
+    return part_s3_key.removesuffix(".pdf") + _documents_service.artifact_extension()
+
+
+@app.task(bind=True)
+def run_parse_part(self, part_payload: dict) -> Optional[str]:
+    """Parse one part of a fanned out PDF, returning its artifact key."""
+    part = ParsePartTask.model_validate(part_payload)
+    local_input_path = os.path.join(
+        settings.TEMP_DIR, "inputs", part.s3_key.replace("/", "_")
+    )
+    _s3_client.download_file(part.s3_key, local_input_path)
+    documents = _get_pipeline().run(
+        ParseFilePipelinePayload(
+            local_input_path=local_input_path, force_ocr=part.force_ocr
         )
+    )
+    if not documents:
+        logger.error("Part %s returned empty content", part.s3_key)
+        return None
+
+    page_range = f"{part.first_page + 1}-{part.last_page + 1}"
+    for document in documents:
+        document.metadata["page_range"] = page_range
+    parsed_s3_key = _part_artifact_key(part.s3_key)
+    _put_documents(documents, parsed_s3_key)
+    return parsed_s3_key
+
+
+@app.task(bind=True)
+def run_merge_parts(
+    self, part_keys: List[Optional[str]], task_payload: dict, pdf_keys: List[str]
+):
+    """Chord callback: merge the parts of a fanned out PDF and store the result."""
+    task = ParseFileTask.model_validate(task_payload)
+    try:
+        if not all(part_keys):
+            logger.error(
+                "%s of %s parts of %s failed, aborting",
+                part_keys.count(None),
+                len(part_keys),
+                task.s3_key,
+            )
+            return
+        file_name = os.path.basename(task.s3_key)
+        documents = []
+        for key in part_keys:
+            documents.extend(_get_documents(key))
+        for document in documents:
+            document.metadata["file_name"] = file_name
+        _store_parsed(task, documents, task.sha256)
     finally:
-        os.unlink(temp_path)
+        _s3_client.delete_objects(pdf_keys + [key for key in part_keys if key])
+
+
+@app.task(bind=True)
+def run_fan_out_failed(
+    self, failed_task_id: str, task_payload: dict, pdf_keys: List[str]
+):
+    """
+    Chord error callback: a part of a fanned out PDF raised, so run_merge_parts
+    never runs. Records the failure and removes the staged parts.
+    """
+    task = ParseFileTask.model_validate(task_payload)
+    logger.error("A part of %s failed (task %s), aborting", task.s3_key, failed_task_id)
+    _s3_client.delete_objects(pdf_keys + [_part_artifact_key(key) for key in pdf_keys])
+
+
+_LANE_TASKS = {
+    "cloud": run_parse_cloud,
+    "local": run_parse_local,
+    "text": run_parse_text,
+}
+
+
+@app.task(bind=True)
+def run_parse_file(self, task_payload: dict):
+    """Run document ingestion: dedup and pre-route, then parse in a parser lane."""
+    task = ParseFileTask.model_validate(task_payload)
+    logger.info("Received task for parsing: s3_key=%s", task.s3_key)
+    force_ocr = bool(task.force_ocr)
+
+    if settings.PARSE_DEDUP_ENABLED:
+        head = _s3_client.head_object(task.s3_key)
+        task.etag = str(head["ETag"]).strip('"')
+        task.size = int(head["ContentLength"])
+        task.sha256 = _artifact_index.lookup_sha256(task.etag, task.size)
+        parsed_s3_key = task.sha256 and _find_parsed_artifact(task.sha256, force_ocr)
+        if parsed_s3_key:
+            logger.info("Dedup hit by ETag, reusing %s", parsed_s3_key)
+            _enqueue_vectorize(parsed_s3_key, task.collection_name, task.s3_key)
+            return
+
+    if settings.PRE_ROUTING_ENABLED:
+        task.file_info = _pre_routing.probe(task.s3_key, task.size)
+        if task.file_info:
+            logger.info(
+                "Pre-routed: mime=%s score=%s/100", task.file_info[1], task.file_info[0]
+            )
+
+    if not settings.PARSE_LANES_ENABLED:
+        _parse(task)
+        return
+    lane = parse_lane(task.file_info, force_ocr)
+    logger.info("Handing %s to the %s parser lane", task.s3_key, lane)
+    _LANE_TASKS[lane].delay(task.model_dump())
@@ -1,5 +1,6 @@
 import logging
 import os
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -21,6 +22,8 @@ _s3_client = S3Client()
 class VectorizeFileTaskPayload(BaseModel):
     s3_key: str
     collection_name: str
+    # Key of the original upload; identifies the document across re-indexes.
+    source_id: Optional[str] = None
 
 
 def _get_pipeline() -> VectorizeFilePipeline:
@@ -42,6 +45,8 @@ def run_vectorize_file(self, task_payload: dict):
     pipeline = _get_pipeline()
     pipeline.run(
         VectorizeFilePipelinePayload(
-            local_input_path=local_input_path, collection_name=task.collection_name
+            local_input_path=local_input_path,
+            collection_name=task.collection_name,
+            source_id=task.source_id or task.s3_key,
         )
     )
@@ -0,0 +1,20 @@
+"""
+Start a Celery worker for one queue with the pool and concurrency declared for
+it in TASK_QUEUES. Extra arguments are passed through to `celery worker`:
+
+  uv run python -m src.worker parse_text --loglevel=info
+"""
+
+import sys
+
+from src.celery_app import app, worker_argv
+
+
+def main(argv: list[str]) -> None:
+    if not argv:
+        sys.exit("usage: python -m src.worker <queue> [celery worker options]")
+    app.worker_main(worker_argv(argv[0]) + argv[1:])
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,34 @@
+"""Unit tests for the table fidelity metric of the parser benchmark."""
+
+import pytest
+
+from src.benchmark_parsers import cell_f1, table_cells
+
+_CLOUD = """
+# Revenue
+
+| Region | Q1 |
+|:-------|---:|
+| EU     | 10 |
+| US     | 12 |
+"""
+
+
+class TestBenchmarkParsers:
+    def test_table_cells_skips_separators_and_normalizes(self):
+        assert table_cells(_CLOUD) == {
+            "region": 1,
+            "q1": 1,
+            "eu": 1,
+            "10": 1,
+            "us": 1,
+            "12": 1,
+        }
+
+    def test_cell_f1(self):
+        reference = table_cells(_CLOUD)
+        assert cell_f1(reference, reference) == 1.0
+        partial = table_cells("| Region | Q1 |\n| EU | 10 |")
+        assert cell_f1(partial, reference) == pytest.approx(0.8)
+        assert cell_f1(table_cells("no tables"), reference) == 0.0
+        assert cell_f1(table_cells("no tables"), table_cells("none")) is None
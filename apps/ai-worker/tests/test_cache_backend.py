@@ -0,0 +1,86 @@
+"""Unit tests for the shared cache backends and SharedKVStore."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.core.cache_backend import (
+    RedisCacheBackend,
+    SharedKVStore,
+    SQLiteCacheBackend,
+)
+
+
+class TestSQLiteCacheBackend:
+    @pytest.fixture
+    def backend(self, temp_dir):
+        return SQLiteCacheBackend(str(temp_dir / "cache.sqlite3"))
+
+    def test_put_and_get_many(self, backend):
+        backend.put_many("ns", {"a": b"1", "b": b"2"})
+        assert backend.get_many("ns", ["a", "b", "c"]) == {"a": b"1", "b": b"2"}
+
+    def test_namespaces_are_isolated(self, backend):
+        backend.put("one", "k", b"1")
+        assert backend.get("two", "k") is None
+        assert backend.keys("one") == ["k"]
+
+    def test_expired_entries_are_not_returned(self, temp_dir):
+        backend = SQLiteCacheBackend(str(temp_dir / "ttl.sqlite3"), ttl_seconds=1)
+        backend.put("ns", "k", b"v")
+        backend._conn.execute("UPDATE cache SET expires_at = ?", (time.time() - 1,))
+        assert backend.get("ns", "k") is None
+        backend.evict("ns")
+        assert backend._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] == 0
+
+    def test_evict_keeps_most_recently_used(self, temp_dir):
+        backend = SQLiteCacheBackend(str(temp_dir / "lru.sqlite3"), max_entries=2)
+        backend.put_many("ns", {"a": b"1", "b": b"2", "c": b"3"})
+        backend._conn.execute("UPDATE cache SET accessed_at = 1 WHERE key = 'a'")
+        backend.evict("ns")
+        assert sorted(backend.keys("ns")) == ["b", "c"]
+
+    def test_delete(self, backend):
+        backend.put("ns", "k", b"v")
+        assert backend.delete("ns", "k") is True
+        assert backend.delete("ns", "k") is False
+
+    def test_is_shared_between_instances(self, temp_dir):
+        path = str(temp_dir / "shared.sqlite3")
+        SQLiteCacheBackend(path).put("ns", "k", b"v")
+        assert SQLiteCacheBackend(path).get("ns", "k") == b"v"
+
+
+class TestRedisCacheBackend:
+    def test_put_many_sets_ttl_and_get_many_uses_mget(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        backend = RedisCacheBackend(client, prefix="p", ttl_seconds=60)
+
+        backend.put_many("ns", {"k": b"v"})
+        pipe.set.assert_called_once_with("p:ns:k", b"v", ex=60)
+        pipe.execute.assert_called_once()
+
+        client.mget.return_value = [b"v", None]
+        assert backend.get_many("ns", ["k", "missing"]) == {"k": b"v"}
+        client.mget.assert_called_once_with(["p:ns:k", "p:ns:missing"])
+
+    def test_keys_strips_prefix(self):
+        client = MagicMock()
+        client.scan_iter.return_value = [b"p:ns:a", b"p:ns:b"]
+        backend = RedisCacheBackend(client, prefix="p")
+        assert backend.keys("ns") == ["a", "b"]
+
+
+class TestSharedKVStore:
+    def test_roundtrip_per_collection(self, temp_dir):
+        store = SharedKVStore(
+            SQLiteCacheBackend(str(temp_dir / "kv.sqlite3")), prefix="ingestion"
+        )
+        store.put("k", {"nodes": [1]}, collection="coll_a")
+
+        assert store.get("k", collection="coll_a") == {"nodes": [1]}
+        assert store.get("k", collection="coll_b") is None
+        assert store.get_all(collection="coll_a") == {"k": {"nodes": [1]}}
+        assert store.delete("k", collection="coll_a") is True
@@ -0,0 +1,61 @@
+"""Unit tests for CachedEmbedding (real SQLite backend, mock embedding model)."""
+
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+
+from src.core.cache_backend import SQLiteCacheBackend
+from src.model.cached_embedding import CachedEmbedding
+
+
+class CountingEmbedding(MockEmbedding):
+    calls: int = 0
+
+    def _get_text_embeddings(self, texts):
+        self.calls += len(texts)
+        return [[float(len(t)), 0.5, -1.0] for t in texts]
+
+
+class TestCachedEmbedding:
+    @pytest.fixture
+    def backend(self, temp_dir):
+        return SQLiteCacheBackend(str(temp_dir / "emb.sqlite3"))
+
+    @pytest.fixture
+    def inner(self):
+        return CountingEmbedding(embed_dim=3, model_name="test-model")
+
+    def test_second_pass_costs_no_model_calls(self, backend, inner):
+        texts = ["alpha", "beta", "alpha"]
+        first = CachedEmbedding(inner, provider="mock", backend=backend)
+        vectors = first.get_text_embedding_batch(texts)
+        assert inner.calls == 2  # duplicate text embedded once
+
+        # A new wrapper (e.g. another collection / task) reuses the cache.
+        second = CachedEmbedding(inner, provider="mock", backend=backend)
+        assert second.get_text_embedding_batch(texts) == vectors
+        assert inner.calls == 2
+        assert second.stats() == {"hits": 3, "misses": 0}
+
+    def test_key_ignores_whitespace_differences(self, backend, inner):
+        embedding = CachedEmbedding(inner, provider="mock", backend=backend)
+        embedding.get_text_embedding("hello   world\n")
+        embedding.get_text_embedding("hello world")
+        assert inner.calls == 1
+
+    def test_cache_is_keyed_by_provider_and_model(self, backend, inner):
+        CachedEmbedding(inner, provider="a", backend=backend).get_text_embedding("x")
+        CachedEmbedding(inner, provider="b", backend=backend).get_text_embedding("x")
+        assert inner.calls == 2
+
+    def test_float16_storage_roundtrip(self, backend, inner):
+        embedding = CachedEmbedding(
+            inner, provider="mock", backend=backend, dtype="float16"
+        )
+        embedding.get_text_embedding("abc")
+        (value,) = embedding.lookup(["abc"])
+        assert value == [3.0, 0.5, -1.0]
+
+    def test_query_embeddings_bypass_cache(self, backend, inner):
+        embedding = CachedEmbedding(inner, provider="mock", backend=backend)
+        assert len(embedding.get_query_embedding("q")) == 3
+        assert embedding.lookup(["q"]) == [None]
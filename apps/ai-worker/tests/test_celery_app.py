@@ -0,0 +1,28 @@
+"""Unit tests for the Celery app queue configuration."""
+
+import pytest
+
+from src.celery_app import TASK_QUEUES, app, worker_argv
+
+
+class TestTaskQueues:
+    def test_every_task_is_routed_to_its_queue(self):
+        for entry in TASK_QUEUES:
+            assert app.conf.task_routes[entry.task] == {"queue": entry.queue}
+
+    def test_parser_lanes_have_their_own_queues(self):
+        queues = {entry.task.rsplit(".", 1)[1]: entry.queue for entry in TASK_QUEUES}
+        lanes = [queues[f"run_parse_{lane}"] for lane in ("cloud", "local", "text")]
+        assert len(set(lanes + [queues["run_parse_file"]])) == 4
+
+    def test_worker_argv_uses_queue_pool_and_concurrency(self):
+        entry = next(e for e in TASK_QUEUES if e.task.endswith("run_parse_cloud"))
+        argv = worker_argv(entry.queue)
+        assert argv[:3] == ["worker", "-Q", entry.queue]
+        assert argv[argv.index("--pool") + 1] == entry.pool
+        if entry.concurrency:
+            assert argv[argv.index("--concurrency") + 1] == str(entry.concurrency)
+
+    def test_worker_argv_rejects_unknown_queue(self):
+        with pytest.raises(ValueError):
+            worker_argv("nope")
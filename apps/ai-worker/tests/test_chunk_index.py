@@ -0,0 +1,107 @@
+"""Unit tests for chunk hashing/ids and QdrantChunkIndex (mocked Qdrant)."""
+
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from llama_index.core.schema import (
+    MetadataMode,
+    NodeRelationship,
+    RelatedNodeInfo,
+    TextNode,
+)
+
+from src.services.chunk_index import (
+    CHUNK_HASH_KEY,
+    SOURCE_ID_KEY,
+    QdrantChunkIndex,
+    assign_chunk_ids,
+    chunk_hash,
+)
+
+
+def make_nodes(*texts):
+    return [TextNode(text=text, metadata={"page": 1}) for text in texts]
+
+
+class TestAssignChunkIds:
+    def test_ids_are_stable_across_runs(self):
+        first = assign_chunk_ids(make_nodes("a", "b"), "src/doc.pdf")
+        second = assign_chunk_ids(make_nodes("a", "b"), "src/doc.pdf")
+        assert first == second
+
+    def test_ids_depend_on_source_and_content(self):
+        (a,) = assign_chunk_ids(make_nodes("a"), "src/one.pdf")
+        (b,) = assign_chunk_ids(make_nodes("a"), "src/two.pdf")
+        (c,) = assign_chunk_ids(make_nodes("changed"), "src/one.pdf")
+        assert len({a, b, c}) == 3
+
+    def test_duplicate_chunks_get_distinct_ids(self):
+        ids = assign_chunk_ids(make_nodes("same", "same"), "src/doc.pdf")
+        assert len(set(ids)) == 2
+
+    def test_shared_counter_numbers_duplicates_across_calls(self):
+        seen = Counter()
+        (first,) = assign_chunk_ids(make_nodes("same"), "src/doc.pdf", seen)
+        (second,) = assign_chunk_ids(make_nodes("same"), "src/doc.pdf", seen)
+        assert [first, second] == assign_chunk_ids(
+            make_nodes("same", "same"), "src/doc.pdf"
+        )
+
+    def test_hash_and_source_are_hidden_from_embedding(self):
+        (node,) = make_nodes("text")
+        digest = chunk_hash(node)
+
+        assign_chunk_ids([node], "src/doc.pdf")
+
+        assert node.metadata[SOURCE_ID_KEY] == "src/doc.pdf"
+        assert node.metadata[CHUNK_HASH_KEY] == digest
+        assert chunk_hash(node) == digest
+        embed_text = node.get_content(metadata_mode=MetadataMode.EMBED)
+        assert "src/doc.pdf" not in embed_text
+        assert digest not in embed_text
+
+    def test_relationships_follow_new_ids(self):
+        first, second = make_nodes("a", "b")
+        first.relationships[NodeRelationship.NEXT] = RelatedNodeInfo(
+            node_id=second.node_id
+        )
+
+        assign_chunk_ids([first, second], "src/doc.pdf")
+
+        assert first.relationships[NodeRelationship.NEXT].node_id == second.node_id
+
+
+class TestQdrantChunkIndex:
+    @pytest.fixture
+    def client(self):
+        client = MagicMock()
+        client.collection_exists.return_value = True
+        return client
+
+    def test_existing_ids_scrolls_all_pages(self, client):
+        client.scroll.side_effect = [
+            ([SimpleNamespace(id="a"), SimpleNamespace(id="b")], "next"),
+            ([SimpleNamespace(id="c")], None),
+        ]
+        index = QdrantChunkIndex(client, "coll")
+
+        assert index.existing_ids("src/doc.pdf") == {"a", "b", "c"}
+        assert client.scroll.call_args_list[1].kwargs["offset"] == "next"
+        condition = client.scroll.call_args.kwargs["scroll_filter"].must[0]
+        assert condition.key == SOURCE_ID_KEY
+        assert condition.match.value == "src/doc.pdf"
+        client.create_payload_index.assert_called_once()
+
+    def test_existing_ids_for_missing_collection(self, client):
+        client.collection_exists.return_value = False
+        assert QdrantChunkIndex(client, "coll").existing_ids("src/doc.pdf") == set()
+        client.scroll.assert_not_called()
+
+    def test_delete_removes_points_by_id(self, client):
+        QdrantChunkIndex(client, "coll").delete({"a"})
+
+        kwargs = client.delete.call_args.kwargs
+        assert kwargs["collection_name"] == "coll"
+        assert kwargs["points_selector"].points == ["a"]
@@ -0,0 +1,90 @@
+"""Unit tests for CloudParseBatchBuffer."""
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.cloud_parse_batch import CloudParseBatchBuffer
+
+
+class TestCloudParseBatchBuffer:
+    def test_add_returns_buffered_files_and_bytes(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [3, 4096]
+        buffer = CloudParseBatchBuffer(client)
+
+        assert buffer.add({"s3_key": "inputs/a.png"}, 1024) == (3, 4096)
+        pipe = client.pipeline.return_value
+        entry = json.loads(pipe.rpush.call_args[0][1])
+        assert entry["payload"] == {"s3_key": "inputs/a.png"}
+        assert entry["size"] == 1024
+        pipe.incrby.assert_called_once_with(buffer._bytes_key, 1024)
+
+    def test_schedule_flush_is_claimed_once_per_window(self):
+        client = MagicMock()
+        client.set.side_effect = [True, None]
+        buffer = CloudParseBatchBuffer(client)
+
+        assert buffer.schedule_flush(10) is True
+        assert buffer.schedule_flush(10) is False
+        assert client.set.call_args.kwargs == {"nx": True, "ex": 20}
+
+    def test_drain_leases_payloads_until_acked(self):
+        client = MagicMock()
+        raw = [
+            json.dumps({"id": "1", "payload": {"s3_key": "a"}, "size": 10}).encode(),
+            json.dumps({"id": "2", "payload": {"s3_key": "b"}, "size": 5}).encode(),
+        ]
+        client.register_script.return_value.return_value = raw
+        buffer = CloudParseBatchBuffer(client)
+
+        drained = buffer.drain(50, lease_seconds=900)
+
+        assert drained == [(raw[0], {"s3_key": "a"}), (raw[1], {"s3_key": "b"})]
+        call = client.register_script.return_value.call_args.kwargs
+        assert call["keys"] == [
+            buffer._files_key,
+            buffer._processing_key,
+            buffer._bytes_key,
+            buffer._flush_key,
+            buffer._attempts_key,
+        ]
+        now, max_files, lease_until = call["args"]
+        assert max_files == 50
+        assert lease_until == pytest.approx(now + 900)
+        client.zrem.assert_not_called()
+
+        buffer.ack(raw[0])
+        pipe = client.pipeline.return_value
+        pipe.zrem.assert_called_once_with(buffer._processing_key, raw[0])
+        pipe.hdel.assert_called_once_with(buffer._attempts_key, "1")
+
+    def test_attempts_counts_the_leases_of_an_entry(self):
+        client = MagicMock()
+        client.hget.side_effect = [b"2", None]
+        buffer = CloudParseBatchBuffer(client)
+        entry = json.dumps({"id": "1", "payload": {}, "size": 1}).encode()
+
+        assert buffer.attempts(entry) == 2
+        assert buffer.attempts(entry) == 0
+        client.hget.assert_called_with(buffer._attempts_key, "1")
+
+    def test_entries_of_the_same_upload_stay_distinct(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = [1, 10]
+        buffer = CloudParseBatchBuffer(client)
+
+        buffer.add({"s3_key": "a"}, 10)
+        buffer.add({"s3_key": "a"}, 10)
+
+        first, second = (
+            c[0][1] for c in client.pipeline.return_value.rpush.call_args_list
+        )
+        assert first != second
+
+    def test_drain_of_empty_buffer(self):
+        client = MagicMock()
+        client.register_script.return_value.return_value = []
+
+        assert CloudParseBatchBuffer(client).drain(50, lease_seconds=900) == []
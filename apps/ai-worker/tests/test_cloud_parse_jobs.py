@@ -0,0 +1,142 @@
+"""Unit tests for CloudParseJobStore and CloudParseJobPoller."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.schema import Document
+
+from src.services.cloud_parse_jobs import (
+    CloudParseJob,
+    CloudParseJobFailed,
+    CloudParseJobPoller,
+    CloudParseJobStore,
+)
+
+
+@pytest.fixture
+def mock_settings():
+    with patch("src.services.cloud_parse_jobs.settings") as mock_settings:
+        mock_settings.CLOUD_PARSE_POLL_INTERVAL = 5.0
+        mock_settings.CLOUD_PARSE_POLL_MAX_INTERVAL = 60.0
+        mock_settings.CLOUD_PARSE_POLL_CONCURRENCY = 10
+        mock_settings.CLOUD_PARSE_LEASE_SECONDS = 300.0
+        mock_settings.CLOUD_PARSE_JOB_TIMEOUT = 3600.0
+        yield mock_settings
+
+
+class TestCloudParseJobStore:
+    def test_add_stores_record_and_schedules_first_poll(self, mock_settings):
+        client = MagicMock()
+        store = CloudParseJobStore(client)
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf", submitted_at=100.0)
+
+        store.add(job)
+
+        pipe = client.pipeline.return_value
+        key, raw = pipe.set.call_args[0]
+        assert key.endswith(":job:job-1")
+        assert CloudParseJob.model_validate_json(raw) == job
+        ((pending_key, scores),) = [c[0] for c in pipe.zadd.call_args_list]
+        assert scores["job-1"] > time.time()
+        pipe.execute.assert_called_once()
+
+    def test_claim_due_leases_jobs_and_drops_stale_entries(self, mock_settings):
+        client = MagicMock()
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf")
+        client.register_script.return_value.return_value = [b"job-1", b"gone"]
+        client.mget.return_value = [job.model_dump_json().encode(), None]
+        store = CloudParseJobStore(client)
+
+        jobs = store.claim_due(limit=50, lease_seconds=300)
+
+        assert jobs == [job]
+        claim_args = client.register_script.return_value.call_args.kwargs["args"]
+        assert claim_args[1] == 50
+        assert claim_args[2] == pytest.approx(claim_args[0] + 300)
+        client.zrem.assert_called_once_with(store._pending_key, "gone")
+
+
+class TestCloudParseJobPoller:
+    def _poller(self, jobs, fetch):
+        store = MagicMock()
+        store.claim_due.return_value = jobs
+        on_complete = MagicMock()
+        return CloudParseJobPoller(store, fetch, on_complete), store, on_complete
+
+    def test_finished_job_is_completed_and_removed(self, mock_settings):
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf")
+        docs = [Document(text="parsed")]
+
+        async def fetch(j):
+            return docs
+
+        poller, store, on_complete = self._poller([job], fetch)
+
+        assert asyncio.run(poller.poll_once()) == 1
+        on_complete.assert_called_once_with(job, docs)
+        store.remove.assert_called_once_with("job-1")
+
+    def test_pending_job_is_polled_again_later(self, mock_settings):
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf")
+
+        async def fetch(j):
+            return None
+
+        poller, store, on_complete = self._poller([job], fetch)
+
+        assert asyncio.run(poller.poll_once()) == 0
+        on_complete.assert_not_called()
+        store.remove.assert_not_called()
+        store.reschedule.assert_called_once_with("job-1", 5.0)
+
+    def test_poll_delay_grows_with_job_age(self, mock_settings):
+        poller, _, _ = self._poller([], None)
+        old = CloudParseJob(job_id="1", file_name="a", submitted_at=time.time() - 300)
+        ancient = CloudParseJob(
+            job_id="2", file_name="a", submitted_at=time.time() - 3000
+        )
+
+        assert poller._next_delay(old) == pytest.approx(30.0, abs=1)
+        assert poller._next_delay(ancient) == 60.0
+
+    def test_failed_job_is_dropped(self, mock_settings):
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf")
+
+        async def fetch(j):
+            raise CloudParseJobFailed("ERROR")
+
+        poller, store, on_complete = self._poller([job], fetch)
+
+        asyncio.run(poller.poll_once())
+        on_complete.assert_not_called()
+        store.remove.assert_called_once_with("job-1")
+
+    def test_transient_error_reschedules_until_timeout(self, mock_settings):
+        fresh = CloudParseJob(job_id="fresh", file_name="a.pdf")
+        stale = CloudParseJob(
+            job_id="stale", file_name="b.pdf", submitted_at=time.time() - 7200
+        )
+
+        async def fetch(j):
+            raise ConnectionError("reset")
+
+        poller, store, _ = self._poller([fresh, stale], fetch)
+
+        asyncio.run(poller.poll_once())
+        store.reschedule.assert_called_once()
+        assert store.reschedule.call_args[0][0] == "fresh"
+        store.remove.assert_called_once_with("stale")
+
+    def test_failed_completion_keeps_job_for_retry(self, mock_settings):
+        job = CloudParseJob(job_id="job-1", file_name="a.pdf")
+
+        async def fetch(j):
+            return [Document(text="parsed")]
+
+        poller, store, on_complete = self._poller([job], fetch)
+        on_complete.side_effect = RuntimeError("S3 down")
+
+        assert asyncio.run(poller.poll_once()) == 0
+        store.remove.assert_not_called()
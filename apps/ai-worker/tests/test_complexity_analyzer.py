@@ -1,11 +1,13 @@
 """Unit tests for DocumentComplexityAnalyzer."""
 
+import os
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import fitz
 import pytest
 
-from src.services.complexity_analyzer import DocumentComplexityAnalyzer
+from src.services.complexity_analyzer import DocumentComplexityAnalyzer, PdfAnalysis
 
 
 class TestDocumentComplexityAnalyzer:
@@ -62,7 +64,7 @@ class TestDocumentComplexityAnalyzer:
             analyzer, "_score_pdf", return_value=25
         ) as mock_score_pdf:
             score, mime, is_complex = analyzer.get_file_info(str(path))
-            mock_score_pdf.assert_called_once_with(str(path))
+            mock_score_pdf.assert_called_once_with(str(path), None)
             assert score == 25
             assert mime == "application/pdf"
             assert is_complex is False
@@ -202,6 +204,73 @@ class TestDocumentComplexityAnalyzer:
             score = analyzer._score_pdf(str(path))
             assert score == 100
 
+    # --- per-page classification ---
+    def test_classify_pdf_pages_flags_scanned_pages(self, analyzer, temp_dir):
+        path = temp_dir / "mixed.pdf"
+        doc = fitz.open()
+        for text in ["Plenty of extractable text on this page. " * 3, "", "x" * 80]:
+            page = doc.new_page()
+            if text:
+                page.insert_text((72, 72), text)
+        doc.save(str(path))
+        doc.close()
+
+        assert analyzer.classify_pdf_pages(str(path)) == [False, True, False]
+
+    @pytest.mark.parametrize(
+        "page_count, samples, expected",
+        [
+            (2, 3, [0, 1]),
+            (3, 3, [0, 1, 2]),
+            (2000, 3, [0, 1000, 1999]),
+            (10, 1, [0]),
+        ],
+    )
+    def test_sample_pages_spreads_across_document(
+        self, analyzer, page_count, samples, expected
+    ):
+        assert analyzer.sample_pages(page_count, samples) == expected
+
+    def test_score_pdf_samples_pages_and_reuses_shared_analysis(
+        self, analyzer, temp_dir
+    ):
+        path = temp_dir / "long.pdf"
+        doc = fitz.open()
+        for i in range(9):
+            doc.new_page().insert_text((72, 72), f"Page {i} with enough text. " * 3)
+        doc.save(str(path))
+        doc.close()
+
+        with PdfAnalysis(str(path)) as pdf:
+            with patch.object(
+                analyzer, "_score_page", wraps=analyzer._score_page
+            ) as mock_score_page:
+                assert analyzer._score_pdf(str(path), pdf) <= 40
+                assert sorted(pdf.page_scores) == [0, 4, 8]
+                assert not pdf.doc.is_closed
+
+                assert analyzer.classify_pdf_pages(str(path), pdf) == [False] * 9
+            assert mock_score_page.call_count == 9
+
+    def test_score_page_skips_drawings_of_huge_content_streams(self, analyzer):
+        page = MagicMock()
+        page.get_text.return_value = "a" * 100
+        page.read_contents.return_value = b"0" * (1024 * 1024)
+        page.get_images.return_value = []
+
+        assert analyzer._score_page(page) == 40
+        page.get_cdrawings.assert_not_called()
+
+    def test_page_segments_groups_runs_of_pages(self, analyzer):
+        flags = [False, False, True, True, False, True]
+        assert analyzer.page_segments(flags) == [
+            (0, 1, False),
+            (2, 3, True),
+            (4, 4, False),
+            (5, 5, True),
+        ]
+        assert analyzer.page_segments([]) == []
+
     # --- _score_office_xml (mocked zipfile) ---
     def test_score_office_xml_zero_when_no_charts_or_embeddings(
         self, analyzer, temp_dir
@@ -278,3 +347,101 @@ class TestDocumentComplexityAnalyzer:
             mock_office.assert_called_once_with(str(path))
             assert score == 60
             assert is_complex is True
+
+    # --- get_header_info (pre-routing from partial reads) ---
+    @staticmethod
+    def _zip_bytes(names):
+        import io
+        import zipfile
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as z:
+            for name in names:
+                z.writestr(name, "x" * 2000)
+        return buffer.getvalue()
+
+    def test_zip_entry_names_reads_central_directory(self, analyzer):
+        data = self._zip_bytes(["word/document.xml", "word/charts/chart1.xml"])
+        assert analyzer.zip_entry_names(data[-1024:]) == [
+            "word/document.xml",
+            "word/charts/chart1.xml",
+        ]
+
+    def test_zip_entry_names_none_when_tail_too_short(self, analyzer):
+        data = self._zip_bytes([f"word/part{i}.xml" for i in range(20)])
+        assert analyzer.zip_entry_names(data[-100:]) is None
+        assert analyzer.zip_entry_names(b"no zip here") is None
+
+    def test_get_header_info_scores_plain_zip_as_office_document(self, analyzer):
+        data = self._zip_bytes(["word/document.xml", "word/charts/chart1.xml"])
+        with patch(
+            "src.services.complexity_analyzer.magic.from_buffer",
+            return_value="application/zip",
+        ):
+            score, mime, is_complex = analyzer.get_header_info(
+                data[:64], lambda: data[-4096:]
+            )
+        assert mime.endswith("wordprocessingml.document")
+        assert score == 50
+        assert is_complex is True
+
+    def test_get_header_info_needs_full_file_for_pdf(self, analyzer):
+        read_tail = MagicMock()
+        with patch(
+            "src.services.complexity_analyzer.magic.from_buffer",
+            return_value="application/pdf",
+        ):
+            assert analyzer.get_header_info(b"%PDF-1.7", read_tail) is None
+            assert (
+                analyzer.get_header_info(
+                    b"%PDF-1.7", read_tail, read_pdf_sample=lambda: None
+                )
+                is None
+            )
+        read_tail.assert_not_called()
+
+    @staticmethod
+    def _pdf_sample(pages, scanned, head_bytes):
+        doc = fitz.open()
+        for i in range(pages):
+            page = doc.new_page()
+            if scanned:
+                noise = fitz.Pixmap(fitz.csGRAY, 200, 200, os.urandom(200 * 200), 0)
+                page.insert_image(page.rect, pixmap=noise)
+            else:
+                page.insert_text((72, 72), f"Page {i + 1} " + "text " * 20)
+        data = doc.tobytes()
+        doc.close()
+        assert len(data) > head_bytes + 4096
+        return data[:head_bytes] + b"\n" + data[-4096:]
+
+    def test_get_header_info_routes_scanned_pdf_from_sample(self, analyzer):
+        sample = self._pdf_sample(10, scanned=True, head_bytes=100_000)
+        with patch(
+            "src.services.complexity_analyzer.magic.from_buffer",
+            return_value="application/pdf",
+        ):
+            assert analyzer.get_header_info(
+                b"%PDF-1.7", MagicMock(), read_pdf_sample=lambda: sample
+            ) == [100, "application/pdf", True]
+
+    def test_score_pdf_sample_leaves_text_pdf_to_full_analysis(self, analyzer):
+        sample = self._pdf_sample(300, scanned=False, head_bytes=16_000)
+        assert analyzer.score_pdf_sample(sample) is None
+
+    def test_score_pdf_sample_of_unreadable_bytes(self, analyzer):
+        assert analyzer.score_pdf_sample(b"%PDF-1.7 truncated") is None
+
+    def test_get_header_info_routes_text_and_images_without_tail(self, analyzer):
+        read_tail = MagicMock()
+        assert analyzer.get_header_info(b"hello, world\n", read_tail) == [
+            0,
+            "text/plain",
+            False,
+        ]
+        with patch(
+            "src.services.complexity_analyzer.magic.from_buffer",
+            return_value="image/png",
+        ):
+            assert analyzer.get_header_info(b"\x89PNG", read_tail)[2] is True
+        read_tail.assert_not_called()
@@ -0,0 +1,36 @@
+"""Unit tests for ContentFingerprintService."""
+
+import hashlib
+import io
+
+from src.services.content_fingerprint import ContentFingerprintService, HashingReader
+
+
+class TestContentFingerprintService:
+    def test_sha256_file_matches_hashlib(self, temp_dir):
+        path = temp_dir / "blob.bin"
+        data = b"x" * (3 * 1024 * 1024 + 17)
+        path.write_bytes(data)
+
+        service = ContentFingerprintService()
+
+        assert service.sha256_file(str(path)) == hashlib.sha256(data).hexdigest()
+
+    def test_from_file_keeps_size_and_etag(self, fixtures_dir):
+        path = fixtures_dir / "sample.txt"
+        fingerprint = ContentFingerprintService().from_file(
+            str(path), size=path.stat().st_size, etag="abc"
+        )
+        assert fingerprint.etag == "abc"
+        assert fingerprint.size == path.stat().st_size
+        assert len(fingerprint.sha256) == 64
+
+
+class TestHashingReader:
+    def test_hashes_everything_read_through_a_buffered_reader(self):
+        data = b"y" * (200 * 1024 + 3)
+        reader = HashingReader(io.BytesIO(data))
+
+        assert io.BufferedReader(reader).read() == data
+        assert reader.bytes_read == len(data)
+        assert reader.hexdigest() == hashlib.sha256(data).hexdigest()
@@ -1,10 +1,15 @@
 """Unit tests for DocumentsService."""
 
+import gzip
+import io
 from typing import List
+from unittest.mock import patch
 
+import pytest
 from llama_index.core.schema import Document
 
-from src.services.documents_service import DocumentsService
+from src.services import documents_service as documents_module
+from src.services.documents_service import DocumentsService, SpooledDocuments
 
 
 class TestDocumentsService:
@@ -32,3 +37,77 @@ class TestDocumentsService:
         json_str = service.to_json([doc])
         restored = service.from_json(json_str)
         assert restored[0].text == "Café naïve"
+
+    @pytest.mark.parametrize("codec", ["gzip", "zstd"])
+    def test_write_read_documents_roundtrip(
+        self, codec, sample_documents: List[Document]
+    ):
+        if codec == "zstd" and documents_module.zstandard is None:
+            pytest.skip("zstandard is not installed")
+        service = DocumentsService()
+        buffer = io.BytesIO()
+
+        count = service.write_documents(iter(sample_documents), buffer, codec=codec)
+
+        assert count == len(sample_documents)
+        assert not buffer.closed
+        buffer.seek(0)
+        restored = list(service.read_documents(buffer))
+        assert [d.text for d in restored] == [d.text for d in sample_documents]
+        assert [d.metadata for d in restored] == [d.metadata for d in sample_documents]
+
+    def test_artifact_is_versioned_jsonl(self, sample_documents: List[Document]):
+        buffer = io.BytesIO()
+        DocumentsService().write_documents(sample_documents, buffer, codec="gzip")
+
+        lines = gzip.decompress(buffer.getvalue()).decode().splitlines()
+        assert lines[0] == ('{"format": "omni.parsed-documents", "version": 1}')
+        assert len(lines) == 1 + len(sample_documents)
+
+    def test_read_documents_accepts_legacy_json(
+        self, sample_documents_json, sample_documents: List[Document]
+    ):
+        buffer = io.BytesIO(sample_documents_json.encode())
+        restored = list(DocumentsService().read_documents(buffer))
+        assert [d.text for d in restored] == [d.text for d in sample_documents]
+
+    def test_read_documents_rejects_newer_versions(self):
+        buffer = io.BytesIO(
+            gzip.compress(b'{"format": "omni.parsed-documents", "version": 99}\n')
+        )
+        with pytest.raises(ValueError, match="Unsupported artifact version"):
+            list(DocumentsService().read_documents(buffer))
+
+    def test_zstd_falls_back_to_gzip_when_unavailable(self):
+        with patch.object(documents_module, "zstandard", None):
+            service = DocumentsService()
+            assert service.resolve_codec("zstd") == "gzip"
+            assert service.artifact_extension("zstd") == ".jsonl.gz"
+
+    def test_iter_documents_reads_file(
+        self, temp_dir, sample_documents: List[Document]
+    ):
+        path = temp_dir / "parsed.jsonl.gz"
+        with open(path, "wb") as f:
+            DocumentsService().write_documents(sample_documents, f, codec="gzip")
+        restored = list(DocumentsService().iter_documents(str(path)))
+        assert len(restored) == len(sample_documents)
+
+    def test_spooled_documents_can_be_iterated_repeatedly(
+        self, sample_documents: List[Document]
+    ):
+        spooled = SpooledDocuments(iter(sample_documents), max_size=16)
+
+        assert len(spooled) == 2
+        assert bool(spooled)
+        for _ in range(2):
+            assert [d.text for d in spooled] == [d.text for d in sample_documents]
+        assert not SpooledDocuments([])
+
+    def test_spooled_documents_close_on_leaving_the_block(
+        self, sample_documents: List[Document]
+    ):
+        with SpooledDocuments(iter(sample_documents)) as spooled:
+            assert len(spooled) == 2
+
+        assert spooled._file.closed
@@ -0,0 +1,133 @@
+"""Unit tests for EmbeddingScheduler and ScheduledEmbedding."""
+
+import threading
+import time
+
+import pytest
+from llama_index.core.embeddings import MockEmbedding
+
+from src.model.scheduled_embedding import ScheduledEmbedding
+from src.services.embedding_scheduler import (
+    EmbeddingScheduler,
+    estimate_tokens,
+    is_throttle_error,
+)
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+def fake_embed(texts):
+    return [[float(len(t))] for t in texts]
+
+
+def make_scheduler(**kwargs):
+    params = {
+        "provider": "test",
+        "token_budget": 1000,
+        "max_batch_items": 100,
+        "max_concurrency": 4,
+        "base_backoff": 0,
+    }
+    params.update(kwargs)
+    return EmbeddingScheduler(**params)
+
+
+class TestEmbeddingScheduler:
+    def test_batches_by_token_budget(self):
+        calls = []
+        scheduler = make_scheduler(token_budget=250, max_concurrency=1)
+        texts = ["a" * 400] * 5  # ~101 tokens each -> 2 per batch
+
+        result = scheduler.embed(lambda b: calls.append(len(b)) or fake_embed(b), texts)
+
+        assert calls == [2, 2, 1]
+        assert result == [[400.0]] * 5
+
+    def test_batches_respect_max_items(self):
+        calls = []
+        scheduler = make_scheduler(max_batch_items=3, max_concurrency=1)
+        scheduler.embed(lambda b: calls.append(len(b)) or fake_embed(b), ["x"] * 7)
+        assert calls == [3, 3, 1]
+
+    def test_keeps_multiple_requests_in_flight(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_embed(batch):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+            return fake_embed(batch)
+
+        scheduler = make_scheduler(max_batch_items=1, max_concurrency=4)
+        result = scheduler.embed(slow_embed, [str(i) for i in range(8)])
+
+        assert peak > 1
+        assert result == [[1.0]] * 8
+
+    def test_backs_off_and_retries_on_rate_limit(self):
+        attempts = []
+
+        def flaky_embed(batch):
+            attempts.append(len(batch))
+            if len(attempts) == 1:
+                raise RateLimited("429 Too Many Requests")
+            return fake_embed(batch)
+
+        scheduler = make_scheduler(max_concurrency=4, max_batch_items=10)
+        texts = ["ab"] * 4
+
+        result = scheduler.embed(flaky_embed, texts)
+
+        assert result == [[2.0]] * 4
+        assert attempts[0] == 4
+        assert sorted(attempts[1:]) == [2, 2]  # failed batch split in half
+        assert scheduler.concurrency == 2
+        assert scheduler.token_budget == 512
+
+    def test_grows_back_when_healthy(self):
+        scheduler = make_scheduler(max_concurrency=4, grow_after=1)
+        scheduler.concurrency = 1
+        scheduler.token_budget = 600
+        scheduler.embed(fake_embed, ["x"])
+        assert scheduler.concurrency == 2
+        assert scheduler.token_budget == 750
+
+    def test_non_throttle_errors_propagate(self):
+        def broken(batch):
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError, match="bad input"):
+            make_scheduler().embed(broken, ["x"])
+
+    def test_reports_tokens_per_second(self):
+        scheduler = make_scheduler()
+        scheduler.embed(fake_embed, ["a" * 40] * 3)
+        stats = scheduler.stats()
+        assert stats["provider"] == "test"
+        assert stats["tokens"] == 3 * estimate_tokens("a" * 40)
+        assert stats["tokens_per_sec"] > 0
+
+    def test_is_throttle_error(self):
+        assert is_throttle_error(RateLimited())
+        assert is_throttle_error(TimeoutError())
+        assert is_throttle_error(Exception("429 RESOURCE_EXHAUSTED"))
+        assert not is_throttle_error(ValueError("invalid argument"))
+
+
+class TestScheduledEmbedding:
+    def test_batch_goes_through_scheduler(self):
+        scheduler = make_scheduler(max_batch_items=2)
+        embedding = ScheduledEmbedding(MockEmbedding(embed_dim=3), scheduler=scheduler)
+
+        vectors = embedding.get_text_embedding_batch(["a", "b", "c"])
+
+        assert len(vectors) == 3
+        assert scheduler.stats()["tokens"] == 3
@@ -1,12 +1,22 @@
 """Unit tests for FileParsingService (routing and local paths: text, CSV)."""
 
+import asyncio
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import billiard
+import fitz
+import httpx
+import pymupdf4llm
 import pytest
 from llama_index.core.schema import Document
 
-from src.services.file_parsing_service import FileParsingService
+from src.services.cloud_parse_jobs import CloudParseJobFailed
+from src.services.file_parsing_service import FileParsingService, _shard_workers
+from src.services.tabular_reader import TabularReader
 
 
 class TestFileParsingService:
@@ -19,7 +29,33 @@ class TestFileParsingService:
         ), patch(
             "src.services.file_parsing_service.settings"
         ) as mock_settings:
-            mock_settings.LLAMA_CLOUD_KEY = MagicMock(get_secret_value=MagicMock(return_value="fake"))
+            mock_settings.LLAMA_CLOUD_KEY = MagicMock(
+                get_secret_value=MagicMock(return_value="fake")
+            )
+            mock_settings.PARSER_VERSION = "1"
+            mock_settings.PARSE_CACHE_ENABLED = False
+            mock_settings.TABULAR_PARQUET_ENABLED = False
+            yield FileParsingService()
+
+    @pytest.fixture
+    def cached_service(self):
+        with patch(
+            "src.services.file_parsing_service.LlamaParse",
+        ), patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.ParseCache",
+        ) as mock_cache_cls:
+            mock_settings.LLAMA_CLOUD_KEY = MagicMock(
+                get_secret_value=MagicMock(return_value="fake")
+            )
+            mock_settings.PARSER_VERSION = "1"
+            mock_settings.PARSE_CACHE_ENABLED = True
+            mock_settings.PDF_MIXED_MODE = False
+            mock_settings.TABULAR_PARQUET_ENABLED = False
+            mock_cache_cls.make_key.side_effect = (
+                lambda sha, route, cfg: f"{sha}:{route}"
+            )
             yield FileParsingService()
 
     def test_parse_file_routes_text_to_local_io(self, service, fixtures_dir):
@@ -44,7 +80,7 @@ class TestFileParsingService:
             "get_file_info",
             return_value=(0, "application/csv", False),
         ):
-            docs = service.parse_file(str(path), force_ocr=False)
+            docs = list(service.parse_file(str(path), force_ocr=False))
         assert len(docs) == 1
         assert "name" in docs[0].text and "alpha" in docs[0].text
         assert docs[0].metadata["parsing_method"] == "pandas_local"
@@ -65,6 +101,112 @@ class TestFileParsingService:
         assert len(docs) == 1
         assert docs[0].text == "cloud"
 
+    def test_csv_is_emitted_as_row_chunks_repeating_the_header(
+        self, service, fixtures_dir
+    ):
+        service._tabular_reader = TabularReader(chunk_rows=2)
+
+        docs = list(service._parse_csv_local(str(fixtures_dir / "sample.csv")))
+
+        assert len(docs) == 2
+        assert docs[1].text.startswith("# Data File: sample.csv | Rows: 3-3")
+        assert "| name   |   value | category   |" in docs[1].text
+        assert "gamma" in docs[1].text and "alpha" not in docs[1].text
+        assert (docs[0].metadata["row_start"], docs[0].metadata["row_end"]) == (1, 2)
+        assert docs[1].metadata["file_type"] == "tabular"
+
+    def test_tabular_documents_link_their_parquet_sidecar(self, service, fixtures_dir):
+        service._tabular_reader = TabularReader(chunk_rows=2)
+        service._s3_client = MagicMock()
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.parquet_available", return_value=True
+        ), patch(
+            "src.services.file_parsing_service.ParquetSidecars"
+        ) as mock_sidecars_cls:
+            mock_settings.TABULAR_PARQUET_ENABLED = True
+            sidecars = mock_sidecars_cls.return_value
+            sidecars.failed = set()
+            sidecars.s3_key.return_value = "parsed-tables/abc-1/table.parquet"
+            sidecars.upload.return_value = {
+                None: "parsed-tables/abc-1/table.parquet"
+            }
+
+            docs = list(service._parse_csv_local(str(fixtures_dir / "sample.csv")))
+
+        assert [d.metadata["parquet_s3_key"] for d in docs] == [
+            "parsed-tables/abc-1/table.parquet"
+        ] * 2
+        sample = fixtures_dir / "sample.csv"
+        mock_sidecars_cls.assert_called_once_with(
+            str(sample), hashlib.sha256(sample.read_bytes()).hexdigest()
+        )
+        assert sidecars.write.call_count == 2
+        sidecars.upload.assert_called_once_with(service._s3_client)
+        sidecars.close.assert_called_once()
+
+    def test_dropped_parquet_sidecar_is_unlinked_from_earlier_chunks(
+        self, service, fixtures_dir
+    ):
+        service._tabular_reader = TabularReader(chunk_rows=2)
+        service._s3_client = MagicMock()
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.parquet_available", return_value=True
+        ), patch(
+            "src.services.file_parsing_service.ParquetSidecars"
+        ) as mock_sidecars_cls:
+            mock_settings.TABULAR_PARQUET_ENABLED = True
+            sidecars = mock_sidecars_cls.return_value
+            sidecars.failed = set()
+            # The second chunk (one row) does not fit the schema of the first.
+            sidecars.write.side_effect = lambda sheet, df: (
+                sidecars.failed.add(sheet) if len(df) == 1 else None
+            )
+            sidecars.s3_key.return_value = "parsed-tables/abc-1/table.parquet"
+            sidecars.upload.return_value = {}
+
+            docs = list(service._parse_csv_local(str(fixtures_dir / "sample.csv")))
+
+        assert len(docs) == 2
+        assert all("parquet_s3_key" not in d.metadata for d in docs)
+
+    def test_failed_sidecar_upload_does_not_fail_the_parse(
+        self, service, fixtures_dir, temp_dir
+    ):
+        pytest.importorskip("pyarrow.parquet")
+        service._tabular_reader = TabularReader(chunk_rows=2)
+        service._s3_client = MagicMock()
+        service._s3_client.upload_file.side_effect = httpx.ConnectError("down")
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.parquet_sidecar.settings"
+        ) as sidecar_settings:
+            mock_settings.TABULAR_PARQUET_ENABLED = True
+            sidecar_settings.TEMP_DIR = str(temp_dir)
+            sidecar_settings.TABULAR_PARQUET_S3_PREFIX = "parsed-tables"
+
+            docs = list(service._parse_csv_local(str(fixtures_dir / "sample.csv")))
+
+        assert len(docs) == 2
+        assert all("parquet_s3_key" not in d.metadata for d in docs)
+        assert list(temp_dir.glob("*.parquet")) == []
+
+    def test_tabular_results_skip_the_parse_cache(self, cached_service, fixtures_dir):
+        with patch.object(
+            cached_service._file_analyzer,
+            "get_file_info",
+            return_value=(0, "application/csv", False),
+        ):
+            docs = cached_service.parse_file(str(fixtures_dir / "sample.csv"))
+
+        assert len(docs) == 1
+        cached_service._parse_cache.get.assert_not_called()
+        cached_service._parse_cache.put.assert_not_called()
+
     def test_read_text_file_returns_document_with_content(self, service, fixtures_dir):
         """read_text_file reads file and returns one Document."""
         path = fixtures_dir / "sample.txt"
@@ -72,3 +214,421 @@ class TestFileParsingService:
         assert len(docs) == 1
         assert docs[0].metadata["file_type"] == "text"
         assert "Hello world" in docs[0].text
+
+    def test_parse_file_returns_cached_documents_without_parsing(
+        self, cached_service, fixtures_dir
+    ):
+        path = fixtures_dir / "sample.txt"
+        cached_service._parse_cache.get.return_value = [
+            Document(text="cached", metadata={"file_name": "other.txt"})
+        ]
+        with patch.object(
+            cached_service._file_analyzer,
+            "get_file_info",
+            return_value=(100, "application/pdf", True),
+        ), patch.object(cached_service, "_parse_cloud") as mock_cloud:
+            docs = cached_service.parse_file(str(path))
+
+        mock_cloud.assert_not_called()
+        cache_key = cached_service._parse_cache.get.call_args[0][0]
+        assert cache_key.endswith(":cloud")
+        assert docs[0].text == "cached"
+        assert docs[0].metadata["file_name"] == "sample.txt"
+
+    def test_parse_file_stores_result_on_cache_miss(
+        self, cached_service, fixtures_dir
+    ):
+        path = fixtures_dir / "sample.txt"
+        cached_service._parse_cache.get.return_value = None
+        with patch.object(
+            cached_service._file_analyzer,
+            "get_file_info",
+            return_value=(0, "text/plain", False),
+        ):
+            docs = cached_service.parse_file(str(path))
+
+        cache_key = cached_service._parse_cache.get.call_args[0][0]
+        assert cache_key.endswith(":text")
+        cached_service._parse_cache.put.assert_called_once_with(cache_key, docs)
+
+    def test_parse_file_uses_given_file_info(self, service, fixtures_dir):
+        path = fixtures_dir / "sample.txt"
+        with patch.object(service._file_analyzer, "get_file_info") as mock_info:
+            docs = service.parse_file(
+                str(path), file_info=(0, "text/plain", False)
+            )
+        mock_info.assert_not_called()
+        assert docs[0].metadata["parsing_method"] == "local_io"
+
+    def test_parse_cloud_stream_uploads_file_object(self, service):
+        stream = MagicMock()
+
+        async def aload_data(file_input, extra_info):
+            return [Document(text="cloud", metadata={})]
+
+        service._llama_parser.aload_data.side_effect = aload_data
+
+        docs = service.parse_cloud_stream(stream, "scan.pdf")
+
+        service._llama_parser.aload_data.assert_called_once_with(
+            stream, extra_info={"file_name": "scan.pdf"}
+        )
+        assert docs[0].metadata["file_name"] == "scan.pdf"
+        assert docs[0].metadata["parsing_method"] == "llama_parse_cloud"
+
+    def test_submit_cloud_job_returns_job_id_without_waiting(self, service):
+        stream = MagicMock()
+
+        async def create_job(file_input, extra_info):
+            return "job-1"
+
+        service._llama_parser._create_job.side_effect = create_job
+
+        assert service.submit_cloud_job(stream, "scan.pdf") == "job-1"
+        service._llama_parser._create_job.assert_called_once_with(
+            stream, extra_info={"file_name": "scan.pdf"}
+        )
+        service._llama_parser.load_data.assert_not_called()
+
+    def test_cloud_calls_do_not_share_http_clients(self, service):
+        """Each call (own thread, own event loop) gets a new, closed client."""
+        clients = []
+
+        def cloud_parser(client=None):
+            clients.append(client)
+            parser = MagicMock()
+            parser.aload_data.side_effect = lambda *args, **kwargs: asyncio.sleep(
+                0, [Document(text="cloud", metadata={})]
+            )
+            return parser
+
+        with patch.object(service, "_cloud_parser", side_effect=cloud_parser):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(
+                    pool.map(
+                        lambda name: service.parse_cloud_stream(io.BytesIO(), name),
+                        ["a.pdf", "b.pdf"],
+                    )
+                )
+            service.parse_cloud_batch([(io.BytesIO(), "c.png")], num_workers=1)
+
+        assert len(clients) == 3
+        assert len({id(client) for client in clients}) == 3
+        assert all(client.is_closed for client in clients)
+
+    def _cloud_client(self, statuses):
+        def handler(request):
+            if request.url.path.endswith("/result/markdown"):
+                return httpx.Response(200, json={"markdown": "# Parsed"})
+            return httpx.Response(200, json={"status": statuses.pop(0)})
+
+        return httpx.AsyncClient(
+            base_url="https://cloud.test", transport=httpx.MockTransport(handler)
+        )
+
+    def test_fetch_cloud_job_returns_none_while_pending(self, service):
+        client = self._cloud_client(["PENDING"])
+
+        docs = asyncio.run(service.fetch_cloud_job(client, "job-1", "scan.pdf"))
+
+        assert docs is None
+
+    def test_fetch_cloud_job_returns_tagged_documents(self, service):
+        client = self._cloud_client(["SUCCESS"])
+
+        docs = asyncio.run(service.fetch_cloud_job(client, "job-1", "scan.pdf"))
+
+        assert docs[0].text == "# Parsed"
+        assert docs[0].metadata["file_name"] == "scan.pdf"
+        assert docs[0].metadata["parsing_method"] == "llama_parse_cloud"
+
+    def test_fetch_cloud_job_keeps_partially_parsed_documents(self, service):
+        client = self._cloud_client(["PARTIAL_SUCCESS"])
+
+        docs = asyncio.run(service.fetch_cloud_job(client, "job-1", "scan.pdf"))
+
+        assert docs[0].text == "# Parsed"
+
+    def test_fetch_cloud_job_raises_on_failed_job(self, service):
+        client = self._cloud_client(["ERROR"])
+
+        with pytest.raises(CloudParseJobFailed):
+            asyncio.run(service.fetch_cloud_job(client, "job-1", "scan.pdf"))
+
+    def test_parse_cloud_batch_returns_documents_per_file(self, service):
+        async def aload_data(stream, extra_info):
+            if extra_info["file_name"] == "bad.png":
+                raise RuntimeError("job failed")
+            return [Document(text=stream.read().decode(), metadata={})]
+
+        service._llama_parser.aload_data.side_effect = aload_data
+        files = [
+            (io.BytesIO(b"one"), "one.png"),
+            (io.BytesIO(b"x"), "bad.png"),
+            (io.BytesIO(b"two"), "two.docx"),
+        ]
+
+        results = service.parse_cloud_batch(files, num_workers=2)
+
+        assert [[d.text for d in docs] for docs in results] == [["one"], [], ["two"]]
+        assert results[2][0].metadata["file_name"] == "two.docx"
+        assert results[2][0].metadata["parsing_method"] == "llama_parse_cloud"
+
+    def test_complex_pdf_routes_to_mixed_mode(self, service):
+        assert service._route("application/pdf", True, False) == "pdf_mixed"
+        assert service._route("application/pdf", True, True) == "cloud"
+        assert service._route("image/png", True, False) == "cloud"
+
+    def test_moderately_complex_documents_route_to_layout_parser(self, service):
+        assert service._route("application/pdf", True, False, 50) == "layout"
+        assert service._route("application/pdf", False, False, 20) == "layout"
+        assert service._route("application/pdf", True, True, 50) == "cloud"
+        assert service._route("application/pdf", True, False, 100) == "pdf_mixed"
+        assert service._route("image/png", True, False, 50) == "cloud"
+
+    def test_parse_layout_falls_back_to_cloud(self, service):
+        cloud_docs = [Document(text="cloud", metadata={})]
+        with patch.object(
+            service._layout_parser, "parse", side_effect=RuntimeError("no models")
+        ), patch.object(
+            service, "_parse_cloud", return_value=cloud_docs
+        ) as mock_cloud:
+            assert service._parse_layout("/tmp/report.pdf") == cloud_docs
+        mock_cloud.assert_called_once_with("/tmp/report.pdf")
+
+    def test_simple_office_files_route_to_native_extractors(self, service):
+        docx = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+        pptx = (
+            "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+        )
+        assert service._route(docx, False, False, 0) == "docx"
+        assert service._route(pptx, False, False, 0) == "pptx"
+        assert service._route(docx, True, False, 90) == "cloud"
+
+    def test_parse_docx_local_returns_markdown_document(self, service, temp_dir):
+        path = temp_dir / "memo.docx"
+        with patch.object(
+            service._office_extractor, "docx_to_markdown", return_value="# Memo"
+        ):
+            docs = service._parse_docx_local(str(path))
+        assert docs[0].text == "# Memo"
+        assert docs[0].metadata == {
+            "file_name": "memo.docx",
+            "parsing_method": "docx_local",
+            "file_type": "docx",
+            "is_premium": False,
+        }
+
+    def test_unreadable_office_file_falls_back_to_cloud(self, service, temp_dir):
+        path = temp_dir / "broken.pptx"
+        path.write_bytes(b"not a zip")
+        cloud_docs = [Document(text="cloud", metadata={})]
+        with patch.object(
+            service, "_parse_cloud", return_value=cloud_docs
+        ) as mock_cloud:
+            assert service._parse_pptx_local(str(path)) == cloud_docs
+        mock_cloud.assert_called_once_with(str(path))
+
+    def _make_pdf(self, path, pages):
+        doc = fitz.open()
+        for text in pages:
+            page = doc.new_page()
+            if text:
+                page.insert_text((72, 72), text)
+        doc.save(str(path))
+        doc.close()
+
+    def test_parse_pdf_mixed_sends_only_complex_pages_to_cloud(
+        self, service, temp_dir
+    ):
+        path = temp_dir / "manual.pdf"
+        text = "A text page with plenty of extractable characters on it. " * 2
+        self._make_pdf(path, [text, text, "", "", text])
+        sent = []
+
+        def parse_cloud_batch(files):
+            sent.extend(
+                (name, fitz.open(stream=f.read(), filetype="pdf").page_count)
+                for f, name in files
+            )
+            return [[Document(text="CLOUD", metadata={})] for _ in files]
+
+        with patch.object(
+            service, "parse_cloud_batch", side_effect=parse_cloud_batch
+        ), patch(
+            "src.services.file_parsing_service.pymupdf4llm.to_markdown",
+            side_effect=lambda doc, pages: f"LOCAL{pages}",
+        ), patch("src.services.file_parsing_service.settings") as mock_settings:
+            mock_settings.PDF_MIXED_MAX_CLOUD_FRACTION = 0.5
+            docs = service._parse_pdf_mixed(str(path))
+
+        assert sent == [("manual.pdf.p3-4.pdf", 2)]
+        assert docs[0].text == "LOCAL[0, 1]\n\nCLOUD\n\nLOCAL[4]"
+        assert docs[0].metadata["parsing_method"] == "hybrid_pdf"
+        assert docs[0].metadata["cloud_pages"] == "3-4"
+
+    def test_classify_sends_mostly_complex_pdf_to_cloud(self, service, temp_dir):
+        text = "A text page with plenty of extractable characters on it. " * 2
+        scan, manual = temp_dir / "scan.pdf", temp_dir / "manual.pdf"
+        self._make_pdf(scan, ["", "", text])
+        self._make_pdf(manual, [text, "", text])
+
+        with patch("src.services.file_parsing_service.settings") as mock_settings:
+            mock_settings.PDF_MIXED_MODE = True
+            mock_settings.PDF_MIXED_MAX_CLOUD_FRACTION = 0.5
+            scan_info, scan_to_cloud = service.classify(str(scan))
+            manual_info, manual_to_cloud = service.classify(str(manual))
+            _, forced_to_cloud = service.classify(str(manual), force_ocr=True)
+
+        assert scan_info[1:] == ["application/pdf", True]
+        assert scan_to_cloud
+        assert manual_info[2] and not manual_to_cloud
+        assert forced_to_cloud
+
+    def test_parse_pdf_mixed_falls_back_to_local_text_on_cloud_failure(
+        self, service, temp_dir, caplog
+    ):
+        path = temp_dir / "manual.pdf"
+        text = "A text page with plenty of extractable characters on it. " * 2
+        self._make_pdf(path, [text, "", text])
+
+        with patch.object(
+            service, "parse_cloud_batch", side_effect=lambda files: [[]]
+        ), patch(
+            "src.services.file_parsing_service.pymupdf4llm.to_markdown",
+            side_effect=lambda doc, pages: f"LOCAL{pages}",
+        ), patch("src.services.file_parsing_service.settings") as mock_settings:
+            mock_settings.PDF_MIXED_MAX_CLOUD_FRACTION = 0.5
+            docs = service._parse_pdf_mixed(str(path))
+
+        assert docs[0].text == "LOCAL[0]\n\nLOCAL[1]\n\nLOCAL[2]"
+        assert "Cloud parse of manual.pdf pages 2-2 failed" in caplog.text
+
+    def test_parse_pdf_mixed_sends_mostly_complex_pdf_to_cloud(
+        self, service, temp_dir
+    ):
+        path = temp_dir / "scan.pdf"
+        self._make_pdf(path, ["", "", "x" * 80])
+
+        with patch.object(service, "_parse_cloud") as mock_cloud, patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings:
+            mock_settings.PDF_MIXED_MAX_CLOUD_FRACTION = 0.5
+            service._parse_pdf_mixed(str(path))
+
+        mock_cloud.assert_called_once_with(str(path))
+
+    def test_large_pdf_is_converted_in_page_chunks(self, service, temp_dir):
+        path = temp_dir / "manual.pdf"
+        self._make_pdf(
+            path, [f"Page {i} has a paragraph of text in it." for i in range(6)]
+        )
+        whole = pymupdf4llm.to_markdown(str(path))
+
+        with patch("src.services.file_parsing_service.settings") as mock_settings:
+            mock_settings.PDF_SHARD_MIN_PAGES = 4
+            mock_settings.PDF_SHARD_PAGES = 2
+            mock_settings.PDF_SHARD_WORKERS = 2
+            with patch(
+                "src.services.file_parsing_service.billiard.Pool",
+                wraps=billiard.Pool,
+            ) as mock_pool:
+                markdown = service._pdf_to_markdown(str(path))
+
+        mock_pool.assert_called_once_with(processes=2)
+        assert markdown == whole
+
+    @pytest.mark.parametrize(
+        "configured, lane_concurrency, expected",
+        [(0, None, 2), (0, 2, 4), (0, 16, 2), (3, None, 3)],
+    )
+    def test_shard_workers_share_the_cpus_of_the_local_lane(
+        self, configured, lane_concurrency, expected
+    ):
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.os.cpu_count", return_value=8
+        ):
+            mock_settings.PDF_SHARD_WORKERS = configured
+            mock_settings.CELERY_PARSE_LOCAL_CONCURRENCY = lane_concurrency
+            assert _shard_workers() == expected
+
+    def test_large_pdfs_are_sharded_with_default_settings(self):
+        with patch("src.services.file_parsing_service.os.cpu_count", return_value=8):
+            assert _shard_workers() == 2
+
+    def test_small_pdf_keeps_single_call(self, service, temp_dir):
+        path = temp_dir / "short.pdf"
+        self._make_pdf(path, ["Only page"])
+
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.billiard.Pool"
+        ) as mock_pool, patch(
+            "src.services.file_parsing_service.pymupdf4llm.to_markdown",
+            return_value="md",
+        ) as mock_md:
+            mock_settings.PDF_SHARD_MIN_PAGES = 4
+            mock_settings.PDF_SHARD_PAGES = 2
+            mock_settings.PDF_SHARD_WORKERS = 2
+            assert service._pdf_to_markdown(str(path)) == "md"
+
+        mock_pool.assert_not_called()
+        (doc,), _ = mock_md.call_args
+        assert isinstance(doc, fitz.Document)
+
+    def test_parse_file_opens_pdf_once_for_analysis_and_parsing(
+        self, service, temp_dir
+    ):
+        path = temp_dir / "manual.pdf"
+        text = "A text page with plenty of extractable characters on it. " * 2
+        self._make_pdf(path, [text, "", text])
+
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.complexity_analyzer.fitz.open", wraps=fitz.open
+        ) as mock_open, patch(
+            "src.services.complexity_analyzer.magic.from_file",
+            return_value="application/pdf",
+        ), patch.object(
+            service, "parse_cloud_batch", side_effect=lambda files: [[]]
+        ), patch(
+            "src.services.file_parsing_service.pymupdf4llm.to_markdown",
+            side_effect=lambda doc, pages: f"LOCAL{pages}",
+        ), patch.object(
+            service._file_analyzer,
+            "_score_page",
+            wraps=service._file_analyzer._score_page,
+        ) as mock_score_page:
+            mock_settings.PDF_MIXED_MODE = True
+            mock_settings.PDF_MIXED_MAX_CLOUD_FRACTION = 0.5
+            docs = service.parse_file(str(path))
+
+        # The other open() creates the page range PDF sent to the cloud.
+        assert mock_open.call_args_list.count(((str(path),),)) == 1
+        # Sampled pages (here: all three) are scored once for both decisions.
+        assert mock_score_page.call_count == 3
+        assert docs[0].metadata["parsing_method"] == "hybrid_pdf"
+
+    def test_sharded_pdf_falls_back_to_single_call_when_pool_fails(
+        self, service, temp_dir
+    ):
+        path = temp_dir / "manual.pdf"
+        self._make_pdf(path, ["page"] * 4)
+
+        with patch(
+            "src.services.file_parsing_service.settings"
+        ) as mock_settings, patch(
+            "src.services.file_parsing_service.billiard.Pool",
+            side_effect=OSError("no processes"),
+        ), patch(
+            "src.services.file_parsing_service.pymupdf4llm.to_markdown",
+            return_value="md",
+        ):
+            mock_settings.PDF_SHARD_MIN_PAGES = 4
+            mock_settings.PDF_SHARD_PAGES = 2
+            mock_settings.PDF_SHARD_WORKERS = 2
+            assert service._pdf_to_markdown(str(path)) == "md"
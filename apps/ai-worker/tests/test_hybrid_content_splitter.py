@@ -3,9 +3,12 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from llama_index.core.schema import TextNode
+from llama_index.core.schema import Document, TextNode
 
-from src.services.hybrid_content_splitter import HybridContentSplitter
+from src.services.hybrid_content_splitter import (
+    HybridContentSplitter,
+    split_table_rows,
+)
 
 
 class TestHybridContentSplitter:
@@ -15,8 +18,10 @@ class TestHybridContentSplitter:
             "src.services.hybrid_content_splitter.LLMFactory.create_llm",
             return_value=MagicMock(),
         ), patch(
-            "src.services.hybrid_content_splitter.MarkdownElementNodeParser",
+            "src.services.hybrid_content_splitter.CachedMarkdownElementNodeParser",
         ) as mock_md_cls, patch(
+            "src.services.hybrid_content_splitter.get_cache_backend",
+        ), patch(
             "src.services.hybrid_content_splitter.SentenceWindowNodeParser.from_defaults",
         ) as mock_sw:
             mock_md = MagicMock()
@@ -38,3 +43,42 @@ class TestHybridContentSplitter:
         assert len(nodes) == 2
         assert nodes[0].text == "windowed"
         assert nodes[1].text == "table"
+
+    def test_tabular_documents_skip_the_llm_parser(self, splitter):
+        table = "| id | name |\n|---:|:-----|\n" + "\n".join(
+            f"| {i} | row{i} |" for i in range(1, 6)
+        )
+        doc = Document(
+            text=f"# Data File: data.csv | Rows: 1-5\n\n{table}",
+            metadata={"file_type": "tabular", "row_start": 1, "row_end": 5},
+        )
+        with patch("src.services.hybrid_content_splitter.settings") as mock_settings:
+            mock_settings.TABULAR_WINDOW_ROWS = 2
+            nodes = splitter([doc])
+
+        splitter._md_parser.get_nodes_from_documents.assert_not_called()
+        assert len(nodes) == 3
+        assert nodes[1].text.startswith("# Data File: data.csv | Rows: 3-4\n\n| id")
+        assert "| 3 | row3 |" in nodes[1].text and "row1" not in nodes[1].text
+        assert [(n.metadata["row_start"], n.metadata["row_end"]) for n in nodes] == [
+            (1, 2),
+            (3, 4),
+            (5, 5),
+        ]
+        assert all(n.ref_doc_id == doc.doc_id for n in nodes)
+        assert splitter.stats() == {"tabular_documents": 1, "llm_calls_avoided": 1}
+
+    def test_mixed_batches_split_tabular_documents_locally(self, splitter):
+        tabular = Document(
+            text="| a |\n|---|\n| 1 |", metadata={"file_type": "tabular"}
+        )
+
+        nodes = splitter([TextNode(text="doc"), tabular])
+
+        (markdown_docs,), _ = splitter._md_parser.get_nodes_from_documents.call_args
+        assert [n.text for n in markdown_docs] == ["doc"]
+        assert [n.text for n in nodes] == ["windowed", "table", "| a |\n|---|\n| 1 |"]
+
+
+def test_split_table_rows_returns_text_without_a_table_whole():
+    assert split_table_rows("# Empty sheet", 10) == [("# Empty sheet", 0, -1)]
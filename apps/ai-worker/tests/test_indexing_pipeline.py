@@ -3,7 +3,7 @@
 from unittest.mock import MagicMock, patch
 
 import pytest
-from llama_index.core.schema import Document
+from llama_index.core.schema import Document, TextNode
 
 from src.pipelines.indexing_pipeline import IndexingPipeline
 
@@ -18,27 +18,52 @@ class TestIndexingPipeline:
         return MagicMock()
 
     @pytest.fixture
-    def mock_cache(self):
+    def mock_backend(self):
         return MagicMock()
 
     @pytest.fixture
-    def pipeline(self, mock_client, mock_embedding, mock_cache, temp_dir):
+    def mock_registry(self, mock_client):
+        registry = MagicMock()
+        registry.client.return_value = mock_client
+        return registry
+
+    @pytest.fixture
+    def pipeline(self, mock_registry, mock_embedding, mock_backend, temp_dir):
         with patch(
-            "src.pipelines.indexing_pipeline.QdrantClient",
-            return_value=mock_client,
+            "src.pipelines.indexing_pipeline.get_qdrant_registry",
+            return_value=mock_registry,
+        ), patch("src.pipelines.indexing_pipeline._embedding", None), patch(
+            "src.pipelines.indexing_pipeline._splitter", None
         ), patch(
             "src.pipelines.indexing_pipeline.LLMFactory.create_embedding",
             return_value=mock_embedding,
         ), patch(
             "src.pipelines.indexing_pipeline.settings",
         ) as mock_settings, patch(
-            "src.pipelines.indexing_pipeline.IngestionCache.from_persist_path",
-            return_value=mock_cache,
+            "src.pipelines.indexing_pipeline.get_cache_backend",
+            return_value=mock_backend,
         ):
             mock_settings.TEMP_DIR = temp_dir
-            mock_settings.QDRANT_HOST = "localhost"
-            mock_settings.QDRANT_PORT = 6333
-            return IndexingPipeline(collection_name="test_coll")
+            mock_settings.EMBEDDING_CACHE_ENABLED = False
+            mock_settings.EMBEDDING_SCHEDULER_ENABLED = False
+            mock_settings.INDEXING_INCREMENTAL = True
+            yield IndexingPipeline(collection_name="test_coll")
+
+    def test_uses_registry_client_and_vector_store(
+        self, pipeline, mock_registry, mock_client
+    ):
+        assert pipeline.client is mock_client
+        mock_registry.vector_store.assert_called_once_with("test_coll")
+        assert pipeline.vector_store is mock_registry.vector_store.return_value
+
+    def test_embedding_is_built_once_per_process(self, pipeline, mock_embedding):
+        with patch(
+            "src.pipelines.indexing_pipeline.LLMFactory.create_embedding"
+        ) as create_embedding:
+            other = IndexingPipeline(collection_name="other_coll")
+
+        create_embedding.assert_not_called()
+        assert other.embedding is pipeline.embedding is mock_embedding
 
     def test_run_calls_ingestion_pipeline_with_documents(
         self, pipeline, sample_documents
@@ -57,22 +82,11 @@ class TestIndexingPipeline:
             assert call_kw["documents"] == sample_documents
             assert result == []
 
-    def test_run_swallows_cache_persist_error(
-        self, pipeline, sample_documents
-    ):
-        """Cache.persist() failure is logged but does not raise."""
-        with patch(
-            "src.pipelines.indexing_pipeline.IngestionPipeline",
-        ) as mock_ingestion_cls:
-            mock_ingestion = MagicMock()
-            returned_nodes = [MagicMock()]
-            mock_ingestion.run.return_value = returned_nodes
-            mock_ingestion_cls.return_value = mock_ingestion
-            pipeline.cache.persist.side_effect = OSError("disk full")
-
-            result = pipeline.run(sample_documents)
-
-            assert result == returned_nodes
+    def test_cache_is_namespaced_per_collection(self, pipeline, mock_backend):
+        pipeline.cache.put("hash", [])
+        namespace, key, _ = mock_backend.put.call_args[0]
+        assert namespace == "ingestion:test_coll"
+        assert key == "hash"
 
     def test_run_reraises_on_ingestion_failure(
         self, pipeline, sample_documents
@@ -87,3 +101,35 @@ class TestIndexingPipeline:
 
             with pytest.raises(RuntimeError, match="Qdrant down"):
                 pipeline.run(sample_documents)
+
+    def test_incremental_run_only_embeds_changed_chunks(self, pipeline):
+        def split(documents):
+            return [TextNode(text=t) for d in documents for t in d.text.split()]
+
+        embedded = []
+
+        def embed(nodes):
+            embedded.extend(node.text for node in nodes)
+            return nodes
+
+        stored = {}
+        pipeline.embedding.side_effect = embed
+        pipeline.vector_store.add.side_effect = lambda nodes: stored.update(
+            {node.id_: node.text for node in nodes}
+        )
+        pipeline.chunk_index.existing_ids.side_effect = lambda _: set(stored)
+        pipeline.chunk_index.delete.side_effect = lambda ids: [
+            stored.pop(i) for i in ids
+        ]
+
+        with patch(
+            "src.pipelines.indexing_pipeline._get_splitter",
+            return_value=MagicMock(side_effect=split),
+        ):
+            pipeline.run([Document(text="a b c")], source_id="src/doc.md")
+            embedded.clear()
+            pipeline.run([Document(text="a B d")], source_id="src/doc.md")
+
+        assert embedded == ["B", "d"]
+        assert sorted(stored.values()) == ["B", "a", "d"]
+        pipeline.chunk_index.delete.assert_called_once()
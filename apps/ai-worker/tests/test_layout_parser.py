@@ -0,0 +1,58 @@
+"""Unit tests for LayoutParser and the layout score band."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.schema import Document
+
+from src.services.layout_parser import LayoutParser, in_layout_band
+
+_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class TestLayoutParser:
+    def test_parse_tags_documents_and_drops_empty_ones(self, fixtures_dir):
+        parser = LayoutParser()
+        reader = MagicMock()
+        reader.load_data.return_value = [
+            Document(text="| a | b |\n|---|---|\n| 1 | 2 |", metadata={"x": 1}),
+            Document(text="  ", metadata={}),
+        ]
+        path = fixtures_dir / "sample.pdf"
+
+        with patch.object(parser, "_create_reader", return_value=reader) as mock_create:
+            docs = parser.parse(str(path))
+            parser.parse(str(path))
+
+        mock_create.assert_called_once()
+        reader.load_data.assert_called_with(str(path))
+        assert len(docs) == 1
+        assert docs[0].metadata == {
+            "file_name": "sample.pdf",
+            "parsing_method": "docling_local",
+            "file_type": "pdf",
+            "is_premium": False,
+        }
+
+    @pytest.mark.parametrize(
+        "mime, score, expected",
+        [
+            ("application/pdf", 19, False),
+            ("application/pdf", 20, True),
+            ("application/pdf", 60, True),
+            ("application/pdf", 100, False),
+            (_DOCX, 40, True),
+            ("image/png", 40, False),
+        ],
+    )
+    def test_in_layout_band(self, mime, score, expected):
+        with patch("src.services.layout_parser.settings") as mock_settings:
+            mock_settings.PARSE_LAYOUT_ENABLED = True
+            mock_settings.PARSE_LAYOUT_MIN_SCORE = 20
+            mock_settings.PARSE_LAYOUT_MAX_SCORE = 60
+            assert in_layout_band(mime, score) is expected
+
+    def test_in_layout_band_is_off_when_disabled(self):
+        with patch("src.services.layout_parser.settings") as mock_settings:
+            mock_settings.PARSE_LAYOUT_ENABLED = False
+            assert in_layout_band("application/pdf", 40) is False
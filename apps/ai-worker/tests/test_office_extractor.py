@@ -0,0 +1,97 @@
+"""Unit tests for OfficeExtractor (DOCX from raw XML, PPTX via python-pptx)."""
+
+import zipfile
+
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+
+from src.services.office_extractor import OfficeExtractor, markdown_table
+
+_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+_STYLES = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:styles {_NS}>
+  <w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/></w:style>
+  <w:style w:type="paragraph" w:styleId="berschrift2">
+    <w:name w:val="heading 2"/>
+  </w:style>
+</w:styles>"""
+
+_DOCUMENT = f"""<?xml version="1.0" encoding="UTF-8"?>
+<w:document {_NS}>
+  <w:body>
+    <w:p><w:pPr><w:pStyle w:val="Title"/></w:pPr><w:r><w:t>Report</w:t></w:r></w:p>
+    <w:p><w:r><w:t>Intro </w:t></w:r><w:r><w:t>text.</w:t></w:r></w:p>
+    <w:p><w:pPr><w:pStyle w:val="berschrift2"/></w:pPr><w:r><w:t>Data</w:t></w:r></w:p>
+    <w:p><w:pPr><w:numPr><w:ilvl w:val="1"/></w:numPr></w:pPr>
+      <w:r><w:t>nested item</w:t></w:r></w:p>
+    <w:tbl>
+      <w:tr><w:tc><w:p><w:r><w:t>Region</w:t></w:r></w:p></w:tc>
+            <w:tc><w:p><w:r><w:t>Q1</w:t></w:r></w:p></w:tc></w:tr>
+      <w:tr><w:tc><w:p><w:r><w:t>EU|West</w:t></w:r></w:p></w:tc>
+            <w:tc><w:p><w:r><w:t>10</w:t></w:r></w:p></w:tc></w:tr>
+    </w:tbl>
+    <w:p/>
+  </w:body>
+</w:document>"""
+
+
+class TestOfficeExtractor:
+    @pytest.fixture
+    def extractor(self):
+        return OfficeExtractor()
+
+    def test_markdown_table_pads_rows_and_escapes_pipes(self):
+        assert markdown_table([["a", "b"], ["x|y"]]) == (
+            "| a | b |\n|---|---|\n| x\\|y |  |"
+        )
+        assert markdown_table([]) == ""
+
+    def test_docx_to_markdown_keeps_headings_lists_and_tables(
+        self, extractor, temp_dir
+    ):
+        path = temp_dir / "report.docx"
+        with zipfile.ZipFile(path, "w") as archive:
+            archive.writestr("word/document.xml", _DOCUMENT)
+            archive.writestr("word/styles.xml", _STYLES)
+
+        assert extractor.docx_to_markdown(str(path)) == (
+            "# Report\n\n"
+            "Intro text.\n\n"
+            "## Data\n\n"
+            "  - nested item\n\n"
+            "| Region | Q1 |\n|---|---|\n| EU\\|West | 10 |"
+        )
+
+    def test_pptx_to_markdown_emits_slides_text_and_tables(self, extractor, temp_dir):
+        path = temp_dir / "deck.pptx"
+        presentation = Presentation()
+        slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+        slide.shapes.title.text = "Results"
+        body = slide.placeholders[1].text_frame
+        body.text = "Revenue grew"
+        detail = body.add_paragraph()
+        detail.text = "mostly in EU"
+        detail.level = 1
+        table = slide.shapes.add_table(
+            2, 2, Inches(1), Inches(5), Inches(4), Inches(1)
+        ).table
+        for (row, col), text in {
+            (0, 0): "Region",
+            (0, 1): "Q1",
+            (1, 0): "EU",
+            (1, 1): "10",
+        }.items():
+            table.cell(row, col).text = text
+        slide.notes_slide.notes_text_frame.text = "Mention the EU launch."
+        presentation.slides.add_slide(presentation.slide_layouts[6])
+        presentation.save(str(path))
+
+        assert extractor.pptx_to_markdown(str(path)) == (
+            "## Slide 1: Results\n\n"
+            "- Revenue grew\n  - mostly in EU\n\n"
+            "| Region | Q1 |\n|---|---|\n| EU | 10 |\n\n"
+            "> Notes: Mention the EU launch.\n\n"
+            "## Slide 2"
+        )
@@ -0,0 +1,89 @@
+"""Unit tests for ParquetSidecars (needs the parquet extra)."""
+
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+from botocore.exceptions import ClientError
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.services.parquet_sidecar import ParquetSidecars  # noqa: E402
+
+
+class TestParquetSidecars:
+    @pytest.fixture
+    def sidecars(self, temp_dir):
+        with patch("src.services.parquet_sidecar.settings") as mock_settings:
+            mock_settings.TEMP_DIR = str(temp_dir)
+            mock_settings.TABULAR_PARQUET_S3_PREFIX = "parsed-tables"
+            mock_settings.PARSER_VERSION = "1"
+            yield ParquetSidecars(str(temp_dir / "report.xlsx"), "abc")
+
+    @staticmethod
+    def _capture_uploads(tables: dict) -> MagicMock:
+        s3_client = MagicMock()
+        s3_client.upload_file.side_effect = lambda path, key: tables.__setitem__(
+            key, pq.read_table(path)
+        )
+        return s3_client
+
+    def test_chunks_become_row_groups_with_dtypes_kept(self, sidecars, temp_dir):
+        first = pd.DataFrame(
+            {
+                "id": [1, 2],
+                "price": [1.5, 2.5],
+                "day": pd.to_datetime(["2024-01-01"] * 2),
+            }
+        )
+        second = pd.DataFrame(
+            {"id": [3], "price": [4.0], "day": pd.to_datetime(["2024-01-02"])}
+        )
+        sidecars.write("Sales", first)
+        sidecars.write("Sales", second)
+        tables = {}
+
+        keys = sidecars.upload(self._capture_uploads(tables))
+
+        assert keys == {"Sales": "parsed-tables/abc-1/Sales.parquet"}
+        df = tables[keys["Sales"]].to_pandas()
+        assert df["id"].tolist() == [1, 2, 3]
+        assert str(df["id"].dtype) == "int64"
+        assert str(df["day"].dtype).startswith("datetime64")
+        assert list(temp_dir.glob("*.parquet")) == []
+
+    def test_chunk_that_breaks_the_schema_drops_only_its_table(self, sidecars):
+        sidecars.write("A", pd.DataFrame({"n": [1, 2]}))
+        sidecars.write("A", pd.DataFrame({"n": ["not a number"]}))
+        sidecars.write("B", pd.DataFrame({"n": [1]}))
+        tables = {}
+
+        keys = sidecars.upload(self._capture_uploads(tables))
+
+        assert sidecars.failed == {"A"}
+        assert keys == {"B": "parsed-tables/abc-1/B.parquet"}
+
+    def test_failed_upload_drops_only_its_table(self, sidecars, temp_dir):
+        sidecars.write("A", pd.DataFrame({"n": [1]}))
+        sidecars.write("B", pd.DataFrame({"n": [2]}))
+
+        def upload_file(path, key):
+            if key.endswith("/A.parquet"):
+                raise ClientError({"Error": {"Code": "500"}}, "PutObject")
+
+        s3_client = MagicMock()
+        s3_client.upload_file.side_effect = upload_file
+
+        keys = sidecars.upload(s3_client)
+
+        assert sidecars.failed == {"A"}
+        assert keys == {"B": "parsed-tables/abc-1/B.parquet"}
+        assert list(temp_dir.glob("*.parquet")) == []
+
+    def test_same_file_name_with_other_content_gets_its_own_key(self, sidecars):
+        other = ParquetSidecars("uploads/report.xlsx", "def")
+
+        assert other.s3_key("Sales") != sidecars.s3_key("Sales")
+
+    def test_csv_table_is_named_table(self, sidecars):
+        assert sidecars.s3_key(None) == "parsed-tables/abc-1/table.parquet"
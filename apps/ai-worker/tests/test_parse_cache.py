@@ -0,0 +1,82 @@
+"""Unit tests for ParseCache (local LRU tier + mocked S3 tier)."""
+
+import os
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+from llama_index.core.schema import Document
+
+from src.services.parse_cache import ParseCache
+
+
+class TestParseCache:
+    @pytest.fixture
+    def mock_s3(self):
+        s3 = MagicMock()
+        s3.get_bytes.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject"
+        )
+        return s3
+
+    @pytest.fixture
+    def cache(self, temp_dir, mock_s3):
+        return ParseCache(
+            cache_dir=str(temp_dir / "parse_cache"),
+            max_bytes=10_000,
+            s3_client=mock_s3,
+        )
+
+    def test_make_key_depends_on_route_and_config(self):
+        key = ParseCache.make_key("sha", "cloud", "cfg")
+        assert key != ParseCache.make_key("sha", "pdf", "cfg")
+        assert key != ParseCache.make_key("sha", "cloud", "cfg2")
+        assert key == ParseCache.make_key("sha", "cloud", "cfg")
+
+    def test_put_then_get_hits_local_tier(self, cache, mock_s3, sample_documents):
+        cache.put("k1", sample_documents)
+
+        docs = cache.get("k1")
+
+        assert [d.text for d in docs] == [d.text for d in sample_documents]
+        mock_s3.put_bytes.assert_called_once()
+        assert mock_s3.put_bytes.call_args[0][1] == "parse-cache/k1.json"
+        mock_s3.get_bytes.assert_not_called()
+        assert cache.stats()["local_hits"] == 1
+        assert cache.stats()["puts"] == 1
+
+    def test_miss_checks_s3_and_counts_miss(self, cache, mock_s3):
+        assert cache.get("missing") is None
+        mock_s3.get_bytes.assert_called_once_with("parse-cache/missing.json")
+        assert cache.stats()["misses"] == 1
+
+    def test_remote_hit_populates_local_tier(
+        self, cache, mock_s3, sample_documents_json
+    ):
+        mock_s3.get_bytes.side_effect = None
+        mock_s3.get_bytes.return_value = sample_documents_json.encode()
+
+        docs = cache.get("remote")
+
+        assert len(docs) == 2
+        assert cache.stats()["remote_hits"] == 1
+        assert cache.get("remote") is not None
+        assert cache.stats()["local_hits"] == 1
+
+    def test_evicts_least_recently_used_entries(self, temp_dir, mock_s3):
+        cache = ParseCache(
+            cache_dir=str(temp_dir / "lru"), max_bytes=250, s3_client=mock_s3
+        )
+        big = [Document(text="x" * 100, metadata={})]
+        cache.put("old", big)
+        os.utime(temp_dir / "lru" / "old.json", (1, 1))
+        cache.put("new", big)
+
+        assert not (temp_dir / "lru" / "old.json").exists()
+        assert (temp_dir / "lru" / "new.json").exists()
+        assert cache.stats()["evictions"] == 1
+
+    def test_s3_errors_degrade_to_miss(self, cache, mock_s3):
+        mock_s3.get_bytes.side_effect = RuntimeError("s3 down")
+        assert cache.get("k") is None
+        assert cache.stats()["misses"] == 1
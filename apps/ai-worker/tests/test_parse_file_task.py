@@ -1,10 +1,29 @@
 """Unit tests for run_parse_file Celery task."""
 
+import hashlib
+import io
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import fitz
 import pytest
+from llama_index.core.schema import Document
 
-from src.tasks.parse_file import run_parse_file
+from src.pipelines.parse_pipeline import ParseFilePipeline
+from src.services.cloud_parse_jobs import CloudParseJob
+from src.services.documents_service import DocumentsService, SpooledDocuments
+from src.tasks.parse_file import (
+    complete_cloud_job,
+    parse_lane,
+    run_fan_out_failed,
+    run_merge_parts,
+    run_parse_cloud,
+    run_parse_cloud_batch,
+    run_parse_file,
+    run_parse_local,
+    run_parse_part,
+    run_parse_text,
+)
 
 
 class TestRunParseFile:
@@ -28,21 +47,91 @@ class TestRunParseFile:
             "src.tasks.parse_file._get_pipeline",
         ) as mock_get_pl, patch(
             "src.tasks.parse_file.run_vectorize_file",
-        ) as mock_vectorize:
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
             mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 8}
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
             mock_pl = MagicMock()
             mock_pl.run.return_value = sample_documents
+            mock_pl.classify.return_value = ((0, "application/pdf", False), False)
             mock_get_pl.return_value = mock_pl
+            uploaded = {}
+            mock_s3.put_stream.side_effect = lambda f, key: uploaded.update(
+                {key: f.read()}
+            )
 
             run_parse_file.apply(args=[task_payload], throw=True)
 
             mock_s3.download_file.assert_called_once()
             mock_pl.run.assert_called_once()
-            mock_s3.upload_file.assert_called_once()
+            # The analysis result is reused by the parser.
+            assert mock_pl.run.call_args[0][0].file_info == (
+                0,
+                "application/pdf",
+                False,
+            )
+            ((parsed_key, artifact),) = uploaded.items()
+            sha256 = hashlib.sha256(b"fake pdf").hexdigest()
+            assert parsed_key.startswith(f"parsed/{sha256}-1-0.jsonl.")
+            source_key, alias_key = mock_s3.copy_object.call_args[0]
+            assert source_key == parsed_key
+            assert alias_key.startswith("parsed/doc.pdf.jsonl.")
+            restored = list(DocumentsService().read_documents(io.BytesIO(artifact)))
+            assert [d.text for d in restored] == [d.text for d in sample_documents]
             mock_vectorize.delay.assert_called_once()
             call_args = mock_vectorize.delay.call_args[0][0]
-            assert call_args["s3_key"] == "parsed/doc.pdf.json"
+            assert call_args["s3_key"] == parsed_key
             assert call_args["collection_name"] == "my_coll"
+            assert call_args["source_id"] == task_payload["s3_key"]
+            mock_index.record.assert_called_once()
+            assert mock_index.record.call_args[0][2] == parsed_key
+
+    def test_closes_spooled_documents_after_storing_them(
+        self, sample_documents, temp_dir
+    ):
+        task_payload = {"s3_key": "inputs/sheet.csv", "collection_name": "my_coll"}
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        (inputs_dir / "sheet.csv").write_text("a,b")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ), patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 3}
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
+            spooled = SpooledDocuments(iter(sample_documents), max_size=16)
+            mock_pl = MagicMock()
+            mock_pl.run.return_value = spooled
+            mock_pl.classify.return_value = ((0, "text/csv", False), False)
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_s3.put_stream.assert_called_once()
+            assert spooled._file.closed
 
     def test_returns_early_when_no_documents(self, temp_dir):
         task_payload = {
@@ -61,12 +150,1014 @@ class TestRunParseFile:
             "src.tasks.parse_file._get_pipeline",
         ) as mock_get_pl, patch(
             "src.tasks.parse_file.run_vectorize_file",
-        ) as mock_vectorize:
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
             mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
             mock_pl = MagicMock()
             mock_pl.run.return_value = []
+            mock_pl.classify.return_value = (None, False)
             mock_get_pl.return_value = mock_pl
 
             run_parse_file.apply(args=[task_payload], throw=True)
 
             mock_vectorize.delay.assert_not_called()
+
+    def test_etag_dedup_hit_skips_download_and_parsing(self, temp_dir):
+        task_payload = {
+            "s3_key": "inputs/again.pdf",
+            "collection_name": "other_coll",
+        }
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 8}
+            mock_s3.exists.return_value = True
+            mock_settings.PARSER_VERSION = "1"
+            mock_index.lookup_sha256.return_value = "deadbeef"
+            mock_index.lookup.return_value = "parsed/deadbeef-1-0.jsonl.zst"
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_index.lookup_sha256.assert_called_once_with("abc", 8)
+            mock_s3.download_file.assert_not_called()
+            mock_get_pl.assert_not_called()
+            call_args = mock_vectorize.delay.call_args[0][0]
+            assert call_args["s3_key"] == "parsed/deadbeef-1-0.jsonl.zst"
+            assert call_args["collection_name"] == "other_coll"
+
+    def test_content_hash_dedup_hit_skips_parsing(self, temp_dir):
+        task_payload = {
+            "s3_key": "inputs/copy.pdf",
+            "collection_name": "my_coll",
+        }
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        local_path = inputs_dir / "copy.pdf"
+        local_path.write_text("fake pdf")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.head_object.return_value = {"ETag": '"new"', "ContentLength": 8}
+            mock_s3.exists.return_value = True
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.side_effect = (
+                lambda sha, ocr: f"parsed/{sha}-1-0.jsonl.zst"
+            )
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_s3.download_file.assert_called_once()
+            sha256 = mock_index.remember_sha256.call_args[0][2]
+            mock_index.lookup.assert_called_once_with(sha256, False)
+            mock_get_pl.assert_not_called()
+            mock_vectorize.delay.assert_called_once()
+            assert not local_path.exists()
+
+    def test_dedup_ignores_index_entry_when_artifact_is_gone(
+        self, sample_documents, temp_dir
+    ):
+        task_payload = {
+            "s3_key": "inputs/doc.pdf",
+            "collection_name": "my_coll",
+        }
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        (inputs_dir / "doc.pdf").write_text("fake pdf")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ), patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 8}
+            mock_s3.exists.return_value = False
+            mock_index.lookup_sha256.return_value = "deadbeef"
+            mock_index.lookup.return_value = "parsed/deleted.json"
+            mock_pl = MagicMock()
+            mock_pl.run.return_value = sample_documents
+            mock_pl.classify.return_value = (None, False)
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_pl.run.assert_called_once()
+
+    def test_uploads_sharing_a_file_name_get_separate_artifacts(
+        self, sample_documents, temp_dir
+    ):
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        task_payload = {"s3_key": "inputs/report.pdf", "collection_name": "c"}
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.exists.return_value = True
+            mock_index.lookup_sha256.return_value = None
+            # The index still maps the first version to the old per-file key.
+            mock_index.lookup.return_value = "parsed/report.pdf.jsonl.zst"
+            mock_get_pl.return_value.classify.return_value = (None, False)
+            mock_get_pl.return_value.run.return_value = sample_documents
+            artifacts = []
+            for content in (b"version 1", b"version 2"):
+                (inputs_dir / "report.pdf").write_bytes(content)
+                mock_s3.head_object.return_value = {
+                    "ETag": f'"{content.decode()}"',
+                    "ContentLength": len(content),
+                }
+
+                run_parse_file.apply(args=[task_payload], throw=True)
+
+                artifacts.append(mock_vectorize.delay.call_args[0][0]["s3_key"])
+
+            # Both versions were parsed, not served from the per-file key.
+            assert mock_get_pl.return_value.run.call_count == 2
+            assert artifacts == [
+                mock_s3.put_stream.call_args_list[0][0][1],
+                mock_s3.put_stream.call_args_list[1][0][1],
+            ]
+            versions = (b"version 1", b"version 2")
+            for content, key in zip(versions, artifacts, strict=True):
+                assert key.startswith(f"parsed/{hashlib.sha256(content).hexdigest()}-")
+
+    def test_cloud_bound_file_is_streamed_without_download(
+        self, sample_documents, temp_dir
+    ):
+        data = b"%PDF scanned"
+        task_payload = {"s3_key": "inputs/scan.pdf", "collection_name": "my_coll"}
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._pre_routing",
+        ) as mock_pre_routing:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSE_CLOUD_ASYNC = False
+            mock_settings.PARSE_CLOUD_BATCHING = False
+            mock_s3.head_object.return_value = {
+                "ETag": '"abc"',
+                "ContentLength": len(data),
+            }
+            mock_s3.get_stream.return_value = io.BytesIO(data)
+            mock_index.lookup_sha256.return_value = None
+            mock_pre_routing.probe.return_value = (100, "application/pdf", True)
+            mock_pl = MagicMock()
+            mock_pl.run_cloud_stream.side_effect = lambda stream, name: (
+                stream.read() and sample_documents
+            )
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_s3.download_file.assert_not_called()
+            mock_pl.run.assert_not_called()
+            assert mock_pl.run_cloud_stream.call_args[0][1] == "scan.pdf"
+            sha256 = hashlib.sha256(data).hexdigest()
+            mock_index.remember_sha256.assert_called_once_with("abc", len(data), sha256)
+            assert mock_index.record.call_args[0][0] == sha256
+            mock_vectorize.delay.assert_called_once()
+
+    def test_pre_routing_info_is_passed_to_local_parser(
+        self, sample_documents, temp_dir
+    ):
+        task_payload = {"s3_key": "inputs/notes.txt", "collection_name": "my_coll"}
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        (inputs_dir / "notes.txt").write_text("notes")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ), patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._pre_routing",
+        ) as mock_pre_routing:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 5}
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
+            mock_pre_routing.probe.return_value = (0, "text/plain", False)
+            mock_pl = MagicMock()
+            mock_pl.run.return_value = sample_documents
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_s3.download_file.assert_called_once()
+            mock_pre_routing.probe.assert_called_once_with("inputs/notes.txt", 5)
+            payload = mock_pl.run.call_args[0][0]
+            assert payload.file_info == (0, "text/plain", False)
+
+    def test_hands_pre_routed_task_to_its_parser_lane(self, temp_dir):
+        task_payload = {"s3_key": "inputs/scan.pdf", "collection_name": "my_coll"}
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._pre_routing",
+        ) as mock_pre_routing, patch.dict(
+            "src.tasks.parse_file._LANE_TASKS",
+            {"cloud": MagicMock(), "local": MagicMock(), "text": MagicMock()},
+        ) as lanes:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = True
+            mock_s3.head_object.return_value = {"ETag": '"abc"', "ContentLength": 9}
+            mock_index.lookup_sha256.return_value = None
+            mock_pre_routing.probe.return_value = (100, "application/pdf", True)
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_s3.download_file.assert_not_called()
+            mock_get_pl.assert_not_called()
+            lanes["local"].delay.assert_not_called()
+            payload = lanes["cloud"].delay.call_args[0][0]
+            assert payload["s3_key"] == "inputs/scan.pdf"
+            assert (payload["etag"], payload["size"]) == ("abc", 9)
+            assert payload["file_info"] == (100, "application/pdf", True)
+
+    def test_local_lane_hands_cloud_bound_pdf_to_cloud_lane(self, temp_dir):
+        task_payload = {
+            "s3_key": "inputs/scan.pdf",
+            "collection_name": "my_coll",
+            "etag": "abc",
+            "size": 8,
+        }
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        (inputs_dir / "scan.pdf").write_bytes(b"%PDF 1.7")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ), patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file.run_parse_cloud",
+        ) as mock_cloud_lane:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = True
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_index.lookup.return_value = None
+            mock_pl = MagicMock()
+            mock_pl.classify.return_value = ((100, "application/pdf", True), True)
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_local.apply(args=[task_payload], throw=True)
+
+            mock_pl.run.assert_not_called()
+            assert not (inputs_dir / "scan.pdf").exists()
+            payload = mock_cloud_lane.delay.call_args[0][0]
+            assert payload["file_info"] == (100, "application/pdf", True)
+            assert payload["sha256"] == hashlib.sha256(b"%PDF 1.7").hexdigest()
+
+    def test_complex_pdf_is_submitted_as_async_cloud_job(self, temp_dir):
+        """Inline parsing: a scanned PDF found by the analysis is not parsed here."""
+        doc = fitz.open()
+        for _ in range(3):
+            doc.new_page()  # no text layer: a scan
+        data = doc.tobytes()
+        doc.close()
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        task_payload = {"s3_key": "inputs/scan.pdf", "collection_name": "my_coll"}
+
+        with patch(
+            "src.services.file_parsing_service.LlamaParse",
+        ):
+            pipeline = ParseFilePipeline()
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+            return_value=pipeline,
+        ), patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._cloud_jobs",
+        ) as mock_jobs, patch.object(
+            pipeline.parser, "submit_cloud_job", return_value="job-1"
+        ) as mock_submit, patch.object(
+            pipeline.parser, "parse_file"
+        ) as mock_parse_file:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PARSE_CLOUD_BATCHING = False
+            mock_settings.PARSE_CLOUD_ASYNC = True
+            mock_s3.head_object.return_value = {
+                "ETag": '"abc"',
+                "ContentLength": len(data),
+            }
+            mock_s3.download_file.side_effect = lambda key, path: Path(
+                path
+            ).write_bytes(data)
+            mock_s3.get_stream.return_value = io.BytesIO(data)
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_parse_file.assert_not_called()
+            assert mock_submit.call_args[0][1] == "scan.pdf"
+            (job,) = mock_jobs.add.call_args[0]
+            assert job.job_id == "job-1"
+            assert job.payload["sha256"] == hashlib.sha256(data).hexdigest()
+            assert job.payload["file_info"][1:] == ["application/pdf", True]
+            assert not (inputs_dir / "scan.pdf").exists()
+            mock_vectorize.delay.assert_not_called()
+
+    def test_pdf_is_opened_once_for_analysis_and_parsing(self, temp_dir):
+        doc = fitz.open()
+        for i in range(3):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1} " + "text " * 20)
+        data = doc.tobytes()
+        doc.close()
+        (temp_dir / "inputs").mkdir(parents=True)
+        task_payload = {"s3_key": "inputs/plain.pdf", "collection_name": "my_coll"}
+
+        with patch(
+            "src.services.file_parsing_service.LlamaParse",
+        ):
+            pipeline = ParseFilePipeline()
+        pipeline.parser._parse_cache = None
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+            return_value=pipeline,
+        ), patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.services.complexity_analyzer.fitz.open",
+            wraps=fitz.open,
+        ) as mock_open:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_LANES_ENABLED = False
+            mock_settings.PRE_ROUTING_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.head_object.return_value = {
+                "ETag": '"abc"',
+                "ContentLength": len(data),
+            }
+            mock_s3.download_file.side_effect = lambda key, path: Path(
+                path
+            ).write_bytes(data)
+            mock_index.lookup_sha256.return_value = None
+            mock_index.lookup.return_value = None
+
+            run_parse_file.apply(args=[task_payload], throw=True)
+
+            mock_open.assert_called_once()
+            mock_s3.put_stream.assert_called_once()
+            mock_vectorize.delay.assert_called_once()
+
+    def test_lane_task_parses_without_routing_again(self, sample_documents, temp_dir):
+        task_payload = {
+            "s3_key": "inputs/notes.csv",
+            "collection_name": "my_coll",
+            "etag": "abc",
+            "size": 5,
+            "file_info": [0, "text/csv", False],
+        }
+        inputs_dir = temp_dir / "inputs"
+        inputs_dir.mkdir(parents=True)
+        (inputs_dir / "notes.csv").write_text("a,b\n")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._pre_routing",
+        ) as mock_pre_routing:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_FANOUT_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_index.lookup.return_value = None
+            mock_pl = MagicMock()
+            mock_pl.run.return_value = sample_documents
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_text.apply(args=[task_payload], throw=True)
+
+            mock_s3.head_object.assert_not_called()
+            mock_pre_routing.probe.assert_not_called()
+            mock_s3.download_file.assert_called_once()
+            assert mock_pl.run.call_args[0][0].file_info == (0, "text/csv", False)
+            mock_vectorize.delay.assert_called_once()
+
+    def test_async_cloud_mode_submits_job_and_returns(self, temp_dir):
+        data = b"%PDF scanned"
+        task_payload = {
+            "s3_key": "inputs/scan.pdf",
+            "collection_name": "my_coll",
+            "etag": "abc",
+            "size": len(data),
+            "file_info": [100, "application/pdf", True],
+        }
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._cloud_jobs",
+        ) as mock_jobs:
+            mock_settings.PARSE_CLOUD_ASYNC = True
+            mock_settings.PARSE_CLOUD_BATCHING = False
+            mock_settings.PARSE_DEDUP_ENABLED = True
+            mock_s3.get_stream.return_value = io.BytesIO(data)
+            mock_pl = MagicMock()
+            mock_pl.submit_cloud_job.side_effect = lambda stream, name: (
+                stream.read() and "job-1"
+            )
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_cloud.apply(args=[task_payload], throw=True)
+
+            mock_pl.run_cloud_stream.assert_not_called()
+            mock_s3.put_stream.assert_not_called()
+            mock_vectorize.delay.assert_not_called()
+            sha256 = hashlib.sha256(data).hexdigest()
+            mock_index.remember_sha256.assert_called_once_with("abc", len(data), sha256)
+            (job,) = mock_jobs.add.call_args[0]
+            assert (job.job_id, job.file_name) == ("job-1", "scan.pdf")
+            assert job.payload["sha256"] == sha256
+            assert job.payload["collection_name"] == "my_coll"
+
+    def test_complete_cloud_job_stores_artifact_and_enqueues_vectorize(
+        self, sample_documents
+    ):
+        job = CloudParseJob(
+            job_id="job-1",
+            file_name="scan.pdf",
+            payload={
+                "s3_key": "inputs/scan.pdf",
+                "collection_name": "my_coll",
+                "sha256": "deadbeef",
+            },
+        )
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+
+            complete_cloud_job(job, sample_documents)
+
+            parsed_key = mock_s3.put_stream.call_args[0][1]
+            assert parsed_key.startswith("parsed/deadbeef-1-0.jsonl.")
+            alias_key = mock_s3.copy_object.call_args[0][1]
+            assert alias_key.startswith("parsed/scan.pdf.jsonl.")
+            mock_index.record.assert_called_once_with("deadbeef", False, parsed_key)
+            call_args = mock_vectorize.delay.call_args[0][0]
+            assert call_args["s3_key"] == parsed_key
+            assert call_args["source_id"] == "inputs/scan.pdf"
+
+    def test_small_cloud_bound_file_is_buffered_for_a_batch(self):
+        task_payload = {
+            "s3_key": "inputs/page.png",
+            "collection_name": "my_coll",
+            "size": 1000,
+            "file_info": [100, "image/png", True],
+        }
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file._cloud_batch",
+        ) as mock_batch, patch(
+            "src.tasks.parse_file.run_parse_cloud_batch",
+        ) as mock_batch_task:
+            mock_settings.PARSE_CLOUD_BATCHING = True
+            mock_settings.CLOUD_BATCH_MAX_FILE_BYTES = 2000
+            mock_settings.CLOUD_BATCH_MAX_FILES = 50
+            mock_settings.CLOUD_BATCH_MAX_BYTES = 10_000
+            mock_settings.CLOUD_BATCH_WINDOW_SECONDS = 10
+            mock_batch.add.return_value = (1, 1000)
+            mock_batch.schedule_flush.return_value = True
+
+            run_parse_cloud.apply(args=[task_payload], throw=True)
+
+            mock_s3.get_stream.assert_not_called()
+            mock_get_pl.assert_not_called()
+            assert mock_batch.add.call_args[0][0]["s3_key"] == "inputs/page.png"
+            mock_batch_task.apply_async.assert_called_once_with(countdown=10)
+
+            # A full buffer is flushed right away.
+            mock_batch.add.return_value = (50, 5000)
+            run_parse_cloud.apply(args=[task_payload], throw=True)
+            mock_batch_task.delay.assert_called_once_with()
+
+    def test_batch_task_parses_together_and_fans_out(self, sample_documents):
+        payloads = [
+            {"s3_key": "inputs/a.png", "collection_name": "c", "etag": "ea"},
+            {"s3_key": "inputs/b.png", "collection_name": "c", "etag": "eb"},
+            {"s3_key": "inputs/c.png", "collection_name": "c", "etag": "ec"},
+        ]
+        objects = {"inputs/a.png": b"aaa", "inputs/b.png": b"bbb", "inputs/c.png": b"c"}
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index, patch(
+            "src.tasks.parse_file._cloud_batch",
+        ) as mock_batch, patch(
+            "src.tasks.parse_file.run_parse_cloud_batch",
+        ) as mock_batch_task:
+            mock_settings.CLOUD_BATCH_MAX_FILES = 50
+            mock_settings.CLOUD_BATCH_NUM_WORKERS = 2
+            mock_settings.CLOUD_BATCH_MAX_ATTEMPTS = 3
+            mock_settings.PARSE_DEDUP_ENABLED = True
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_settings.CLOUD_BATCH_LEASE_SECONDS = 900
+            mock_batch.drain.return_value = [
+                (f"entry-{i}".encode(), payload) for i, payload in enumerate(payloads)
+            ]
+            mock_batch.pending.return_value = 0
+            mock_batch.attempts.return_value = 1
+            mock_s3.get_bytes.side_effect = objects.__getitem__
+            mock_s3.exists.return_value = True
+            # c.png was parsed before.
+            seen_sha256 = hashlib.sha256(b"c").hexdigest()
+            mock_index.lookup.side_effect = lambda sha, ocr: (
+                f"parsed/{seen_sha256}-1-0.jsonl.gz" if sha == seen_sha256 else None
+            )
+            mock_pl = MagicMock()
+            mock_pl.run_cloud_batch.side_effect = lambda files: [
+                sample_documents if name == "a.png" else [] for _, name in files
+            ]
+            mock_get_pl.return_value = mock_pl
+
+            run_parse_cloud_batch.apply(throw=True)
+
+            mock_pl.run_cloud_batch.assert_called_once()
+            files = mock_pl.run_cloud_batch.call_args[0][0]
+            assert [(f.read(), name) for f, name in files] == [
+                (b"aaa", "a.png"),
+                (b"bbb", "b.png"),
+            ]
+            parsed_keys = [c[0][1] for c in mock_s3.put_stream.call_args_list]
+            assert len(parsed_keys) == 1
+            sha256_a = hashlib.sha256(b"aaa").hexdigest()
+            assert parsed_keys[0].startswith(f"parsed/{sha256_a}-1-0.jsonl.")
+            vectorized = mock_vectorize.delay.call_args_list
+            assert sorted(c[0][0]["source_id"] for c in vectorized) == [
+                "inputs/a.png",
+                "inputs/c.png",
+            ]
+            # b.png came back empty: it stays leased and a drain is scheduled
+            # for when its lease runs out.
+            acked = sorted(c[0][0] for c in mock_batch.ack.call_args_list)
+            assert acked == [b"entry-0", b"entry-2"]
+            mock_batch_task.apply_async.assert_called_once_with(countdown=900)
+
+    def test_batch_task_gives_up_on_empty_results_after_max_attempts(self):
+        payload = {"s3_key": "inputs/b.png", "collection_name": "c"}
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file._cloud_batch",
+        ) as mock_batch, patch(
+            "src.tasks.parse_file.run_parse_cloud_batch",
+        ) as mock_batch_task:
+            mock_settings.CLOUD_BATCH_MAX_FILES = 50
+            mock_settings.CLOUD_BATCH_NUM_WORKERS = 1
+            mock_settings.CLOUD_BATCH_MAX_ATTEMPTS = 3
+            mock_settings.PARSE_DEDUP_ENABLED = False
+            mock_batch.drain.return_value = [(b"entry", payload)]
+            mock_batch.pending.return_value = 0
+            mock_batch.attempts.return_value = 3
+            mock_s3.get_bytes.return_value = b"bbb"
+            mock_get_pl.return_value.run_cloud_batch.return_value = [[]]
+
+            run_parse_cloud_batch.apply(throw=True)
+
+            mock_batch.ack.assert_called_once_with(b"entry")
+            mock_s3.put_stream.assert_not_called()
+            mock_batch_task.apply_async.assert_not_called()
+
+    def test_batch_task_keeps_files_it_did_not_finish_leased(self, sample_documents):
+        payloads = [
+            {"s3_key": "inputs/a.png", "collection_name": "c"},
+            {"s3_key": "inputs/b.png", "collection_name": "c"},
+            {"s3_key": "inputs/c.png", "collection_name": "c"},
+        ]
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ), patch(
+            "src.tasks.parse_file._cloud_batch",
+        ) as mock_batch, patch(
+            "src.tasks.parse_file.run_parse_cloud_batch",
+        ) as mock_batch_task:
+            mock_settings.CLOUD_BATCH_MAX_FILES = 50
+            mock_settings.CLOUD_BATCH_NUM_WORKERS = 2
+            mock_settings.CLOUD_BATCH_LEASE_SECONDS = 900
+            mock_settings.PARSE_DEDUP_ENABLED = False
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_batch.drain.return_value = [
+                (payload["s3_key"].encode(), payload) for payload in payloads
+            ]
+            mock_batch.pending.return_value = 0
+            mock_get_pl.return_value.run_cloud_batch.side_effect = lambda files: [
+                sample_documents for _ in files
+            ]
+
+            # c.png cannot be read right now; b.png's result cannot be stored.
+            def get_bytes(key):
+                if key == "inputs/c.png":
+                    raise RuntimeError("timeout")
+                return b"data"
+
+            def put_stream(f, key):
+                if key.startswith("parsed/b.png"):
+                    raise RuntimeError("S3 down")
+
+            mock_s3.get_bytes.side_effect = get_bytes
+            mock_s3.put_stream.side_effect = put_stream
+            mock_s3.exists.return_value = True
+
+            run_parse_cloud_batch.apply(throw=True)
+
+            mock_batch.ack.assert_called_once_with(b"inputs/a.png")
+            mock_batch_task.apply_async.assert_called_once_with(countdown=900)
+
+    def test_batch_task_without_buffered_files_does_nothing(self):
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file._cloud_batch",
+        ) as mock_batch:
+            mock_settings.CLOUD_BATCH_MAX_FILES = 50
+            mock_batch.drain.return_value = []
+
+            run_parse_cloud_batch.apply(throw=True)
+
+            mock_get_pl.assert_not_called()
+
+    def test_large_pdf_is_fanned_out_into_a_chord(self, temp_dir):
+        task_payload = {
+            "s3_key": "inputs/big.pdf",
+            "collection_name": "my_coll",
+            "size": 100,
+            "sha256": "deadbeef",
+        }
+        local_path = temp_dir / "inputs" / "big.pdf"
+        local_path.parent.mkdir(parents=True)
+        doc = fitz.open()
+        for i in range(5):
+            doc.new_page().insert_text((72, 72), f"Page {i + 1}")
+        doc.save(local_path)
+        doc.close()
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl, patch(
+            "src.tasks.parse_file.chord",
+        ) as mock_chord:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSE_DEDUP_ENABLED = False
+            mock_settings.PARSE_FANOUT_ENABLED = True
+            mock_settings.PARSE_FANOUT_MIN_PAGES = 4
+            mock_settings.PARSE_FANOUT_MIN_BYTES = 1 << 30
+            mock_settings.PARSE_FANOUT_PART_PAGES = 2
+            mock_settings.PARSE_FANOUT_S3_PREFIX = "parse-parts"
+
+            run_parse_local.apply(args=[task_payload], throw=True)
+
+            mock_get_pl.assert_not_called()
+            assert not local_path.exists()
+            keys = [c.args[1] for c in mock_s3.put_bytes.call_args_list]
+            assert [key.rsplit("/", 1)[1] for key in keys] == [
+                "p00001-00002.pdf",
+                "p00003-00004.pdf",
+                "p00005-00005.pdf",
+            ]
+            parts = list(mock_chord.call_args[0][0])
+            assert [p.args[0]["s3_key"] for p in parts] == keys
+            assert parts[2].args[0]["first_page"] == 4
+            body = mock_chord.return_value.call_args[0][0]
+            assert body.args[0]["s3_key"] == "inputs/big.pdf"
+            assert body.args[0]["sha256"] == "deadbeef"
+            assert body.args[1] == keys
+            (errback,) = body.options["link_error"]
+            assert errback["task"] == run_fan_out_failed.name
+            assert errback["args"][1] == keys
+
+    def test_parse_part_stores_part_artifact(self, sample_documents, temp_dir):
+        (temp_dir / "inputs").mkdir()
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_get_pl.return_value.run.return_value = sample_documents
+            uploaded = {}
+            mock_s3.put_stream.side_effect = lambda f, key: uploaded.update(
+                {key: f.read()}
+            )
+
+            result = run_parse_part.apply(
+                args=[
+                    {
+                        "s3_key": "parse-parts/run/p00101-00200.pdf",
+                        "first_page": 100,
+                        "last_page": 199,
+                    }
+                ],
+                throw=True,
+            )
+
+            parsed_key = result.get()
+            assert parsed_key.startswith("parse-parts/run/p00101-00200.jsonl.")
+            documents = list(
+                DocumentsService().read_documents(io.BytesIO(uploaded[parsed_key]))
+            )
+            assert [d.metadata["page_range"] for d in documents] == ["101-200"] * 2
+            payload = mock_get_pl.return_value.run.call_args[0][0]
+            assert payload.local_input_path.endswith("parse-parts_run_p00101-00200.pdf")
+
+    def test_parse_part_without_content_returns_none(self, temp_dir):
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._get_pipeline",
+        ) as mock_get_pl:
+            mock_settings.TEMP_DIR = temp_dir
+            mock_get_pl.return_value.run.return_value = []
+
+            result = run_parse_part.apply(
+                args=[{"s3_key": "parts/p1.pdf", "first_page": 0, "last_page": 0}],
+                throw=True,
+            )
+
+            assert result.get() is None
+            mock_s3.put_stream.assert_not_called()
+
+    def test_failed_part_removes_the_staged_parts(self):
+        task_payload = {"s3_key": "inputs/big.pdf", "collection_name": "my_coll"}
+        pdf_keys = ["parse-parts/run/p00001-00002.pdf", "parse-parts/run/p00003.pdf"]
+
+        with patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file._documents_service",
+        ) as mock_documents, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize:
+            mock_documents.artifact_extension.return_value = ".jsonl.gz"
+
+            # Celery calls errbacks of bound tasks with the failed task id first.
+            run_fan_out_failed.apply(
+                args=["part-task-id", task_payload, pdf_keys], throw=True
+            )
+
+            mock_s3.delete_objects.assert_called_once_with(
+                pdf_keys
+                + [
+                    "parse-parts/run/p00001-00002.jsonl.gz",
+                    "parse-parts/run/p00003.jsonl.gz",
+                ]
+            )
+            mock_vectorize.delay.assert_not_called()
+
+    def test_merge_parts_joins_in_page_order_and_cleans_up(self):
+        part_docs = {
+            "parts/a": [Document(text="first", metadata={"file_name": "a.pdf"})],
+            "parts/b": [Document(text="second", metadata={"file_name": "b.pdf"})],
+        }
+        task_payload = {
+            "s3_key": "inputs/big.pdf",
+            "collection_name": "my_coll",
+            "sha256": "deadbeef",
+        }
+
+        def download(key, f):
+            DocumentsService().write_documents(part_docs[key], f, codec="gzip")
+
+        with patch(
+            "src.tasks.parse_file.settings",
+        ) as mock_settings, patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize, patch(
+            "src.tasks.parse_file._artifact_index",
+        ) as mock_index:
+            mock_settings.PARSED_ARTIFACT_SPOOL_BYTES = 1024
+            mock_settings.PARSER_VERSION = "1"
+            mock_s3.download_fileobj.side_effect = download
+            uploaded = {}
+            mock_s3.put_stream.side_effect = lambda f, key: uploaded.update(
+                {key: f.read()}
+            )
+
+            run_merge_parts.apply(
+                args=[["parts/a", "parts/b"], task_payload, ["p1.pdf", "p2.pdf"]],
+                throw=True,
+            )
+
+            (parsed_key,) = uploaded
+            assert parsed_key.startswith("parsed/deadbeef-1-0.jsonl.")
+            documents = list(
+                DocumentsService().read_documents(io.BytesIO(uploaded[parsed_key]))
+            )
+            assert [d.text for d in documents] == ["first", "second"]
+            assert {d.metadata["file_name"] for d in documents} == {"big.pdf"}
+            mock_index.record.assert_called_once_with("deadbeef", False, parsed_key)
+            mock_vectorize.delay.assert_called_once()
+            mock_s3.delete_objects.assert_called_once_with(
+                ["p1.pdf", "p2.pdf", "parts/a", "parts/b"]
+            )
+
+    def test_merge_parts_aborts_when_a_part_failed(self):
+        with patch(
+            "src.tasks.parse_file.settings",
+        ), patch(
+            "src.tasks.parse_file._s3_client",
+        ) as mock_s3, patch(
+            "src.tasks.parse_file.run_vectorize_file",
+        ) as mock_vectorize:
+            run_merge_parts.apply(
+                args=[
+                    ["parts/a", None],
+                    {"s3_key": "inputs/big.pdf", "collection_name": "my_coll"},
+                    ["p1.pdf", "p2.pdf"],
+                ],
+                throw=True,
+            )
+
+            mock_s3.put_stream.assert_not_called()
+            mock_vectorize.delay.assert_not_called()
+            mock_s3.delete_objects.assert_called_once_with(
+                ["p1.pdf", "p2.pdf", "parts/a"]
+            )
+
+
+class TestParseLane:
+    @pytest.mark.parametrize(
+        "file_info, force_ocr, lane",
+        [
+            ((90, "application/pdf", True), False, "cloud"),
+            ((0, "text/plain", False), True, "cloud"),
+            (None, True, "cloud"),
+            (None, False, "local"),
+            ((10, "application/pdf", False), False, "local"),
+            ((0, "application/vnd.ms-excel", False), False, "local"),
+            ((0, "text/plain", False), False, "text"),
+            ((0, "application/csv", False), False, "text"),
+            ((50, "application/pdf", True), False, "local"),
+        ],
+    )
+    def test_lane(self, file_info, force_ocr, lane):
+        assert parse_lane(file_info, force_ocr) == lane
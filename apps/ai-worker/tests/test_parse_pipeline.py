@@ -39,7 +39,9 @@ class TestParseFilePipeline:
         )
 
         assert result == sample_documents
-        mock_parser.parse_file.assert_called_once_with(str(local_path), False)
+        mock_parser.parse_file.assert_called_once_with(
+            str(local_path), False, None, None
+        )
         assert not local_path.exists()
 
     def test_run_returns_empty_list_when_parser_returns_empty(
@@ -70,7 +72,9 @@ class TestParseFilePipeline:
             )
         )
 
-        mock_parser.parse_file.assert_called_once_with(str(local_path), True)
+        mock_parser.parse_file.assert_called_once_with(
+            str(local_path), True, None, None
+        )
 
     def test_run_returns_none_on_parser_exception(
         self, pipeline, mock_parser, temp_dir
@@ -0,0 +1,50 @@
+"""Unit tests for ParsedArtifactIndex (mocked Redis)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from src.services.parsed_artifact_index import ParsedArtifactIndex
+
+
+class TestParsedArtifactIndex:
+    @pytest.fixture
+    def mock_redis(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def index(self, mock_redis):
+        return ParsedArtifactIndex(client=mock_redis)
+
+    def test_record_and_lookup_use_parser_version_and_force_ocr(
+        self, index, mock_redis
+    ):
+        with patch("src.services.parsed_artifact_index.settings") as mock_settings:
+            mock_settings.PARSER_VERSION = "7"
+            index.record("sha", True, "parsed/doc.pdf.json")
+            mock_redis.set.assert_called_once_with(
+                "ai_worker:parsed_index:artifact:sha:7:1", "parsed/doc.pdf.json"
+            )
+
+            mock_redis.get.return_value = b"parsed/doc.pdf.json"
+            assert index.lookup("sha", True) == "parsed/doc.pdf.json"
+            mock_redis.get.assert_called_with("ai_worker:parsed_index:artifact:sha:7:1")
+
+    def test_lookup_returns_none_on_miss(self, index, mock_redis):
+        mock_redis.get.return_value = None
+        assert index.lookup("sha", False) is None
+
+    def test_etag_mapping_roundtrip(self, index, mock_redis):
+        index.remember_sha256("etag", 10, "sha")
+        mock_redis.set.assert_called_once_with(
+            "ai_worker:parsed_index:etag:etag:10", "sha"
+        )
+        mock_redis.get.return_value = b"sha"
+        assert index.lookup_sha256("etag", 10) == "sha"
+
+    def test_redis_errors_are_treated_as_miss(self, index, mock_redis):
+        mock_redis.get.side_effect = redis.ConnectionError("down")
+        mock_redis.set.side_effect = redis.ConnectionError("down")
+        assert index.lookup("sha", False) is None
+        index.record("sha", False, "parsed/doc.json")
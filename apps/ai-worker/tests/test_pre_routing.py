@@ -0,0 +1,73 @@
+"""Unit tests for PreRoutingService (mocked S3 ranged reads)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.pre_routing import PreRoutingService
+
+
+class TestPreRoutingService:
+    @pytest.fixture
+    def s3(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def analyzer(self):
+        return MagicMock()
+
+    @pytest.fixture
+    def service(self, s3, analyzer):
+        with patch("src.services.pre_routing.settings") as mock_settings:
+            mock_settings.PRE_ROUTING_HEADER_BYTES = 8192
+            mock_settings.PRE_ROUTING_TAIL_BYTES = 65536
+            mock_settings.PRE_ROUTING_PDF_SAMPLE_BYTES = 1 << 20
+            yield PreRoutingService(s3, analyzer)
+
+    def test_probe_reads_header_range_and_lazy_tail(self, service, s3, analyzer):
+        s3.get_bytes.side_effect = [b"PK-header", b"PK-tail"]
+        analyzer.get_header_info.side_effect = lambda header, read_tail, **_: (
+            read_tail() and (0, "text/plain", False)
+        )
+
+        assert service.probe("inputs/doc.docx", size=1_000_000) == (
+            0,
+            "text/plain",
+            False,
+        )
+        first, second = s3.get_bytes.call_args_list
+        assert first.kwargs == {"start": 0, "end": 8191}
+        assert second.kwargs == {"start": -65536}
+
+    def test_small_object_needs_no_tail_request(self, service, s3, analyzer):
+        s3.get_bytes.return_value = b"tiny"
+        analyzer.get_header_info.side_effect = lambda header, read_tail: read_tail()
+
+        assert service.probe("inputs/tiny.txt", size=4) == b"tiny"
+        s3.get_bytes.assert_called_once()
+
+    def test_large_pdf_is_sampled_from_its_head_and_tail(self, service, s3, analyzer):
+        s3.get_bytes.side_effect = [b"%PDF-header", b"%PDF-head", b"trailer"]
+        analyzer.get_header_info.side_effect = (
+            lambda header, read_tail, read_pdf_sample: read_pdf_sample()
+        )
+
+        assert service.probe("inputs/scan.pdf", size=50_000_000) == (
+            b"%PDF-head\ntrailer"
+        )
+        _, head, tail = s3.get_bytes.call_args_list
+        assert head.kwargs == {"start": 0, "end": (1 << 20) - 1}
+        assert tail.kwargs == {"start": -65536}
+
+    def test_small_pdf_is_not_sampled(self, service, s3, analyzer):
+        s3.get_bytes.return_value = b"%PDF-header"
+        analyzer.get_header_info.side_effect = (
+            lambda header, read_tail, read_pdf_sample: read_pdf_sample()
+        )
+
+        assert service.probe("inputs/small.pdf", size=100_000) is None
+        s3.get_bytes.assert_called_once()
+
+    def test_probe_failure_falls_back_to_full_analysis(self, service, s3):
+        s3.get_bytes.side_effect = RuntimeError("s3 down")
+        assert service.probe("inputs/doc.pdf") is None
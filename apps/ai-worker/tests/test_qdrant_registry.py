@@ -0,0 +1,66 @@
+"""Unit tests for QdrantRegistry (mocked Qdrant client)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.services.qdrant_registry import QdrantRegistry
+
+
+class TestQdrantRegistry:
+    @pytest.fixture
+    def client_cls(self):
+        with patch("src.services.qdrant_registry.QdrantClient") as client_cls:
+            client_cls.side_effect = lambda **kwargs: MagicMock()
+            yield client_cls
+
+    @pytest.fixture
+    def store_cls(self):
+        with patch(
+            "src.services.qdrant_registry.BatchedQdrantVectorStore"
+        ) as store_cls:
+            store_cls.side_effect = lambda **kwargs: MagicMock(**kwargs)
+            yield store_cls
+
+    @pytest.fixture
+    def registry(self, client_cls, store_cls):
+        return QdrantRegistry(health_check_interval=60)
+
+    def test_client_is_reused(self, registry, client_cls):
+        assert registry.client() is registry.client()
+        client_cls.assert_called_once()
+
+    def test_vector_store_is_cached_per_collection(self, registry, store_cls):
+        first = registry.vector_store("a")
+
+        assert registry.vector_store("a") is first
+        assert registry.vector_store("b") is not first
+        assert store_cls.call_count == 2
+
+    def test_failed_health_check_reconnects(self, registry, client_cls):
+        registry._health_check_interval = 0
+        client = registry.client()
+        store = registry.vector_store("a")
+        client.get_collections.side_effect = ConnectionError("gone")
+
+        new_client = registry.client()
+
+        assert new_client is not client
+        client.close.assert_called_once()
+        assert registry.vector_store("a") is not store
+
+    def test_healthy_client_is_kept(self, registry):
+        registry._health_check_interval = 0
+        client = registry.client()
+
+        assert registry.client() is client
+        client.get_collections.assert_called_once()
+
+    def test_fork_opens_a_new_client(self, registry, client_cls):
+        client = registry.client()
+
+        with patch("src.services.qdrant_registry.os.getpid", return_value=-1):
+            new_client = registry.client()
+
+        assert new_client is not client
+        client.close.assert_not_called()
@@ -0,0 +1,70 @@
+"""Unit tests for BatchedQdrantVectorStore (mocked Qdrant client)."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from llama_index.core.schema import TextNode
+
+from src.services.qdrant_vector_store import BatchedQdrantVectorStore
+
+
+def make_nodes(count):
+    return [TextNode(text=f"n{i}", embedding=[0.1, 0.2]) for i in range(count)]
+
+
+class TestBatchedQdrantVectorStore:
+    @pytest.fixture
+    def client(self):
+        client = MagicMock()
+        client.collection_exists.return_value = True
+        return client
+
+    @pytest.fixture
+    def store(self, client):
+        store = BatchedQdrantVectorStore(
+            client=client,
+            collection_name="coll",
+            batch_size=2,
+            workers=2,
+            wait=False,
+        )
+        store._collection_initialized = True
+        store._legacy_vector_format = False
+        return store
+
+    def test_add_upserts_batches_without_waiting(self, store, client):
+        ids = store.add(make_nodes(5))
+
+        assert len(ids) == 5
+        store.flush()
+        calls = client.upsert.call_args_list
+        assert [len(c.kwargs["points"]) for c in calls] == [2, 2, 1]
+        assert [c.kwargs["wait"] for c in calls] == [False, False, True]
+        assert all(c.kwargs["collection_name"] == "coll" for c in calls)
+
+    def test_flush_waits_on_last_batch_across_add_calls(self, store, client):
+        store.add(make_nodes(1))
+        store.add(make_nodes(1))
+        store.flush()
+
+        assert [c.kwargs["wait"] for c in client.upsert.call_args_list] == [
+            False,
+            True,
+        ]
+
+    def test_flush_raises_upload_errors(self, store, client):
+        client.upsert.side_effect = RuntimeError("qdrant down")
+        store.add(make_nodes(3))
+
+        with pytest.raises(RuntimeError, match="qdrant down"):
+            store.flush()
+
+        client.upsert.side_effect = None
+        client.upsert.reset_mock()
+        store.flush()  # state was reset, nothing left to send
+        client.upsert.assert_not_called()
+
+    def test_add_with_no_nodes_is_noop(self, store, client):
+        assert store.add([]) == []
+        store.flush()
+        client.upsert.assert_not_called()
@@ -1,11 +1,12 @@
 """Unit tests for S3Client."""
 
+import io
 from unittest.mock import MagicMock, patch
 
 import pytest
 from botocore.exceptions import ClientError
 
-from src.core.s3_client import S3Client
+from src.core.s3_client import S3Client, byte_range, is_not_found
 
 
 class TestS3Client:
@@ -14,11 +15,15 @@ class TestS3Client:
         return MagicMock()
 
     @pytest.fixture
-    def client(self, mock_boto_s3):
-        with (
-            patch("src.core.s3_client.boto3.client", return_value=mock_boto_s3),
-            patch("src.core.s3_client.settings") as mock_settings,
-        ):
+    def boto_client(self, mock_boto_s3):
+        with patch(
+            "src.core.s3_client.boto3.client", return_value=mock_boto_s3
+        ) as boto_client:
+            yield boto_client
+
+    @pytest.fixture
+    def client(self, boto_client):
+        with patch("src.core.s3_client.settings") as mock_settings:
             mock_settings.AWS_ENDPOINT_URL = None
             mock_settings.AWS_ACCESS_KEY = MagicMock(
                 get_secret_value=MagicMock(return_value="key")
@@ -28,6 +33,10 @@ class TestS3Client:
             )
             mock_settings.AWS_REGION = "eu-central-1"
             mock_settings.S3_BUCKET_NAME = "test-bucket"
+            mock_settings.S3_MAX_POOL_CONNECTIONS = 32
+            mock_settings.S3_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+            mock_settings.S3_MULTIPART_CHUNKSIZE = 16 * 1024 * 1024
+            mock_settings.S3_MAX_CONCURRENCY = 8
             yield S3Client()
 
     def test_download_file_success(self, client, temp_dir):
@@ -35,7 +44,7 @@ class TestS3Client:
         path = temp_dir / "sub" / "file.txt"
         client.download_file("key/file.txt", str(path))
         client._s3.download_file.assert_called_once_with(
-            "test-bucket", "key/file.txt", str(path)
+            "test-bucket", "key/file.txt", str(path), Config=client._transfer_config
         )
         assert path.parent.exists()
 
@@ -52,7 +61,7 @@ class TestS3Client:
         path.write_text("{}")
         client.upload_file(str(path), "parsed/doc.json")
         client._s3.upload_file.assert_called_once_with(
-            str(path), "test-bucket", "parsed/doc.json"
+            str(path), "test-bucket", "parsed/doc.json", Config=client._transfer_config
         )
 
     def test_upload_file_raises_on_client_error(self, client, temp_dir):
@@ -63,3 +72,97 @@ class TestS3Client:
         )
         with pytest.raises(ClientError):
             client.upload_file(str(path), "parsed/doc.json")
+
+    def test_exists_returns_false_on_404(self, client):
+        client._s3.head_object.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "HeadObject"
+        )
+        assert client.exists("parsed/missing.json") is False
+
+    def test_exists_returns_true_when_head_succeeds(self, client):
+        client._s3.head_object.return_value = {"ContentLength": 1}
+        assert client.exists("parsed/doc.json") is True
+        client._s3.head_object.assert_called_once_with(
+            Bucket="test-bucket", Key="parsed/doc.json"
+        )
+
+    def test_put_stream_uploads_with_transfer_config(self, client):
+        fileobj = io.BytesIO(b"data")
+        client.put_stream(fileobj, "parsed/doc.jsonl.gz")
+        client._s3.upload_fileobj.assert_called_once_with(
+            fileobj,
+            "test-bucket",
+            "parsed/doc.jsonl.gz",
+            Config=client._transfer_config,
+        )
+        assert client._transfer_config.max_request_concurrency == 8
+
+    def test_download_fileobj_raises_on_client_error(self, client):
+        client._s3.download_fileobj.side_effect = ClientError(
+            {"Error": {"Code": "404", "Message": "Not Found"}}, "GetObject"
+        )
+        with pytest.raises(ClientError):
+            client.download_fileobj("missing/key", io.BytesIO())
+
+    def test_client_uses_larger_connection_pool(self, client, boto_client):
+        config = boto_client.call_args.kwargs["config"]
+        assert config.max_pool_connections == 32
+
+    def test_get_bytes_reads_range(self, client):
+        body = MagicMock()
+        body.read.return_value = b"PK"
+        client._s3.get_object.return_value = {"Body": body}
+
+        assert client.get_bytes("inputs/doc.docx", start=0, end=1) == b"PK"
+        client._s3.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="inputs/doc.docx", Range="bytes=0-1"
+        )
+        body.close.assert_called_once()
+
+    def test_get_stream_without_range_reads_whole_object(self, client):
+        client._s3.get_object.return_value = {"Body": MagicMock()}
+        client.get_stream("parsed/doc.jsonl.gz")
+        client._s3.get_object.assert_called_once_with(
+            Bucket="test-bucket", Key="parsed/doc.jsonl.gz"
+        )
+
+    def test_get_stream_raises_not_found(self, client):
+        client._s3.get_object.side_effect = ClientError(
+            {"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject"
+        )
+        with pytest.raises(ClientError) as exc_info:
+            client.get_stream("missing/key")
+        assert is_not_found(exc_info.value)
+
+    def test_put_bytes(self, client):
+        client.put_bytes(b"{}", "parse-cache/k.json")
+        client._s3.put_object.assert_called_once_with(
+            Bucket="test-bucket", Key="parse-cache/k.json", Body=b"{}"
+        )
+
+    def test_delete_objects_batches_keys(self, client):
+        client.delete_objects([f"k{i}" for i in range(1500)])
+        calls = client._s3.delete_objects.call_args_list
+        assert [len(c.kwargs["Delete"]["Objects"]) for c in calls] == [1000, 500]
+        assert calls[1].kwargs["Delete"]["Objects"][0] == {"Key": "k1000"}
+
+    def test_copy_object_is_server_side(self, client):
+        client.copy_object("parsed/abc-1-0.jsonl.zst", "parsed/doc.pdf.jsonl.zst")
+        client._s3.copy.assert_called_once_with(
+            {"Bucket": "test-bucket", "Key": "parsed/abc-1-0.jsonl.zst"},
+            "test-bucket",
+            "parsed/doc.pdf.jsonl.zst",
+            Config=client._transfer_config,
+        )
+
+    @pytest.mark.parametrize(
+        ("start", "end", "expected"),
+        [
+            (0, 1023, "bytes=0-1023"),
+            (100, None, "bytes=100-"),
+            (None, 99, "bytes=0-99"),
+            (-65536, None, "bytes=-65536"),
+        ],
+    )
+    def test_byte_range(self, start, end, expected):
+        assert byte_range(start, end) == expected
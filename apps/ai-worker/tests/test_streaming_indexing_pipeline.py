@@ -0,0 +1,144 @@
+"""Unit tests for StreamingIndexingPipeline (mocked splitter, embedding, Qdrant)."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from llama_index.core.schema import Document, TextNode
+
+from src.pipelines.streaming_indexing_pipeline import StreamingIndexingPipeline
+
+
+def embed_nodes(nodes):
+    for node in nodes:
+        node.embedding = [1.0]
+    return nodes
+
+
+class TestStreamingIndexingPipeline:
+    @pytest.fixture
+    def indexer(self):
+        indexer = MagicMock()
+        indexer.embedding.side_effect = embed_nodes
+        indexer.chunk_index.existing_ids.return_value = set()
+        return indexer
+
+    @pytest.fixture
+    def pipeline(self, indexer):
+        pl = StreamingIndexingPipeline(indexer, queue_size=1, batch_size=2)
+        pl._splitter = MagicMock(
+            side_effect=lambda docs: [
+                TextNode(text=f"{docs[0].text}-{i}") for i in range(3)
+            ]
+        )
+        return pl
+
+    def test_run_splits_embeds_and_upserts_in_batches(self, pipeline, indexer):
+        documents = (Document(text=f"doc{i}") for i in range(3))
+
+        count = pipeline.run(documents)
+
+        assert count == 9
+        batches = [call.args[0] for call in indexer.vector_store.add.call_args_list]
+        # 3 nodes per document in batches of 2 -> [2, 1] per document
+        assert [len(b) for b in batches] == [2, 1, 2, 1, 2, 1]
+        assert [n.text for n in batches[0]] == ["doc0-0", "doc0-1"]
+        assert all(n.embedding == [1.0] for b in batches for n in b)
+
+    def test_point_ids_are_stable_across_runs_of_a_source(self, pipeline, indexer):
+        def upserted_ids():
+            return [
+                node.id_
+                for call in indexer.vector_store.add.call_args_list
+                for node in call.args[0]
+            ]
+
+        pipeline.run(
+            (Document(text=f"doc{i}") for i in range(2)), source_id="src/doc.pdf"
+        )
+        first = upserted_ids()
+        indexer.vector_store.add.reset_mock()
+        pipeline.run(
+            (Document(text=f"doc{i}") for i in range(2)), source_id="src/doc.pdf"
+        )
+
+        assert upserted_ids() == first
+        assert len(set(first)) == 6
+
+    def test_identical_chunks_of_different_documents_keep_distinct_ids(
+        self, pipeline, indexer
+    ):
+        documents = [Document(text="same"), Document(text="same")]
+
+        pipeline.run(iter(documents), source_id="src/doc.pdf")
+
+        ids = [
+            node.id_
+            for call in indexer.vector_store.add.call_args_list
+            for node in call.args[0]
+        ]
+        assert len(set(ids)) == 6
+
+    def test_incremental_run_only_embeds_changed_chunks(self, pipeline, indexer):
+        pipeline._splitter.side_effect = lambda docs: [
+            TextNode(text=t) for t in docs[0].text.split()
+        ]
+        embedded = []
+        stored = {}
+
+        def embed(nodes):
+            embedded.extend(node.text for node in nodes)
+            return nodes
+
+        indexer.embedding.side_effect = embed
+        indexer.vector_store.add.side_effect = lambda nodes: stored.update(
+            {node.id_: node.text for node in nodes}
+        )
+        indexer.chunk_index.existing_ids.side_effect = lambda _: set(stored)
+        indexer.chunk_index.delete.side_effect = lambda ids: [
+            stored.pop(i) for i in ids
+        ]
+
+        with patch(
+            "src.pipelines.streaming_indexing_pipeline.settings"
+        ) as mock_settings:
+            mock_settings.INDEXING_INCREMENTAL = True
+            pipeline.run(iter([Document(text="a b c")]), source_id="src/doc.md")
+            embedded.clear()
+            count = pipeline.run(iter([Document(text="a B d")]), source_id="src/doc.md")
+
+        assert count == 3
+        assert embedded == ["B", "d"]
+        assert sorted(stored.values()) == ["B", "a", "d"]
+        indexer.chunk_index.delete.assert_called_once()
+
+    def test_incremental_run_without_chunks_keeps_stored_ones(self, pipeline, indexer):
+        indexer.chunk_index.existing_ids.return_value = {"old-id"}
+
+        with patch(
+            "src.pipelines.streaming_indexing_pipeline.settings"
+        ) as mock_settings:
+            mock_settings.INDEXING_INCREMENTAL = True
+            assert pipeline.run(iter([]), source_id="src/doc.md") == 0
+
+        indexer.chunk_index.delete.assert_not_called()
+
+    def test_run_returns_zero_for_no_documents(self, pipeline, indexer):
+        assert pipeline.run(iter([])) == 0
+        indexer.vector_store.add.assert_not_called()
+
+    def test_stage_failure_is_raised(self, pipeline, indexer):
+        indexer.embedding.side_effect = RuntimeError("embedding failed")
+        documents = (Document(text=f"doc{i}") for i in range(20))
+
+        with pytest.raises(RuntimeError, match="embedding failed"):
+            pipeline.run(documents)
+
+        indexer.vector_store.add.assert_not_called()
+
+    def test_source_failure_stops_stages(self, pipeline):
+        def documents():
+            yield Document(text="doc0")
+            raise OSError("download failed")
+
+        with pytest.raises(OSError, match="download failed"):
+            pipeline.run(documents())
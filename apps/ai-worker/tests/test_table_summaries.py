@@ -0,0 +1,149 @@
+"""Unit tests for table summaries (real SQLite backend, stubbed LLM summaries)."""
+
+from unittest.mock import patch
+
+import pytest
+from llama_index.core.base.llms.types import LLMMetadata
+from llama_index.core.llms import MockLLM
+from llama_index.core.node_parser import MarkdownElementNodeParser
+from llama_index.core.node_parser.relational.base_element import (
+    Element,
+    TableOutput,
+)
+
+from src.core.cache_backend import SQLiteCacheBackend
+from src.services.table_summaries import (
+    CachedMarkdownElementNodeParser,
+    heuristic_summary,
+    table_key,
+    table_rows,
+)
+
+BIG_TABLE = "| a | b | c |\n|---|---|---|\n" + "\n".join(
+    f"| {i} | x{i} | y{i} |" for i in range(5)
+)
+
+
+class NamedLLM(MockLLM):
+    model: str = "model-a"
+
+    def __init__(self, model: str = "model-a"):
+        super().__init__()
+        self.model = model
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(model_name=self.model)
+
+
+def _elements(*texts_and_tables):
+    return [
+        Element(
+            id=f"id_{i}",
+            type="table" if text.startswith("|") else "text",
+            element=text,
+        )
+        for i, text in enumerate(texts_and_tables)
+    ]
+
+
+class TestCachedMarkdownElementNodeParser:
+    @pytest.fixture
+    def backend(self, temp_dir):
+        return SQLiteCacheBackend(str(temp_dir / "cache.sqlite3"))
+
+    @pytest.fixture
+    def summarized(self):
+        """Replaces the LLM summarization; records the elements it was given."""
+        calls = []
+
+        def summarize(parser, elements):
+            calls.append(elements)
+            for element in elements:
+                if element.type == "table":
+                    element.table_output = TableOutput(
+                        summary=f"llm summary {len(calls)}", columns=[]
+                    )
+
+        with patch.object(
+            MarkdownElementNodeParser, "extract_table_summaries", summarize
+        ):
+            yield calls
+
+    def _parser(self, backend, model="model-a", min_cells=12):
+        return CachedMarkdownElementNodeParser(
+            backend=backend, min_cells=min_cells, llm=NamedLLM(model=model)
+        )
+
+    def test_repeated_table_is_served_from_the_cache(self, backend, summarized):
+        first = _elements(BIG_TABLE)
+        self._parser(backend).extract_table_summaries(first)
+
+        # Another worker re-ingesting a new version with reformatted cells.
+        second = _elements(BIG_TABLE.replace("| x0 |", "|   x0|"))
+        parser = self._parser(backend)
+        parser.extract_table_summaries(second)
+
+        assert len(summarized) == 1
+        assert second[0].table_output.summary == "llm summary 1"
+        assert parser.stats() == {"hits": 1, "heuristic": 0, "misses": 0}
+
+    def test_cache_is_keyed_by_model(self, backend, summarized):
+        self._parser(backend, model="model-a").extract_table_summaries(
+            _elements(BIG_TABLE)
+        )
+        self._parser(backend, model="model-b").extract_table_summaries(
+            _elements(BIG_TABLE)
+        )
+        assert len(summarized) == 2
+
+    def test_small_tables_skip_the_llm(self, backend, summarized):
+        elements = _elements("| name | qty |\n|:--|--:|\n| bolt | 4 |\n| nut | 10 |")
+        parser = self._parser(backend)
+
+        parser.extract_table_summaries(elements)
+
+        assert summarized == []
+        output = elements[0].table_output
+        assert output.summary == "Table with 2 rows and columns: name, qty."
+        assert [(c.col_name, c.col_type) for c in output.columns] == [
+            ("name", "text"),
+            ("qty", "number"),
+        ]
+        assert parser.stats()["heuristic"] == 1
+
+    def test_llm_sees_only_pending_tables_with_their_context(self, backend, summarized):
+        small = "| k |\n|---|\n| v |"
+        elements = _elements("Table 1: totals", BIG_TABLE, small, "notes", BIG_TABLE)
+
+        self._parser(backend).extract_table_summaries(elements)
+
+        (sent,) = summarized
+        # Duplicates are summarized once; the small table is not sent.
+        assert [e.id for e in sent] == ["id_0", "id_1"]
+        assert elements[4].table_output == elements[1].table_output
+        assert elements[2].table_output.summary.startswith("Table with 1 rows")
+
+    def test_separate_runs_of_context_are_not_adjacent(self, backend, summarized):
+        other = BIG_TABLE.replace("| a |", "| z |")
+        elements = _elements("intro", BIG_TABLE, "| k |\n|---|\n| v |", "notes", other)
+
+        self._parser(backend).extract_table_summaries(elements)
+
+        (sent,) = summarized
+        assert [e.id for e in sent] == ["id_0", "id_1", "gap", "id_3", "id_4"]
+
+
+def test_table_key_ignores_alignment_and_whitespace():
+    assert table_key("| a |b|\n|:--|--:|\n| 1 | 2 |") == table_key(
+        "|a| b |\n|---|---|\n|1|2|"
+    )
+    assert table_rows("| a | b |\n|---|---|\n| 1 |  2  x |") == [
+        ["a", "b"],
+        ["1", "2 x"],
+    ]
+
+
+def test_heuristic_summary_marks_empty_columns():
+    output = heuristic_summary([["a", "b"], ["1", ""]])
+    assert [c.summary for c in output.columns] == ["e.g. 1", "empty"]
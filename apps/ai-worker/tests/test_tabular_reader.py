@@ -0,0 +1,77 @@
+"""Unit tests for TabularReader (chunked CSV and Excel reading)."""
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from src.services.tabular_reader import TabularReader
+
+
+class TestTabularReader:
+    @pytest.fixture
+    def reader(self):
+        return TabularReader(chunk_rows=2)
+
+    def test_iter_csv_yields_row_chunks(self, reader, fixtures_dir):
+        chunks = list(reader.iter_csv(str(fixtures_dir / "sample.csv")))
+
+        assert [(sheet, start, len(df)) for sheet, start, df in chunks] == [
+            (None, 0, 2),
+            (None, 2, 1),
+        ]
+        assert list(chunks[1][2].columns) == ["name", "value", "category"]
+        assert chunks[1][2].iloc[0]["name"] == "gamma"
+
+    def test_iter_excel_reads_every_sheet_in_chunks(self, reader, temp_dir):
+        path = temp_dir / "book.xlsx"
+        workbook = openpyxl.Workbook()
+        sales = workbook.active
+        sales.title = "Sales"
+        sales.append([None])
+        sales.append(["region", "q1", None])
+        for row in [["EU", 10], ["US", 12], ["APAC", 7]]:
+            sales.append(row)
+        workbook.create_sheet("Empty")
+        notes = workbook.create_sheet("Notes")
+        notes.append(["note"])
+        notes.append(["check totals"])
+        workbook.save(path)
+
+        chunks = list(reader.iter_excel(str(path)))
+
+        assert [(sheet, start, len(df)) for sheet, start, df in chunks] == [
+            ("Sales", 0, 2),
+            ("Sales", 2, 1),
+            ("Notes", 0, 1),
+        ]
+        assert list(chunks[0][2].columns) == ["region", "q1", "Unnamed: 2"]
+        assert chunks[1][2].iloc[0].tolist()[:2] == ["APAC", 7]
+
+    def test_iter_excel_falls_back_to_pandas_for_legacy_files(self, reader, temp_dir):
+        path = temp_dir / "old.xls"
+        path.write_bytes(b"legacy")
+        legacy = pd.DataFrame({"a": [1, 2, 3]})
+
+        class FakeExcelFile:
+            sheet_names = ["Sheet1"]
+
+            def __init__(self, _path):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc_info):
+                return False
+
+            def parse(self, sheet):
+                return legacy
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("src.services.tabular_reader.pd.ExcelFile", FakeExcelFile)
+            chunks = list(reader.iter_excel(str(path)))
+
+        assert [(sheet, start, len(df)) for sheet, start, df in chunks] == [
+            ("Sheet1", 0, 2),
+            ("Sheet1", 2, 1),
+        ]
@@ -36,3 +36,5 @@ class TestRunVectorizeFile:
             # Task uses basename(s3_key) so path ends with doc.pdf.json
             assert call_arg.local_input_path.endswith("doc.pdf.json")
             assert call_arg.collection_name == "vec_coll"
+            # Without an explicit source, the parsed artifact key identifies it
+            assert call_arg.source_id == "parsed/doc.pdf.json"
@@ -10,29 +10,32 @@ from src.pipelines.vectorize_pipeline import (
     VectorizeFilePipeline,
     VectorizeFilePipelinePayload,
 )
+from src.services.documents_service import DocumentsService
 
 
 class TestVectorizeFilePipeline:
     @pytest.fixture
-    def mock_parser(self):
+    def mock_documents_service(self):
         return MagicMock()
 
     @pytest.fixture
-    def pipeline(self, mock_parser):
+    def pipeline(self, mock_documents_service):
         with patch(
-            "src.pipelines.vectorize_pipeline.FileParsingService",
-            return_value=mock_parser,
+            "src.pipelines.vectorize_pipeline.DocumentsService",
+            return_value=mock_documents_service,
         ), patch("src.pipelines.vectorize_pipeline.IndexingPipeline") as mock_idx_cls:
             mock_idx = MagicMock()
             mock_idx_cls.return_value = mock_idx
-            return VectorizeFilePipeline()
+            yield VectorizeFilePipeline()
 
-    def test_run_calls_parser_and_indexer_removes_file(
+    def test_run_reads_parsed_documents_and_removes_file(
         self, pipeline, sample_documents, temp_dir
     ):
         path = temp_dir / "parsed.json"
         path.write_text("[1,2,3]")
-        pipeline.parser.read_text_file.return_value = sample_documents
+        pipeline.documents_service.iter_documents.return_value = iter(
+            sample_documents
+        )
 
         pipeline.run(
             VectorizeFilePipelinePayload(
@@ -41,7 +44,7 @@ class TestVectorizeFilePipeline:
             )
         )
 
-        pipeline.parser.read_text_file.assert_called_once_with(str(path))
+        pipeline.documents_service.iter_documents.assert_called_once_with(str(path))
         assert not path.exists()
 
     def test_run_returns_early_when_no_documents(
@@ -49,7 +52,7 @@ class TestVectorizeFilePipeline:
     ):
         path = temp_dir / "empty.json"
         path.write_text("[]")
-        pipeline.parser.read_text_file.return_value = []
+        pipeline.documents_service.iter_documents.return_value = iter([])
 
         pipeline.run(
             VectorizeFilePipelinePayload(
@@ -58,20 +61,16 @@ class TestVectorizeFilePipeline:
             )
         )
 
-        pipeline.parser.read_text_file.assert_called_once_with(str(path))
+        pipeline.documents_service.iter_documents.assert_called_once_with(str(path))
         assert not path.exists()
 
     def test_run_passes_collection_name_and_documents_to_indexer(
-        self, mock_parser, sample_documents, temp_dir
+        self, sample_documents, sample_documents_json, temp_dir
     ):
         path = temp_dir / "parsed.json"
-        path.write_text("[]")
-        mock_parser.read_text_file.return_value = sample_documents
+        path.write_text(sample_documents_json)
 
         with patch(
-            "src.pipelines.vectorize_pipeline.FileParsingService",
-            return_value=mock_parser,
-        ), patch(
             "src.pipelines.vectorize_pipeline.IndexingPipeline",
         ) as mock_idx_cls:
             mock_idx = MagicMock()
@@ -84,19 +83,41 @@ class TestVectorizeFilePipeline:
                 )
             )
             mock_idx_cls.assert_called_once_with(collection_name="my_collection")
-            mock_idx.run.assert_called_once_with(sample_documents)
+            mock_idx.run.assert_called_once()
+            documents = mock_idx.run.call_args[0][0]
+            assert [d.text for d in documents] == [d.text for d in sample_documents]
+            assert mock_idx.run.call_args.kwargs == {"source_id": None}
+
+    def test_run_reads_compressed_artifacts(self, sample_documents, temp_dir):
+        path = temp_dir / "parsed.jsonl.gz"
+        with open(path, "wb") as f:
+            DocumentsService().write_documents(sample_documents, f, codec="gzip")
+
+        with patch(
+            "src.pipelines.vectorize_pipeline.IndexingPipeline",
+        ) as mock_idx_cls:
+            VectorizeFilePipeline().run(
+                VectorizeFilePipelinePayload(
+                    local_input_path=str(path),
+                    collection_name="my_collection",
+                    source_id="uploads/doc.pdf",
+                )
+            )
+
+            args, kwargs = mock_idx_cls.return_value.run.call_args
+            assert [d.metadata for d in args[0]] == [
+                d.metadata for d in sample_documents
+            ]
+            assert kwargs == {"source_id": "uploads/doc.pdf"}
+            assert not path.exists()
 
     def test_run_removes_file_even_when_indexer_raises(
-        self, mock_parser, sample_documents, temp_dir
+        self, sample_documents_json, temp_dir
     ):
         """When indexer.run raises, exception is logged and finally still removes file."""
         path = temp_dir / "parsed.json"
-        path.write_text("[]")
-        mock_parser.read_text_file.return_value = sample_documents
+        path.write_text(sample_documents_json)
         with patch(
-            "src.pipelines.vectorize_pipeline.FileParsingService",
-            return_value=mock_parser,
-        ), patch(
             "src.pipelines.vectorize_pipeline.IndexingPipeline",
         ) as mock_idx_cls:
             mock_idx = MagicMock()
@@ -110,4 +131,39 @@ class TestVectorizeFilePipeline:
                     collection_name="test_coll",
                 )
             )
+            mock_idx.run.assert_called_once()
+            assert not path.exists()
+
+    def test_run_streaming_reads_parsed_documents(
+        self, sample_documents_json, temp_dir
+    ):
+        path = temp_dir / "parsed.json"
+        path.write_text(sample_documents_json)
+        with patch(
+            "src.pipelines.vectorize_pipeline.IndexingPipeline",
+        ) as mock_idx_cls, patch(
+            "src.pipelines.vectorize_pipeline.StreamingIndexingPipeline",
+        ) as mock_stream_cls, patch(
+            "src.pipelines.vectorize_pipeline.settings",
+        ) as mock_settings:
+            mock_settings.VECTORIZE_STREAMING = True
+            mock_stream_cls.return_value.run.side_effect = lambda docs, **_: len(
+                list(docs)
+            )
+            pl = VectorizeFilePipeline()
+
+            pl.run(
+                VectorizeFilePipelinePayload(
+                    local_input_path=str(path),
+                    collection_name="stream_coll",
+                    source_id="uploads/doc.pdf",
+                )
+            )
+
+            mock_idx_cls.assert_called_once_with(collection_name="stream_coll")
+            mock_stream_cls.assert_called_once_with(mock_idx_cls.return_value)
+            mock_stream_cls.return_value.run.assert_called_once()
+            assert mock_stream_cls.return_value.run.call_args.kwargs == {
+                "source_id": "uploads/doc.pdf"
+            }
             assert not path.exists()